@@ -0,0 +1,438 @@
+import os
+
+# Settings are read at import time, so this must run before any app module is imported
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import copy
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pytest
+from bson import ObjectId
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+
+# -------------------------------------------------
+# In-memory stand-ins for the Motor API
+# -------------------------------------------------
+_MISSING = object()
+
+
+def _get(doc: Dict[str, Any], path: str) -> Any:
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _compare(value: Any, op: str, operand: Any) -> bool:
+    if op == "$exists":
+        return (value is not _MISSING) == bool(operand)
+    if op == "$in":
+        return value is not _MISSING and (value in operand or (isinstance(value, list) and any(v in operand for v in value)))
+    if op == "$nin":
+        return not _compare(value, "$in", operand)
+    if op == "$ne":
+        return value != operand
+    if op == "$eq":
+        return value == operand
+    if value is _MISSING or value is None:
+        return False
+    return {"$lt": value < operand, "$lte": value <= operand, "$gt": value > operand, "$gte": value >= operand}[op]
+
+
+def matches(doc: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    """Subset of the MongoDB query language: equality, $and/$or and comparison/$in/$exists operators."""
+    for key, cond in (query or {}).items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in cond):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, sub) for sub in cond):
+                return False
+        elif isinstance(cond, dict) and cond and all(op.startswith("$") for op in cond):
+            if not all(_compare(_get(doc, key), op, operand) for op, operand in cond.items()):
+                return False
+        else:
+            value = _get(doc, key)
+            if cond is None and value is _MISSING:
+                continue  # {field: None} also matches documents without the field
+            if value != cond and not (isinstance(value, list) and cond in value):
+                return False
+    return True
+
+
+_REMOVE = object()
+_BSON_TYPES = ((bool, "bool"), (int, "int"), (float, "double"), (str, "string"), (datetime, "date"),
+               (ObjectId, "objectId"), (list, "array"), (dict, "object"))
+
+
+def _bson_type(value: Any) -> str:
+    if value is _MISSING:
+        return "missing"
+    if value is None:
+        return "null"
+    return next(name for kind, name in _BSON_TYPES if isinstance(value, kind))
+
+
+def _order(value: Any):
+    # Null and missing sort before everything else, as in MongoDB
+    return (0, 0) if value in (None, _MISSING) else (1, value)
+
+
+def evaluate(expr: Any, doc: Dict[str, Any]) -> Any:
+    """The aggregation expressions the app uses in pipeline updates."""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return _REMOVE if expr == "$$REMOVE" else _get(doc, expr[1:])
+    if isinstance(expr, list):
+        return [evaluate(item, doc) for item in expr]
+    if not (isinstance(expr, dict) and len(expr) == 1 and next(iter(expr)).startswith("$")):
+        return expr
+
+    op, args = next(iter(expr.items()))
+    if op == "$literal":
+        return args
+    if op == "$cond":
+        condition, then, otherwise = args
+        return evaluate(then if evaluate(condition, doc) else otherwise, doc)
+    if op == "$and":
+        return all(evaluate(arg, doc) for arg in args)
+    if op == "$or":
+        return any(evaluate(arg, doc) for arg in args)
+    if op == "$type":
+        return _bson_type(evaluate(args, doc))
+
+    values = [None if v is _MISSING else v for v in evaluate(args, doc)]
+    if op == "$ifNull":
+        return next((v for v in values if v is not None), None)
+    if op == "$add":
+        return sum(values)
+    left, right = values
+    comparisons = {"$eq": lambda a, b: a == b, "$ne": lambda a, b: a != b,
+                   "$lt": lambda a, b: a < b, "$lte": lambda a, b: a <= b,
+                   "$gt": lambda a, b: a > b, "$gte": lambda a, b: a >= b}
+    return comparisons[op](_order(left), _order(right))
+
+
+def apply_update(doc: Dict[str, Any], update: Any, inserting: bool = False) -> None:
+    if isinstance(update, list):
+        for stage in update:
+            values = {key: evaluate(expr, doc) for key, expr in stage.get("$set", {}).items()}
+            for key, value in values.items():
+                if value is _REMOVE or value is _MISSING:
+                    doc.pop(key, None)
+                else:
+                    doc[key] = value
+            for key in stage.get("$unset", []):
+                doc.pop(key, None)
+        return
+    doc.update(copy.deepcopy(update.get("$set", {})))
+    if inserting:
+        doc.update(copy.deepcopy(update.get("$setOnInsert", {})))
+    for key in update.get("$unset", {}):
+        doc.pop(key, None)
+    for key, amount in update.get("$inc", {}).items():
+        doc[key] = doc.get(key, 0) + amount
+    for key, value in update.get("$addToSet", {}).items():
+        values = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+        target = doc.setdefault(key, [])
+        target.extend(v for v in values if v not in target)
+
+
+def _result(**fields):
+    return type("Result", (), fields)()
+
+
+class FakeCursor:
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.docs = docs
+
+    def sort(self, key, direction=None):
+        keys = key if isinstance(key, list) else [(key, direction or 1)]
+        for field, order in reversed(keys):
+            self.docs.sort(key=lambda doc: _order(_get(doc, field)), reverse=order < 0)
+        return self
+
+    def limit(self, count):
+        if count:
+            self.docs = self.docs[:count]
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs[:length] if length else list(self.docs)
+
+    def __aiter__(self):
+        async def rows():
+            for doc in self.docs:
+                yield doc
+        return rows()
+
+
+class FakeCollection:
+    """
+    Documents kept in a dict by _id. Unique indexes listed in `indexes` are
+    enforced on insert, the way the server would with the same index.
+    """
+
+    def __init__(self, name: str = "collection", db: Optional["FakeDatabase"] = None, indexes=None):
+        self.name = name
+        self.db = db
+        self.docs: Dict[Any, Dict[str, Any]] = {}
+        self.indexes: Dict[str, Dict[str, Any]] = {"_id_": {"key": [("_id", 1)]}, **(indexes or {})}
+        self.created: List[str] = []
+        self.dropped: List[str] = []
+
+    def _record(self, op: str, session=None) -> None:
+        if self.db is not None:
+            self.db.calls.append((self.name, op, session))
+
+    def add(self, *docs: Dict[str, Any]) -> None:
+        """Seed documents without going through (or recording) an insert."""
+        for doc in docs:
+            doc.setdefault("_id", ObjectId())
+            self.docs[doc["_id"]] = doc
+
+    def _duplicate(self, doc: Dict[str, Any]) -> bool:
+        if doc["_id"] in self.docs:
+            return True
+        for info in self.indexes.values():
+            if info.get("unique"):
+                fields = [field for field, _ in info["key"]]
+                key = [_get(doc, field) for field in fields]
+                if info.get("sparse") and all(v is _MISSING for v in key):
+                    continue
+                if any([_get(other, field) for field in fields] == key for other in self.docs.values()):
+                    return True
+        return False
+
+    def _insert(self, doc: Dict[str, Any]) -> Any:
+        doc.setdefault("_id", ObjectId())
+        if self._duplicate(doc):
+            raise DuplicateKeyError("E11000 duplicate key error", 11000)
+        self.docs[doc["_id"]] = copy.deepcopy(doc)
+        return doc["_id"]
+
+    async def insert_one(self, doc, session=None):
+        self._record("insert", session)
+        return _result(inserted_id=self._insert(doc))
+
+    async def insert_many(self, docs, ordered=True, session=None):
+        self._record("insert_many", session)
+        inserted, errors = [], []
+        for i, doc in enumerate(docs):
+            try:
+                inserted.append(self._insert(doc))
+            except DuplicateKeyError:
+                errors.append({"index": i, "code": 11000, "errmsg": "E11000 duplicate key error"})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(inserted)})
+        return _result(inserted_ids=inserted)
+
+    def _matching(self, query) -> List[Dict[str, Any]]:
+        return [doc for doc in self.docs.values() if matches(doc, query)]
+
+    def find(self, query=None, projection=None, session=None):
+        return FakeCursor([copy.deepcopy(doc) for doc in self._matching(query)])
+
+    async def find_one(self, query=None, projection=None, session=None):
+        found = self._matching(query)
+        return copy.deepcopy(found[0]) if found else None
+
+    async def count_documents(self, query, session=None):
+        return len(self._matching(query))
+
+    def _upsert(self, query: Dict[str, Any], update: Any) -> Dict[str, Any]:
+        doc = {key: value for key, value in query.items() if not key.startswith("$") and not isinstance(value, dict)}
+        apply_update(doc, update, inserting=True)
+        doc.setdefault("_id", ObjectId())
+        self.docs[doc["_id"]] = doc
+        return doc
+
+    async def find_one_and_update(self, query, update, sort=None, upsert=False,
+                                  return_document=ReturnDocument.BEFORE, projection=None, session=None):
+        self._record("find_one_and_update", session)
+        found = FakeCursor(self._matching(query))
+        if sort:
+            found.sort(sort)
+        if not found.docs:
+            if not upsert:
+                return None
+            doc = self._upsert(query, update)
+            return copy.deepcopy(doc) if return_document == ReturnDocument.AFTER else None
+        doc = found.docs[0]
+        before = copy.deepcopy(doc)
+        apply_update(doc, update)
+        return copy.deepcopy(doc) if return_document == ReturnDocument.AFTER else before
+
+    async def update_one(self, query, update, upsert=False, session=None):
+        self._record("update", session)
+        found = self._matching(query)
+        if found:
+            apply_update(found[0], update)
+            return _result(matched_count=1, modified_count=1, upserted_id=None)
+        if upsert:
+            return _result(matched_count=0, modified_count=0, upserted_id=self._upsert(query, update)["_id"])
+        return _result(matched_count=0, modified_count=0, upserted_id=None)
+
+    async def update_many(self, query, update, upsert=False, session=None):
+        self._record("update_many", session)
+        found = self._matching(query)
+        for doc in found:
+            apply_update(doc, update)
+        return _result(matched_count=len(found), modified_count=len(found), upserted_id=None)
+
+    async def replace_one(self, query, replacement, upsert=False, session=None):
+        self._record("replace", session)
+        found = self._matching(query)
+        if found:
+            replacement = {**copy.deepcopy(replacement), "_id": found[0]["_id"]}
+            self.docs[found[0]["_id"]] = replacement
+            return _result(matched_count=1, modified_count=1, upserted_id=None)
+        if upsert:
+            doc = {**copy.deepcopy(replacement)}
+            doc.setdefault("_id", ObjectId())
+            self.docs[doc["_id"]] = doc
+            return _result(matched_count=0, modified_count=0, upserted_id=doc["_id"])
+        return _result(matched_count=0, modified_count=0, upserted_id=None)
+
+    async def delete_one(self, query, session=None):
+        self._record("delete", session)
+        found = self._matching(query)
+        if found:
+            self.docs.pop(found[0]["_id"])
+        return _result(deleted_count=len(found[:1]))
+
+    async def delete_many(self, query, session=None):
+        self._record("delete_many", session)
+        found = self._matching(query)
+        for doc in found:
+            self.docs.pop(doc["_id"])
+        return _result(deleted_count=len(found))
+
+    async def bulk_write(self, requests, ordered=True, session=None):
+        self._record("bulk_write", session)
+        counts = {"inserted": 0, "matched": 0, "modified": 0, "upserted": 0, "deleted": 0}
+        errors = []
+        for i, request in enumerate(requests):
+            try:
+                if isinstance(request, InsertOne):
+                    self._insert(request._doc)
+                    counts["inserted"] += 1
+                elif isinstance(request, (UpdateOne, UpdateMany)):
+                    found = self._matching(request._filter)
+                    if isinstance(request, UpdateOne):
+                        found = found[:1]
+                    for doc in found:
+                        apply_update(doc, request._doc)
+                    if not found and request._upsert:
+                        self._upsert(request._filter, request._doc)
+                        counts["upserted"] += 1
+                    counts["matched"] += len(found)
+                    counts["modified"] += len(found)
+                elif isinstance(request, ReplaceOne):
+                    result = await self.replace_one(request._filter, request._doc, upsert=request._upsert)
+                    counts["matched"] += result.matched_count
+                    counts["modified"] += result.modified_count
+                    counts["upserted"] += result.upserted_id is not None
+                elif isinstance(request, (DeleteOne, DeleteMany)):
+                    found = self._matching(request._filter)
+                    if isinstance(request, DeleteOne):
+                        found = found[:1]
+                    for doc in found:
+                        self.docs.pop(doc["_id"])
+                    counts["deleted"] += len(found)
+            except DuplicateKeyError:
+                errors.append({"index": i, "code": 11000, "errmsg": "E11000 duplicate key error"})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({
+                "writeErrors": errors, "nInserted": counts["inserted"],
+                "nUpserted": counts["upserted"], "nModified": counts["modified"]
+            })
+        return _result(
+            inserted_count=counts["inserted"], matched_count=counts["matched"], modified_count=counts["modified"],
+            upserted_count=counts["upserted"], deleted_count=counts["deleted"]
+        )
+
+    async def index_information(self):
+        return copy.deepcopy(self.indexes)
+
+    async def create_indexes(self, models):
+        for model in models:
+            document = model.document
+            self.created.append(document["name"])
+            self.indexes[document["name"]] = {
+                "key": list(document["key"].items()),
+                **{k: v for k, v in document.items() if k not in ("key", "name")}
+            }
+
+    async def drop_index(self, name):
+        self.dropped.append(name)
+        self.indexes.pop(name)
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def with_transaction(self, callback):
+        return await callback(self)
+
+
+class FakeClient:
+    def __init__(self, topology: str = "Single"):
+        self.topology_description = type("Topology", (), {"topology_type_name": topology})()
+
+    async def start_session(self):
+        return FakeSession()
+
+
+class FakeDatabase(dict):
+    """Collections are created on first access; every write is logged to `calls` as (collection, op, session)."""
+
+    def __init__(self, topology: str = "Single"):
+        super().__init__()
+        self.client = FakeClient(topology)
+        self.calls: List[tuple] = []
+
+    def __missing__(self, name):
+        collection = self[name] = FakeCollection(name, self)
+        return collection
+
+    def get_collection(self, name):
+        return self[name]
+
+
+@pytest.fixture
+def make_db():
+    """FakeDatabase factory, e.g. `make_db("ReplicaSetWithPrimary")` for transactional writes."""
+    return FakeDatabase
+
+
+@pytest.fixture
+def fake_db():
+    return FakeDatabase()
+
+
+@pytest.fixture
+def patch_database(monkeypatch, fake_db):
+    """Point a module's `get_database` at `fake_db`: `patch_database(module)`."""
+
+    def patch(*modules):
+        async def get_database():
+            return fake_db
+
+        for module in modules:
+            monkeypatch.setattr(module, "get_database", get_database)
+        return fake_db
+
+    return patch
@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.services.admin_summaries import (
+    ADMIN_SUMMARIES, list_admin_summaries, rebuild_admin_summaries, record_interview_feedback
+)
+
+
+def test_pages_stay_stable_while_rows_are_updated(fake_db):
+    start = datetime(2026, 1, 1)
+    rows = [
+        {"_id": ObjectId(), "interview_id": f"i{i}", "status": "pending",
+         "created_at": start + timedelta(minutes=i), "updated_at": start + timedelta(minutes=i)}
+        for i in range(5)
+    ]
+    fake_db[ADMIN_SUMMARIES].add(*rows)
+
+    first, cursor = asyncio.run(list_admin_summaries(fake_db, limit=2))
+    assert [row["interview_id"] for row in first] == ["i4", "i3"]
+
+    # Feedback on a row not shown yet bumps updated_at; the row must not jump onto a page already served
+    asyncio.run(record_interview_feedback(fake_db, rows[1]["_id"], "Great", score=9.0))
+    second, cursor = asyncio.run(list_admin_summaries(fake_db, limit=2, cursor=cursor))
+    last, cursor = asyncio.run(list_admin_summaries(fake_db, limit=2, cursor=cursor))
+
+    assert [row["interview_id"] for row in second + last] == ["i2", "i1", "i0"]
+    assert cursor is None
+    assert second[1]["score"] == 9.0
+
+
+class _Aggregation:
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    async def to_list(self, length=None):
+        return []
+
+
+def test_rebuild_never_overwrites_scores(fake_db):
+    pipelines = []
+    fake_db["interviews"].aggregate = lambda pipeline: pipelines.append(pipeline) or _Aggregation(pipeline)
+
+    asyncio.run(rebuild_admin_summaries(fake_db))
+
+    (pipeline,) = pipelines
+    project = next(stage["$project"] for stage in pipeline if "$project" in stage)
+    merge = pipeline[-1]["$merge"]
+    assert "score" not in project
+    assert merge["whenMatched"] == "keepExisting"
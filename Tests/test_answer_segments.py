@@ -0,0 +1,97 @@
+import asyncio
+
+import numpy as np
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.services.ai.answer_segments import (
+    ANSWER_ANALYSIS, build_answer_analyses, question_positions, save_answer_analyses, segment_clarity
+)
+from app.services.ai.timeline import EMOTION_CODES, ERROR_CODE, EmotionTimeline, decode_timeline, summarize_segments
+
+
+def _timeline():
+    labels = ["happy", "happy", "sad", "error", "neutral", "neutral", "happy", "fear"]
+    codes = [EMOTION_CODES.get(label, ERROR_CODE) for label in labels]
+    scores = np.zeros((len(codes), 7), dtype=np.float32)
+    for i, code in enumerate(codes):
+        if code != ERROR_CODE:
+            scores[i, code] = 80.0
+    return EmotionTimeline(np.arange(len(codes), dtype=np.float64), np.array(codes), scores)
+
+
+def test_segments_are_summarized_from_their_own_frames():
+    first, second, empty = summarize_segments(_timeline(), np.array([0.0, 3.0, 20.0]), np.array([3.0, 8.0, 25.0]))
+
+    assert first["frame_range"] == [0, 3]
+    assert first["dominant_emotion"] == "happy"
+    assert first["emotion_changes"] == 1
+    assert round(first["mean_scores"]["happy"], 2) == round(160 / 3, 2)
+
+    # The failed frame at t=3 is skipped; the change into the segment is not counted
+    assert second["frames"] == 4
+    assert second["dominant_emotion"] == "neutral"
+    assert second["emotion_changes"] == 2
+    assert empty["frames"] == 0 and empty["dominant_emotion"] is None
+
+
+def test_segment_clarity_matches_whole_signal_formula():
+    rms = np.abs(np.sin(np.linspace(0, 20, 400))) + 0.1
+    times = np.linspace(0, 10, 400, endpoint=False)
+
+    whole = 10 * np.log10(np.mean(rms ** 2) / (np.var(rms) + 1e-10)) / 10
+    assert segment_clarity(times, rms, np.array([0.0]), np.array([10.0]))[0] == round(float(np.clip(whole, 0, 10)), 2)
+    assert segment_clarity(times, rms, np.array([20.0]), np.array([30.0])) == [None]
+
+
+def test_answer_documents_carry_question_and_timeline_slice():
+    interview = {"_id": ObjectId(), "questions": ["Q1", "Q2"], "question_ids": ["a", "b"]}
+    docs = build_answer_analyses(
+        "user-1", interview, [{"start": 0.0, "end": 3.0}, {"start": 3.0, "end": 8.0, "question_id": "b"}],
+        timeline=_timeline()
+    )
+
+    assert [d["question"] for d in docs] == ["Q1", "Q2"]
+    assert [d["question_id"] for d in docs] == ["a", "b"]
+    assert decode_timeline(docs[1]["facial_timeline"]).times.tolist() == [3.0, 4.0, 5.0, 6.0, 7.0]
+
+
+@pytest.mark.parametrize("segments", [
+    [{"start": 0.0, "end": 3.0, "question_id": "x"}],
+    [{"start": 0.0, "end": 3.0, "question_id": "b"}, {"start": 3.0, "end": 8.0, "question_id": "b"}],
+    # The first segment answers question 0 by position; the second names it again
+    [{"start": 0.0, "end": 3.0}, {"start": 3.0, "end": 8.0, "question_id": "a"}],
+])
+def test_unknown_or_repeated_questions_are_rejected(segments):
+    interview = {"_id": ObjectId(), "questions": ["Q1", "Q2"], "question_ids": ["a", "b"]}
+    with pytest.raises(HTTPException) as exc:
+        question_positions(interview, segments)
+    assert exc.value.status_code == 400
+
+
+def test_out_of_order_answers_are_stored_by_question_position(fake_db):
+    interview = {"_id": ObjectId(), "questions": ["Q1", "Q2", "Q3"], "question_ids": [ObjectId(), ObjectId(), ObjectId()]}
+    interview_id = str(interview["_id"])
+    third, first = str(interview["question_ids"][2]), str(interview["question_ids"][0])
+    answers = fake_db[ANSWER_ANALYSIS]
+
+    everything = [{"start": float(i), "end": i + 1.0} for i in range(3)]
+    asyncio.run(save_answer_analyses(fake_db, interview_id, build_answer_analyses("user-1", interview, everything)))
+    docs = build_answer_analyses(
+        "user-1", interview,
+        [{"start": 0.0, "end": 3.0, "question_id": third}, {"start": 3.0, "end": 8.0, "question_id": first}]
+    )
+    asyncio.run(save_answer_analyses(fake_db, interview_id, docs))
+
+    assert [d["question"] for d in docs] == ["Q3", "Q1"]
+    assert [d["question_index"] for d in docs] == [2, 0]
+
+    async def fetch(index):
+        return await answers.find_one({"interview_id": interview_id, "question_index": index, "user_id": "user-1"})
+
+    assert asyncio.run(fetch(0))["question"] == "Q1"
+    assert asyncio.run(fetch(2))["start"] == 0.0
+    # The earlier run's answer to the skipped question is removed
+    assert asyncio.run(fetch(1)) is None
+    assert len(answers.docs) == 2
@@ -0,0 +1,109 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import auth
+from app.services.auth import ACCOUNT_LOCK_DURATION, MAX_LOGIN_ATTEMPTS, authenticate_user, get_user, invalidate_user
+from app.services.cache import TTLCache
+from app.services.passwords import PasswordHasher, bcrypt_hash
+
+PASSWORD = "Secret#123"
+
+
+@pytest.fixture
+def users(patch_database, monkeypatch):
+    # The lowest bcrypt cost keeps the tests fast; stored hashes use the same cost so none are rehashed
+    monkeypatch.setattr(auth, "password_hasher", PasswordHasher(rounds=4, max_workers=1))
+    monkeypatch.setattr(auth, "user_cache", TTLCache(maxsize=10, ttl=60))
+    return patch_database(auth)["users"]
+
+
+def _user(**fields):
+    return {
+        "_id": "u1", "client_id": "c1", "Name": "Ada", "email": "user@example.com", "role": "candidate",
+        "password": bcrypt_hash(PASSWORD, rounds=4), **fields
+    }
+
+
+def _login(password):
+    return asyncio.run(authenticate_user("User@Example.com", password))
+
+
+def _writes(db):
+    return [op for _, op, _ in db.calls]
+
+
+def test_failed_logins_count_up_then_lock(users):
+    users.add(_user())
+
+    for attempt in range(1, MAX_LOGIN_ATTEMPTS):
+        assert _login("wrong") is None
+        assert users.docs["u1"]["login_attempts"] == attempt
+        assert "is_locked" not in users.docs["u1"]
+
+    before = datetime.utcnow()
+    with pytest.raises(HTTPException) as exc:
+        _login("wrong")
+    assert exc.value.status_code == 403
+    stored = users.docs["u1"]
+    assert stored["is_locked"] is True
+    assert stored["locked_until"] >= before + ACCOUNT_LOCK_DURATION
+
+    # While locked even the right password is refused, without another write
+    with pytest.raises(HTTPException) as exc:
+        _login(PASSWORD)
+    assert "temporarily locked" in exc.value.detail
+    assert stored["login_attempts"] == MAX_LOGIN_ATTEMPTS
+
+
+def test_expired_lock_starts_a_fresh_count(users, fake_db):
+    users.add(_user(
+        login_attempts=MAX_LOGIN_ATTEMPTS, is_locked=True, locked_until=datetime.utcnow() - timedelta(minutes=1)
+    ))
+
+    assert _login("wrong") is None
+    stored = users.docs["u1"]
+    assert stored["login_attempts"] == 1
+    assert "is_locked" not in stored and "locked_until" not in stored
+    assert _writes(fake_db) == ["find_one_and_update"]
+
+
+def test_successful_login_resets_a_dirty_record(users, fake_db):
+    users.add(_user(login_attempts=3))
+
+    assert _login(PASSWORD)["login_attempts"] == 0
+    assert users.docs["u1"]["login_attempts"] == 0
+    assert _writes(fake_db) == ["update"]
+
+
+def test_successful_login_with_a_clean_record_does_not_write(users, fake_db):
+    users.add(_user())
+
+    user = _login(PASSWORD)
+
+    assert user["email"] == "user@example.com"
+    assert _writes(fake_db) == []
+
+
+def test_get_user_is_cached_until_invalidated(users):
+    users.add(_user())
+    assert asyncio.run(get_user("c1"))["role"] == "candidate"
+
+    # A role change is only seen once the cached entry is dropped
+    users.docs["u1"]["role"] = "hr"
+    assert asyncio.run(get_user("c1"))["role"] == "candidate"
+    invalidate_user("c1")
+    assert asyncio.run(get_user("c1"))["role"] == "hr"
+
+
+def test_cached_user_never_holds_the_password(users):
+    users.add(_user())
+    user = asyncio.run(get_user("c1"))
+
+    # A password change has nothing stale to serve from the cache
+    assert "password" not in user and "password" not in auth.user_cache.get("c1")
+    user["role"] = "admin"
+    assert asyncio.run(get_user("c1"))["role"] == "candidate"
+    assert asyncio.run(get_user("missing")) is None
@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+from app.services.ai.batching import MicroBatcher
+
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        return [ValueError(f"bad {item}") if item < 0 else item * 10 for item in items]
+
+
+def test_flushes_when_batch_is_full():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=3, max_wait_ms=10_000)
+
+    async def scenario():
+        started = time.perf_counter()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+        # A full batch goes out straight away instead of waiting for the timer
+        assert time.perf_counter() - started < 1
+        return results
+
+    assert asyncio.run(scenario()) == [0, 10, 20]
+    assert recorder.batches == [[0, 1, 2]]
+
+
+def test_flushes_partial_batch_after_max_wait():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=8, max_wait_ms=20)
+
+    async def scenario():
+        first = asyncio.gather(batcher.submit(1), batcher.submit(2))
+        await asyncio.sleep(0.1)
+        late = await batcher.submit(3)
+        return await first, late
+
+    assert asyncio.run(scenario()) == ([10, 20], 30)
+    assert recorder.batches == [[1, 2], [3]]
+
+
+def test_overflow_is_split_into_batches():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=2, max_wait_ms=5)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(scenario()) == [0, 10, 20, 30, 40]
+    assert [len(batch) for batch in recorder.batches] == [2, 2, 1]
+
+
+def test_item_errors_reach_only_their_caller():
+    batcher = MicroBatcher(Recorder(), max_batch_size=3, max_wait_ms=5)
+
+    async def scenario():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(-1), batcher.submit(2), return_exceptions=True)
+
+    ok, failed, ok2 = asyncio.run(scenario())
+    assert (ok, ok2) == (10, 20)
+    assert isinstance(failed, ValueError) and str(failed) == "bad -1"
+
+
+def test_batch_failure_fails_every_caller():
+    def broken(items):
+        raise RuntimeError("model unavailable")
+
+    batcher = MicroBatcher(broken, max_batch_size=2, max_wait_ms=5)
+
+    async def scenario():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(scenario()))
+
+
+def test_close_drains_pending_and_in_flight_batches():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=8, max_wait_ms=10_000)
+
+    async def scenario():
+        waiting = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        await batcher.close()
+        assert not batcher._tasks
+        return [task.result() for task in waiting]
+
+    assert asyncio.run(scenario()) == [0, 10, 20]
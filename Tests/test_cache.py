@@ -0,0 +1,39 @@
+from app.services import cache
+from app.services.cache import TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    users = TTLCache(maxsize=10, ttl=30)
+    users.set("a", 1)
+    users.set("b", 2, ttl=5)
+
+    clock.now += 10
+    assert users.get("a") == 1
+    assert users.get("b") is None and "b" not in users
+
+    clock.now += 20
+    assert users.get("a", "gone") == "gone"
+    assert len(users) == 0
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    users = TTLCache(maxsize=2, ttl=60)
+    users.set("a", 1)
+    users.set("b", 2)
+    assert users.get("a") == 1  # "b" is now the oldest
+
+    users.set("c", 3)
+
+    assert "b" not in users
+    assert (users.get("a"), users.get("c")) == (1, 3)
+    assert users.pop("a") == 1 and users.pop("a") is None
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import BulkWriteError
+
+from app.models.candidate_answers import CandidateAnswer, CandidateAnswerBatch
+from app.routers import candidate_answers
+from app.routers.candidate_answers import UniqueIndexCheck, store_answer, store_answers
+
+
+UNIQUE_ANSWER_INDEX = {
+    "candidate_id_1_question_id_1": {"key": [("candidate_id", 1), ("question_id", 1)], "unique": True}
+}
+
+
+@pytest.fixture
+def answers(monkeypatch, patch_database, request):
+    collection = patch_database(candidate_answers)["candidate_answers"]
+    if getattr(request, "param", True):
+        collection.indexes.update(UNIQUE_ANSWER_INDEX)
+    monkeypatch.setattr(candidate_answers, "unique_answer_index", UniqueIndexCheck())
+    collection.add({"_id": "existing", "candidate_id": "c1", "question_id": "q1"})
+    return collection
+
+
+def _batch(*question_ids):
+    return CandidateAnswerBatch(
+        candidate_id="c1", interview_id="i1",
+        answers=[{"question_id": qid, "answer_text": "..."} for qid in question_ids]
+    )
+
+
+@pytest.mark.parametrize("answers", [True, False], indirect=True, ids=["unique-index", "lookup-fallback"])
+def test_bulk_reports_each_item(answers):
+    result = asyncio.run(store_answers(_batch("q2", "q1", "q3", "q2")))
+
+    assert [(r.question_id, r.status) for r in result.results] == [
+        ("q2", "created"), ("q1", "duplicate"), ("q3", "created"), ("q2", "duplicate")
+    ]
+    assert (result.created, result.duplicates, result.failed) == (2, 2, 0)
+    assert all(r.id for r in result.results if r.status == "created")
+    assert sorted(d["question_id"] for d in answers.docs.values()) == ["q1", "q2", "q3"]
+
+
+def test_bulk_reports_other_write_errors_as_failed(answers):
+    async def insert_many(docs, ordered=True):
+        raise BulkWriteError({"writeErrors": [{"index": 1, "code": 121, "errmsg": "Document failed validation"}]})
+
+    answers.insert_many = insert_many
+    result = asyncio.run(store_answers(_batch("q2", "q3")))
+
+    assert [r.status for r in result.results] == ["created", "failed"]
+    assert result.results[1].detail == "Document failed validation"
+
+
+@pytest.mark.parametrize("answers", [True, False], indirect=True, ids=["unique-index", "lookup-fallback"])
+def test_single_duplicate_is_rejected(answers):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(store_answer(CandidateAnswer(candidate_id="c1", question_id="q1")))
+    assert exc.value.status_code == 400
+    assert len(answers.docs) == 1
+
+
+def test_index_check_trusts_the_index_once_built(fake_db):
+    collection = fake_db["candidate_answers"]
+    check = UniqueIndexCheck(negative_ttl=0)
+
+    assert asyncio.run(check(collection)) is False
+    collection.indexes.update(UNIQUE_ANSWER_INDEX)
+    assert asyncio.run(check(collection)) is True
+    collection.indexes.clear()
+    assert asyncio.run(check(collection)) is True
+
+
+def test_missing_index_is_not_rechecked_on_every_insert(fake_db, monkeypatch):
+    collection = fake_db["candidate_answers"]
+    clock = [1000.0]
+    monkeypatch.setattr(candidate_answers.time, "monotonic", lambda: clock[0])
+    lookups = []
+    index_information = collection.index_information
+
+    async def counted():
+        lookups.append(clock[0])
+        return await index_information()
+
+    collection.index_information = counted
+    check = UniqueIndexCheck(negative_ttl=30)
+
+    assert asyncio.run(check(collection)) is False
+    collection.indexes.update(UNIQUE_ANSWER_INDEX)
+    clock[0] += 10
+    assert asyncio.run(check(collection)) is False  # the miss is still cached
+    clock[0] += 30
+    assert asyncio.run(check(collection)) is True
+    assert lookups == [1000.0, 1040.0]
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from app.services import email_outbox
+from app.services.email_outbox import (
+    EMAIL_OUTBOX, STATUS_FAILED, STATUS_PENDING, STATUS_SENDING, STATUS_SENT,
+    MemoryTransport, OutboxWorker, retry_delay
+)
+
+
+def _message(**fields):
+    return {
+        "_id": ObjectId(), "to": "user@example.com", "subject": "Hello", "html": "<p>Hi</p>",
+        "status": STATUS_PENDING, "attempts": 0, "next_attempt_at": datetime.utcnow() - timedelta(seconds=1),
+        **fields
+    }
+
+
+class _FailingTransport(MemoryTransport):
+    async def send(self, message):
+        raise OSError("connection refused")
+
+
+@pytest.fixture
+def outbox(patch_database):
+    return patch_database(email_outbox)[EMAIL_OUTBOX]
+
+
+def _worker(transport, **kwargs):
+    worker = OutboxWorker(**kwargs)
+    worker.transport = transport
+    return worker
+
+
+def test_batch_is_claimed_delivered_and_written_in_one_bulk(outbox, fake_db):
+    transport = MemoryTransport()
+    docs = [_message(to=f"user{i}@example.com") for i in range(3)]
+    outbox.add(*docs, _message(next_attempt_at=datetime.utcnow() + timedelta(hours=1)))  # last one not due yet
+    worker = _worker(transport, batch_size=10)
+
+    assert asyncio.run(worker.process_batch()) == 3
+    assert sorted(m["To"] for m in transport.sent) == [d["to"] for d in docs]
+    assert [op for _, op, _ in fake_db.calls if op == "bulk_write"] == ["bulk_write"]
+    for doc in docs:
+        stored = outbox.docs[doc["_id"]]
+        assert stored["status"] == STATUS_SENT
+        assert stored["attempts"] == 1
+        assert "lease_until" not in stored
+
+
+def test_claims_respect_batch_size_and_live_leases(outbox, fake_db):
+    expired = _message(status=STATUS_SENDING, lease_until=datetime.utcnow() - timedelta(minutes=1))
+    outbox.add(
+        _message(), _message(), _message(),
+        _message(status=STATUS_SENDING, lease_until=datetime.utcnow() + timedelta(minutes=1)),
+        expired
+    )
+    worker = _worker(MemoryTransport(), batch_size=2)
+
+    first = asyncio.run(worker._claim(fake_db))
+    assert len(first) == 2
+    assert all(doc["status"] == STATUS_SENDING and doc["lease_until"] > datetime.utcnow() for doc in first)
+
+    # Claimed messages are not handed out twice; an expired lease is reclaimed
+    rest = asyncio.run(worker._claim(fake_db))
+    ids = {doc["_id"] for doc in first} | {doc["_id"] for doc in rest}
+    assert len(ids) == 4
+    assert expired["_id"] in ids
+
+
+def test_failures_back_off_until_dead(outbox):
+    doc = _message()
+    outbox.add(doc)
+    worker = _worker(_FailingTransport(), max_attempts=3)
+
+    for attempt in (1, 2):
+        before = datetime.utcnow()
+        assert asyncio.run(worker.process_batch()) == 1
+        stored = outbox.docs[doc["_id"]]
+        assert stored["status"] == STATUS_PENDING
+        assert stored["attempts"] == attempt
+        assert stored["last_error"] == "connection refused"
+        assert stored["next_attempt_at"] > before
+        stored["next_attempt_at"] = datetime.utcnow() - timedelta(seconds=1)  # fast-forward the backoff
+
+    assert asyncio.run(worker.process_batch()) == 1
+    assert outbox.docs[doc["_id"]]["status"] == STATUS_FAILED
+    assert asyncio.run(worker.process_batch()) == 0
+
+
+def test_retry_delay_is_jittered_exponential():
+    for attempts, expected in ((1, 10), (2, 20), (4, 80)):
+        delays = [retry_delay(attempts, base=10) for _ in range(50)]
+        assert all(0.8 * expected <= d <= 1.2 * expected for d in delays)
+    assert len({round(retry_delay(1, base=10), 6) for _ in range(20)}) > 1
+    assert retry_delay(50, base=10) <= 3600 * 1.2
@@ -0,0 +1,60 @@
+import asyncio
+
+from app.services import email_validation
+from app.services.email_validation import EmailDomainChecker, is_valid_email
+
+
+class StubResolver:
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = []
+
+    async def is_deliverable(self, domain):
+        self.calls.append(domain)
+        await asyncio.sleep(0)
+        return self.answers.get(domain, False)
+
+
+def test_syntax_and_deliverability_without_network(monkeypatch):
+    resolver = StubResolver({"example.com": True})
+    # A throwaway checker, so neither the stub nor its cached answers outlive this test
+    monkeypatch.setattr(email_validation, "domain_checker", EmailDomainChecker(resolver))
+
+    assert asyncio.run(is_valid_email("Someone@Example.com"))
+    assert not asyncio.run(is_valid_email("someone@no-mail.example.net"))
+    assert not asyncio.run(is_valid_email("not-an-email"))
+    assert asyncio.run(is_valid_email("someone@no-mail.example.net", check_deliverability=False))
+    assert resolver.calls == ["example.com", "no-mail.example.net"]
+
+
+def test_results_are_cached_including_negatives():
+    resolver = StubResolver({"example.com": True})
+    checker = EmailDomainChecker(resolver)
+
+    async def run():
+        for _ in range(3):
+            assert await checker.is_deliverable("example.com")
+            assert not await checker.is_deliverable("bad.test")
+
+    asyncio.run(run())
+    assert resolver.calls == ["example.com", "bad.test"]
+
+
+def test_concurrent_lookups_share_one_query():
+    resolver = StubResolver({"example.com": True})
+    checker = EmailDomainChecker(resolver)
+
+    async def run():
+        return await asyncio.gather(*(checker.is_deliverable("example.com") for _ in range(5)))
+
+    assert asyncio.run(run()) == [True] * 5
+    assert resolver.calls == ["example.com"]
+
+
+def test_inconclusive_lookup_is_allowed_and_not_cached():
+    resolver = StubResolver({"flaky.test": None})
+    checker = EmailDomainChecker(resolver)
+
+    assert asyncio.run(checker.is_deliverable("flaky.test"))
+    assert asyncio.run(checker.is_deliverable("flaky.test"))
+    assert resolver.calls == ["flaky.test", "flaky.test"]
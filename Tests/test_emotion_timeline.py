@@ -0,0 +1,129 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from app.services.ai.timeline import (
+    EmotionTimeline, EMOTION_LABELS, summarize_timeline, encode_timeline, decode_timeline,
+    downsample_timeline, lttb_indices
+)
+
+
+def _record(time, emotion):
+    if emotion == "error":
+        return {"time": time, "dominant_emotion": "error", "emotion_scores": {}}
+    scores = {label: (90.0 if label == emotion else 10.0 / 6) for label in EMOTION_LABELS}
+    return {"time": time, "dominant_emotion": emotion, "emotion_scores": scores}
+
+
+FRAMES = [
+    _record(0.0, "neutral"),
+    _record(1.0, "happy"),
+    _record(2.0, "error"),
+    _record(3.0, "happy"),
+    _record(4.0, "sad"),
+    _record(5.0, "neutral"),
+    _record(6.0, "happy"),
+]
+
+
+def test_records_round_trip():
+    timeline = EmotionTimeline.from_records(FRAMES)
+    records = timeline.to_records()
+
+    assert len(timeline) == len(FRAMES)
+    assert [r["dominant_emotion"] for r in records] == [f["dominant_emotion"] for f in FRAMES]
+    assert records[2]["emotion_scores"] == {}
+    assert abs(records[1]["emotion_scores"]["happy"] - 90.0) < 1e-4
+
+
+def test_summary_matches_counter_semantics():
+    summary = summarize_timeline(EmotionTimeline.from_records(FRAMES))
+    emotions = [f["dominant_emotion"] for f in FRAMES if f["dominant_emotion"] != "error"]
+
+    assert summary["dominant_emotions"] == dict(Counter(emotions))
+    assert summary["top_3"] == Counter(emotions).most_common(3)
+    assert summary["emotion_timestamps"] == {
+        "neutral": [0.0, 5.0],
+        "happy": [1.0, 3.0, 6.0],
+        "sad": [4.0],
+    }
+    assert abs(summary["emotion_percentage"]["happy"] - 50.0) < 1e-9
+    assert summary["emotion_changes"] == 4
+
+
+def test_rolling_window_peak():
+    summary = summarize_timeline(EmotionTimeline.from_records(FRAMES), rolling_window=2)
+    rolling = summary["rolling_window"]
+
+    assert rolling["frames"] == 2
+    assert rolling["peak_start_time"]["happy"] == 1.0
+    assert rolling["peak_mean_score"]["happy"] == 90.0
+
+
+def test_summary_without_valid_frames():
+    assert summarize_timeline(EmotionTimeline.from_records([])) == {"message": "No emotions detected in frames."}
+    only_errors = EmotionTimeline.from_records([_record(0.0, "error")])
+    assert summarize_timeline(only_errors) == {"message": "No valid emotions detected."}
+
+
+def test_binary_encoding_round_trip():
+    timeline = EmotionTimeline.from_records(FRAMES)
+    encoded = encode_timeline(timeline)
+    decoded = decode_timeline(encoded)
+
+    assert len(encoded) == 12 + len(FRAMES) * (4 + 1 + len(EMOTION_LABELS))
+    np.testing.assert_array_equal(decoded.codes, timeline.codes)
+    np.testing.assert_allclose(decoded.times, timeline.times)
+    np.testing.assert_allclose(decoded.scores, timeline.scores, atol=100 / 255)
+
+
+def test_decode_rejects_corrupt_payload():
+    encoded = encode_timeline(EmotionTimeline.from_records(FRAMES))
+
+    with pytest.raises(ValueError):
+        decode_timeline(encoded[:-1])
+    with pytest.raises(ValueError):
+        decode_timeline(b"XXXX" + encoded[4:])
+
+
+def test_downsample_mean_buckets():
+    timeline = EmotionTimeline.from_records(FRAMES)
+    chart = downsample_timeline(timeline, 3)
+
+    # Spans of 2s: [0, 2) [2, 4) [4, 6]; the failed frame at t=2 is skipped
+    assert chart["times"] == [0.0, 2.0, 4.0]
+    assert chart["frames"] == [2, 1, 3]
+    # Ties go to the earlier label, as with argmax
+    assert chart["dominant_emotion"] == ["happy", "happy", "happy"]
+    assert chart["scores"]["neutral"][0] == round((90.0 + 10.0 / 6) / 2, 2)
+    assert chart["scores"]["happy"][1] == 90.0
+    assert chart["points"] == 3 and chart["source_frames"] == 7
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(100, dtype=np.float64)
+    y = np.zeros(100)
+    y[37] = 50.0
+    index = lttb_indices(x, y, 10)
+
+    assert len(index) == 10
+    assert index[0] == 0 and index[-1] == 99
+    assert 37 in index
+    assert list(lttb_indices(x[:5], y[:5], 10)) == [0, 1, 2, 3, 4]
+    # Thresholds too small for a middle bucket still respect the limit
+    assert list(lttb_indices(x, y, 2)) == [0, 99]
+    assert list(lttb_indices(x, y, 1)) == [0]
+    assert list(lttb_indices(x[:0], y[:0], 2)) == []
+
+    chart = downsample_timeline(EmotionTimeline.from_records(FRAMES), 4, method="lttb")
+    assert chart["emotion"] == "happy" and chart["points"] == 4
+    assert downsample_timeline(EmotionTimeline.from_records(FRAMES), 1, method="lttb")["points"] == 1
+
+
+def test_empty_timeline_has_the_same_shape_for_both_methods():
+    empty = EmotionTimeline.from_records([])
+    mean, lttb = downsample_timeline(empty, 10), downsample_timeline(empty, 10, method="lttb")
+
+    assert mean["scores"] == lttb["scores"] == {label: [] for label in EMOTION_LABELS}
+    assert mean["times"] == lttb["times"] == [] and mean["points"] == lttb["points"] == 0
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services import executors as executors_module
+from app.services.executors import BoundedPool, ExecutorRegistry, PoolSaturated, require_capacity
+
+
+def test_saturated_pool_rejects_with_retry_after():
+    pool = BoundedPool("video", max_workers=1, max_pending=2, retry_after=7)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.create_task(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert pool.saturated
+
+        with pytest.raises(PoolSaturated) as exc:
+            await pool.run(lambda: None)
+        assert exc.value.status_code == 503
+        assert exc.value.headers["Retry-After"] == "7"
+
+        release.set()
+        await asyncio.gather(*running)
+        assert await pool.run(lambda: 42) == 42
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    metrics = pool.metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["calls"] == 3
+    assert metrics["pending"] == 0
+
+
+def test_pools_are_isolated():
+    registry = ExecutorRegistry({
+        "video": BoundedPool("video", max_workers=1, max_pending=1),
+        "io": BoundedPool("io", max_workers=1, max_pending=1),
+    })
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.create_task(registry.run("video", release.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(PoolSaturated):
+            registry["video"].admit()
+        # A full video pool leaves the other pools untouched
+        assert await registry.run("io", lambda: "ok") == "ok"
+        release.set()
+        await blocked
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        registry.shutdown()
+
+
+def test_errors_propagate_and_release_the_slot():
+    pool = BoundedPool("stt", max_workers=1, max_pending=1)
+
+    def fail():
+        raise ValueError("boom")
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await pool.run(fail)
+        assert not pool.saturated
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+
+def test_capacity_is_reserved_for_the_whole_request(monkeypatch):
+    registry = ExecutorRegistry({
+        "video": BoundedPool("video", max_workers=1, max_pending=1),
+        "io": BoundedPool("io", max_workers=1, max_pending=2),
+    })
+    monkeypatch.setattr(executors_module, "executors", registry)
+    dependency = require_capacity("io", "video")
+
+    async def request(started, finish):
+        reservation = dependency()
+        await reservation.__anext__()
+        try:
+            # Calls inside the reservation use its slot instead of competing for another
+            assert await registry.run("video", lambda: "ok") == "ok"
+            started.set()
+            await finish.wait()
+        finally:
+            await reservation.aclose()
+
+    async def scenario():
+        started, finish = asyncio.Event(), asyncio.Event()
+        first = asyncio.create_task(request(started, finish))
+        await started.wait()
+        assert registry["video"].metrics()["pending"] == 1
+
+        # Between calls the first request still holds its video slot
+        with pytest.raises(PoolSaturated):
+            await dependency().__anext__()
+        # A failed reservation gives back the io slot it took first
+        assert registry["io"].metrics()["pending"] == 1
+        with pytest.raises(PoolSaturated):
+            await registry.run("video", lambda: None)
+
+        finish.set()
+        await first
+        assert registry["video"].metrics()["pending"] == registry["io"].metrics()["pending"] == 0
+        assert await registry.run("video", lambda: 42) == 42
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        registry.shutdown()
@@ -0,0 +1,92 @@
+import struct
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+pytest.importorskip("deepface")
+
+from app.services.ai import facial_analysis
+from app.services.ai.facial_analysis import analyze_frame_batch, decode_frame_bytes, probe_image_size
+
+
+def _png_header(width, height):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", width, height) + b"\x08\x02\x00\x00\x00"
+
+
+def _jpeg_header(width, height, sof=0xC0):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    frame = bytes([0xFF, sof]) + struct.pack(">HBHH", 17, 8, height, width) + b"\x03" + b"\x00" * 9
+    return b"\xff\xd8" + app0 + frame
+
+
+def _encoded(ext, width=640, height=480, *params):
+    ok, buffer = cv2.imencode(ext, np.full((height, width, 3), 127, np.uint8), list(params))
+    assert ok
+    return buffer.tobytes()
+
+
+def test_probe_reads_headers_without_decoding():
+    assert probe_image_size(_png_header(640, 480)) == (640, 480)
+    assert probe_image_size(_jpeg_header(1280, 720)) == (1280, 720)
+    # Progressive JPEGs carry their size in SOF2
+    assert probe_image_size(_jpeg_header(800, 600, sof=0xC2)) == (800, 600)
+    assert probe_image_size(_encoded(".jpg", 320, 240, cv2.IMWRITE_JPEG_PROGRESSIVE, 1)) == (320, 240)
+    assert probe_image_size(_encoded(".png", 320, 240)) == (320, 240)
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"GIF89a" + b"\x00" * 32,
+    b"\x89PNG\r\n\x1a\n\x00\x00",
+    _jpeg_header(640, 480)[:24],  # cut off before the frame header
+    b"\xff\xd8\xff\xe0\xff\xff",
+])
+def test_probe_gives_up_on_truncated_or_unknown_data(data):
+    assert probe_image_size(data) is None
+
+
+@pytest.mark.parametrize("target_min_side, expected", [
+    (100, cv2.IMREAD_REDUCED_COLOR_4),   # 480 // 4 = 120 still covers 100; 480 // 8 does not
+    (60, cv2.IMREAD_REDUCED_COLOR_8),
+    (240, cv2.IMREAD_REDUCED_COLOR_2),
+    (300, cv2.IMREAD_COLOR),
+    (0, cv2.IMREAD_COLOR),
+])
+def test_reduced_decode_keeps_the_shorter_side_above_target(monkeypatch, target_min_side, expected):
+    flags = []
+    decode = cv2.imdecode
+    monkeypatch.setattr(facial_analysis.cv2, "imdecode", lambda buffer, flag: flags.append(flag) or decode(buffer, flag))
+
+    frame = decode_frame_bytes(_encoded(".jpg"), target_min_side)
+
+    assert flags == [expected]
+    assert min(frame.shape[:2]) >= target_min_side
+
+
+def test_decode_handles_progressive_jpeg_and_png():
+    progressive = decode_frame_bytes(_encoded(".jpg", 640, 480, cv2.IMWRITE_JPEG_PROGRESSIVE, 1), 100)
+    assert progressive.shape == (120, 160, 3)
+    assert decode_frame_bytes(_encoded(".png"), 0).shape == (480, 640, 3)
+
+
+@pytest.mark.parametrize("data", [b"", b"not an image", _encoded(".jpg")[:200]])
+def test_decode_rejects_empty_garbage_and_truncated_frames(data):
+    with pytest.raises(ValueError):
+        decode_frame_bytes(data, 100)
+
+
+def test_batched_emotions_match_deepface_analyze():
+    from deepface import DeepFace
+
+    avatar = cv2.imread(str(Path(__file__).parent.parent / "media" / "avatars" / "avatar-15-256.png"))
+    frames = [avatar, cv2.flip(avatar, 1), np.full((240, 320, 3), 90, np.uint8)]
+
+    batched = analyze_frame_batch(frames)
+
+    for frame, result in zip(frames, batched):
+        expected = DeepFace.analyze(frame, actions=["emotion"], enforce_detection=False)[0]
+        assert result["dominant_emotion"] == expected["dominant_emotion"]
+        for label, score in expected["emotion"].items():
+            assert result["emotion"][label] == pytest.approx(float(score), abs=1e-3)
@@ -0,0 +1,49 @@
+import asyncio
+
+from pymongo import ASCENDING, DESCENDING, TEXT
+
+from app.indexes import IndexSpec, stop_index_tasks, sync_collection_indexes, uses_collection_scan
+
+
+def test_sync_creates_missing_and_reports_drifted_indexes(fake_db):
+    collection = fake_db["users"]
+    collection.indexes.update({
+        "email_1": {"key": [("email", 1)]},
+        "legacy_1": {"key": [("legacy", 1)]},
+        "question_text_tags_text": {"key": [("_fts", "text"), ("_ftsx", 1)], "weights": {"question": 1, "tags": 1}},
+    })
+    specs = [
+        IndexSpec("users", (("email", ASCENDING),), unique=True),
+        IndexSpec("users", (("client_id", ASCENDING), ("created_at", DESCENDING))),
+        IndexSpec("users", (("question", TEXT), ("tags", TEXT))),
+    ]
+
+    report = asyncio.run(sync_collection_indexes(fake_db, "users", specs))
+
+    assert report["drifted"] == ["email_1"]
+    assert report["created"] == ["client_id_1_created_at_-1"]
+    assert report["unchanged"] == ["question_text_tags_text"]
+    assert report["undeclared"] == ["legacy_1"]
+    # The drifted index keeps serving; nothing is dropped
+    assert collection.dropped == []
+    assert collection.created == ["client_id_1_created_at_-1"]
+
+
+def test_collection_scan_detection():
+    assert uses_collection_scan({"stage": "LIMIT", "inputStage": {"stage": "COLLSCAN"}})
+    assert not uses_collection_scan({"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}})
+    assert uses_collection_scan({"stage": "OR", "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}]})
+
+
+def test_background_index_tasks_are_cancelled_and_awaited():
+    async def scenario():
+        audit = asyncio.create_task(asyncio.sleep(3600), name="index-audit")
+        sync = asyncio.create_task(asyncio.sleep(0), name="index-sync")
+        await asyncio.wait([sync])
+        # The audit is None when disabled; a finished sync is simply awaited
+        await stop_index_tasks([sync, None, audit])
+        return sync, audit
+
+    sync, audit = asyncio.run(scenario())
+    assert sync.done() and not sync.cancelled()
+    assert audit.cancelled()
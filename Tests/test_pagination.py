@@ -0,0 +1,27 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.services import interview
+from app.services.interview import get_interviews_by_user
+
+
+def test_pages_continue_through_interviews_without_created_at(patch_database):
+    interviews = patch_database(interview)["interviews"]
+    start = datetime(2026, 1, 1)
+    dated = [{"_id": ObjectId(), "user_id": "u1", "created_at": start + timedelta(days=i)} for i in range(3)]
+    legacy = [{"_id": ObjectId(), "user_id": "u1"} for _ in range(3)]
+    interviews.add(*dated, *legacy)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = asyncio.run(get_interviews_by_user("u1", limit=2, cursor=cursor))
+        seen += page
+        if cursor is None:
+            break
+
+    # Dated interviews newest first, then the old rows by _id; none skipped or repeated
+    expected = [doc["_id"] for doc in reversed(dated)] + [doc["_id"] for doc in reversed(legacy)]
+    assert [row["id"] for row in seen] == [str(_id) for _id in expected]
+    assert seen[-1]["created_at"] == legacy[0]["_id"].generation_time.replace(tzinfo=None).isoformat()
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.passwords import PasswordHasher, bcrypt_hash, bcrypt_verify, needs_rehash
+
+
+def test_full_queue_rejects_with_retry_after():
+    hasher = PasswordHasher(rounds=4, max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.create_task(hasher._run(release.wait))
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as exc:
+            await hasher.hash("Secret#123")
+        assert exc.value.status_code == 503
+        assert exc.value.headers["Retry-After"] == "1"
+
+        release.set()
+        await blocked
+        assert bcrypt_verify("Secret#123", await hasher.hash("Secret#123"))
+
+    asyncio.run(scenario())
+
+    metrics = hasher.metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["calls"] == 2
+    assert metrics["pending"] == 0
+
+
+def test_needs_rehash_compares_cost():
+    assert needs_rehash(bcrypt_hash("Secret#123", rounds=4), rounds=5)
+    assert not needs_rehash(bcrypt_hash("Secret#123", rounds=5), rounds=5)
+    assert not needs_rehash(bcrypt_hash("Secret#123", rounds=5), rounds=4)
+    # Anything that isn't a bcrypt hash is replaced on the next login
+    assert needs_rehash("plain-text", rounds=4)
+
+
+def test_verify_and_update_rehashes_only_valid_low_cost_hashes():
+    hasher = PasswordHasher(rounds=5, max_workers=1)
+    old = bcrypt_hash("Secret#123", rounds=4)
+
+    valid, new_hash = asyncio.run(hasher.verify_and_update("Secret#123", old))
+    assert valid and new_hash != old
+    assert new_hash.startswith("$2b$05$") and bcrypt_verify("Secret#123", new_hash)
+
+    assert asyncio.run(hasher.verify_and_update("Secret#123", new_hash)) == (True, None)
+    assert asyncio.run(hasher.verify_and_update("wrong", old)) == (False, None)
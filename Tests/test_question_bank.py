@@ -0,0 +1,43 @@
+from bson import ObjectId
+
+from app.services.question_bank import QuestionIndex
+
+
+def _question(category, level=None, text=None):
+    doc = {"_id": ObjectId(), "category": category, "question": text or f"{category} question {level}?"}
+    if level:
+        doc["experience_level"] = level
+    return doc
+
+
+DOCS = [
+    _question("General"),
+    _question("General", "fresher"),
+    _question("Technical", "experienced"),
+    _question("General", "both"),
+    _question("Technical", "both"),
+]
+
+
+def _ids(models):
+    return [m.id for m in models]
+
+
+def test_level_lookup_includes_both_in_insertion_order():
+    index = QuestionIndex(DOCS)
+    ids = [str(d["_id"]) for d in DOCS]
+
+    assert _ids(index.query(experience_level="fresher")) == [ids[1], ids[3], ids[4]]
+    assert _ids(index.query(experience_level="experienced", category="Technical")) == [ids[2], ids[4]]
+    # Unknown levels only match shared questions, like the `$or` Mongo filter did
+    assert _ids(index.query(experience_level="senior")) == [ids[3], ids[4]]
+    assert _ids(index.query(experience_level="senior", category="General")) == [ids[3]]
+
+
+def test_category_and_paging():
+    index = QuestionIndex(DOCS)
+    ids = [str(d["_id"]) for d in DOCS]
+
+    assert _ids(index.query(category="General")) == [ids[0], ids[1], ids[3]]
+    assert _ids(index.query(skip=1, limit=2)) == ids[1:3]
+    assert index.get(ids[2])["category"] == "Technical"
@@ -0,0 +1,64 @@
+from bson import ObjectId
+
+from app.services.question_bank import QuestionIndex
+from app.services.question_search import QuestionSearchIndex, stem
+
+
+def _question(text, category="General", level="both", **extra):
+    return {"_id": ObjectId(), "category": category, "question": text, "experience_level": level, **extra}
+
+
+DOCS = [
+    _question("Describe a time you had to meet a tight deadline.", "Behavioral"),
+    _question("What would you do if you had multiple urgent deadlines?", "Situational", tips="Show prioritization."),
+    _question("How do you handle stress and pressure?", level="fresher"),
+    _question("Tell me about a project you managed.", "Technical", tags=["management", "leadership"], difficulty="hard"),
+]
+
+
+def _built(docs=DOCS):
+    search = QuestionSearchIndex()
+    search.sync(None, QuestionIndex(docs, 1))
+    return search
+
+
+def test_stemming_matches_word_forms():
+    assert stem("deadlines") == stem("deadline")
+    assert stem("handled") == stem("handle")
+
+
+def test_ranked_search_with_filters():
+    search = _built()
+    ids = [str(d["_id"]) for d in DOCS]
+
+    assert [qid for qid, _ in search.search("deadlines", prefix=False)] == [ids[0], ids[1]]
+    assert [qid for qid, _ in search.search("urgent deadline", prefix=False)][0] == ids[1]
+    assert [qid for qid, _ in search.search("deadline", category="Situational")] == [ids[1]]
+    assert [qid for qid, _ in search.search("leadership", difficulty="hard")] == [ids[3]]
+    assert search.search("stress", experience_level="experienced") == []
+
+
+def test_prefix_typeahead():
+    search = _built()
+    ids = [str(d["_id"]) for d in DOCS]
+
+    assert [qid for qid, _ in search.search("prior")] == [ids[1]]
+    assert [qid for qid, _ in search.search("manag")] == [ids[3]]
+    # A trailing space means the last word is complete
+    assert search.search("prior ") == []
+
+
+def test_incremental_sync_applies_only_changes():
+    old = QuestionIndex(DOCS, 1)
+    search = QuestionSearchIndex()
+    search.sync(None, old)
+
+    edited = dict(DOCS[2], question="How do you handle criticism?")
+    added = _question("Why are you leaving your current job?")
+    new = QuestionIndex([DOCS[0], DOCS[1], edited, added], 2)
+
+    assert search.sync(old, new) == {"added_or_updated": 2, "removed": 1}
+    assert search.search("stress") == []
+    assert [qid for qid, _ in search.search("criticism")] == [str(edited["_id"])]
+    assert "leadership" not in search.words
+    assert len(search) == 4
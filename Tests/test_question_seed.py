@@ -0,0 +1,91 @@
+import asyncio
+
+from bson import ObjectId
+
+from app.services.question_seed import SEED_QUESTIONS, content_hash, seed_key, seed_question_bank, seed_version
+
+
+def test_seed_keys_are_unique_per_text_and_level():
+    keys = [seed_key(question) for question in SEED_QUESTIONS]
+    assert len(keys) == len(set(keys))
+
+    variants = [q.get("experience_level") for q in SEED_QUESTIONS
+                if q["question"] == "What experience do you have in this field?"]
+    assert sorted(variants) == ["experienced", "fresher"]
+
+
+def test_seed_version_tracks_content_not_order():
+    question = {"category": "General", "question": "Tell me about yourself."}
+    edited = dict(question, tips="Keep it short.")
+
+    assert seed_key(question) == seed_key(edited)
+    assert content_hash(question) != content_hash(edited)
+    assert seed_version(SEED_QUESTIONS) == seed_version(list(reversed(SEED_QUESTIONS)))
+    assert seed_version(SEED_QUESTIONS) != seed_version(SEED_QUESTIONS[1:])
+
+
+def test_legacy_duplicates_are_adopted_or_removed(fake_db):
+    seeds = [
+        {"category": "General", "question": "Why do you want to work for this company?", "experience_level": "both"},
+        {"category": "Technical", "question": "What experience do you have in this field?", "experience_level": "fresher"},
+        {"category": "Technical", "question": "What experience do you have in this field?", "experience_level": "experienced"},
+    ]
+    why = "Why do you want to work for this company?"
+    experience = "What experience do you have in this field?"
+    legacy = [
+        {"_id": ObjectId(), "category": "General", "question": why},
+        {"_id": ObjectId(), "category": "General", "question": why, "experience_level": "both"},
+        {"_id": ObjectId(), "category": "Technical", "question": experience},
+        {"_id": ObjectId(), "category": "Technical", "question": experience, "experience_level": "fresher"},
+        {"_id": ObjectId(), "category": "Technical", "question": experience, "experience_level": "experienced"},
+        {"_id": ObjectId(), "category": "Custom", "question": "A question added by hand"},
+    ]
+    questions = fake_db["questions"]
+    questions.add(*[dict(doc) for doc in legacy])
+
+    report = asyncio.run(seed_question_bank(fake_db, seeds))
+
+    assert report["adopted"] == 3
+    assert report["removed"] == 2
+    # Exact (text, level) matches keep their _id; the level-less copies are gone
+    assert set(questions.docs) == {legacy[1]["_id"], legacy[3]["_id"], legacy[4]["_id"], legacy[5]["_id"]}
+    assert all("seed_key" in questions.docs[doc["_id"]] for doc in (legacy[1], legacy[3], legacy[4]))
+    assert "seed_key" not in questions.docs[legacy[5]["_id"]]
+
+    # A second boot only checks the seed version
+    assert asyncio.run(seed_question_bank(fake_db, seeds)) == {"version": seed_version(seeds), "skipped": True}
+
+
+def test_level_less_copy_is_adopted_when_no_exact_match(fake_db):
+    seeds = [{"category": "General", "question": "What are your strengths and weaknesses?", "experience_level": "both"}]
+    legacy_id = ObjectId()
+    questions = fake_db["questions"]
+    questions.add({"_id": legacy_id, "category": "General", "question": seeds[0]["question"]})
+
+    report = asyncio.run(seed_question_bank(fake_db, seeds))
+
+    assert (report["adopted"], report["removed"]) == (1, 0)
+    assert list(questions.docs) == [legacy_id]
+    assert questions.docs[legacy_id]["experience_level"] == "both"
+
+
+def test_referenced_or_admin_rows_with_seed_text_survive(fake_db):
+    why = "Why do you want to work for this company?"
+    seeds = [{"category": "General", "question": why, "experience_level": "both"}]
+    exact = {"_id": ObjectId(), "category": "General", "question": why, "experience_level": "both"}
+    in_use = {"_id": ObjectId(), "category": "General", "question": why}
+    unused = {"_id": ObjectId(), "category": "General", "question": why}
+    admin = {"_id": ObjectId(), "category": "General", "question": why, "experience_level": "fresher"}
+    other_category = {"_id": ObjectId(), "category": "Custom", "question": why}
+    questions = fake_db["questions"]
+    questions.add(exact, in_use, unused, admin, other_category)
+    fake_db["candidate_answers"].add({"_id": ObjectId(), "question_id": str(in_use["_id"])})
+
+    report = asyncio.run(seed_question_bank(fake_db, seeds))
+
+    assert (report["adopted"], report["removed"]) == (1, 1)
+    assert report["kept"] == [str(in_use["_id"])]
+    assert set(questions.docs) == {exact["_id"], in_use["_id"], admin["_id"], other_category["_id"]}
+    # Rows that are not seed copies are neither adopted nor relabelled
+    assert questions.docs[admin["_id"]]["experience_level"] == "fresher"
+    assert "seed_key" not in questions.docs[admin["_id"]]
@@ -0,0 +1,50 @@
+import random
+
+from collections import Counter
+
+from bson import ObjectId
+
+from app.services.question_bank import QuestionIndex
+from app.services.question_sets import SamplingTables, sample_question_set
+
+
+def _question(category, level="both"):
+    return {"_id": ObjectId(), "category": category, "question": f"{category} question?", "experience_level": level}
+
+
+DOCS = (
+    [_question("General") for _ in range(6)]
+    + [_question("Technical") for _ in range(6)]
+    + [_question("Behavioral", "fresher") for _ in range(3)]
+    + [_question("Behavioral", "experienced") for _ in range(3)]
+)
+
+
+def test_sets_are_balanced_across_categories():
+    tables = SamplingTables(QuestionIndex(DOCS))
+    positions, reused = sample_question_set(tables, 6, bytearray(len(DOCS)), rng=random.Random(1))
+
+    assert reused == 0
+    assert len(set(positions)) == 6
+    assert Counter(DOCS[p]["category"] for p in positions) == {"General": 2, "Technical": 2, "Behavioral": 2}
+
+
+def test_experience_level_and_category_filters():
+    tables = SamplingTables(QuestionIndex(DOCS))
+    positions, _ = sample_question_set(
+        tables, 10, experience_level="fresher", categories=["Behavioral"], rng=random.Random(2)
+    )
+
+    assert sorted(positions) == [12, 13, 14]
+
+
+def test_seen_questions_are_skipped_until_exhausted():
+    tables = SamplingTables(QuestionIndex(DOCS))
+    seen = bytearray(len(DOCS))
+    for position in range(5):
+        seen[position] = 1
+
+    positions, reused = sample_question_set(tables, 2, seen, categories=["General"], rng=random.Random(3))
+    assert positions[0] == 5
+    assert reused == 1
+    assert positions[1] < 5
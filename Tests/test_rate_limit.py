@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import rate_limit as rl
+from app.services.rate_limit import MemoryBackend, RateLimit, RateLimiter, sliding_window_count
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class CountingBackend(MemoryBackend):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def hit(self, key, window_start, window):
+        self.calls += 1
+        return await super().hit(key, window_start, window)
+
+
+def test_parse_limits():
+    assert RateLimit.parse("5/minute") == RateLimit(5, 60)
+    assert RateLimit.parse("100/hours") == RateLimit(100, 3600)
+    with pytest.raises(ValueError):
+        RateLimit.parse("five per minute")
+
+
+def test_sliding_window_weights_previous_window():
+    assert sliding_window_count(2, 10, elapsed=0, window=60) == 12
+    assert sliding_window_count(2, 10, elapsed=30, window=60) == 7
+    assert sliding_window_count(2, 10, elapsed=60, window=60) == 2
+
+
+def test_limit_is_enforced_and_denials_are_served_locally():
+    backend = CountingBackend()
+    limiter = RateLimiter(backend=backend, clock=Clock(1200.0))
+    rate = RateLimit(3, 60)
+
+    async def run():
+        return [await limiter.hit("login:1.2.3.4", rate) for _ in range(6)]
+
+    results = asyncio.run(run())
+    assert results[:3] == [None, None, None]
+    assert all(retry is not None and retry >= 1 for retry in results[3:])
+    # Once a key is over the limit, further hits never reach shared storage
+    assert backend.calls == 3
+
+
+def test_shared_counts_limit_across_workers():
+    backend = MemoryBackend()
+    clock = Clock(1200.0)
+    workers = [RateLimiter(backend=backend, clock=clock) for _ in range(3)]
+    rate = RateLimit(5, 60)
+
+    async def run():
+        return [await workers[i % 3].hit("upload:1.2.3.4", rate) for i in range(9)]
+
+    results = asyncio.run(run())
+    assert sum(r is None for r in results) == 5
+
+
+def test_dependency_raises_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(rl, "limiter", RateLimiter(backend=MemoryBackend(), clock=Clock(1200.0)))
+    dependency = rl.rate_limit("1/minute", "test")
+
+    class Request:
+        headers = {}
+
+        class client:
+            host = "10.0.0.1"
+
+    asyncio.run(dependency(Request()))
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(dependency(Request()))
+    assert exc.value.status_code == 429
+    assert int(exc.value.headers["Retry-After"]) >= 1
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import numpy as np
+import orjson
+from bson import ObjectId
+from fastapi import FastAPI, Query, Request
+from fastapi.testclient import TestClient
+
+from app.responses import AnalysisJSONResponse, ndjson_response, timeline_chunks, wants_ndjson
+from app.services.ai.timeline import EmotionTimeline
+
+TIMELINE = EmotionTimeline(np.arange(5, dtype=np.float64), np.array([6, 6, 3, -1, 6]), np.full((5, 7), 10.0))
+
+app = FastAPI()
+
+
+@app.get("/analysis")
+async def analysis(request: Request, stream: bool = Query(False)):
+    summary = {"id": ObjectId("65f000000000000000000001"), "score": np.float32(7.5), "at": datetime(2024, 1, 2)}
+    if wants_ndjson(request, stream):
+        return ndjson_response(summary, timeline_chunks(TIMELINE, 2))
+    return AnalysisJSONResponse({**summary, "facial_analysis": TIMELINE, "means": TIMELINE.scores.mean(axis=0)})
+
+
+client = TestClient(app)
+
+
+def test_json_response_serializes_numpy_and_bson():
+    body = client.get("/analysis").json()
+
+    assert body["id"] == "65f000000000000000000001"
+    assert body["score"] == 7.5
+    assert body["at"] == "2024-01-02T00:00:00"
+    assert len(body["facial_analysis"]) == 5 and body["facial_analysis"][3]["dominant_emotion"] == "error"
+    assert body["means"] == [10.0] * 7
+
+
+def test_ndjson_streams_summary_first_then_timeline_chunks():
+    for response in (client.get("/analysis?stream=true"),
+                     client.get("/analysis", headers={"Accept": "application/x-ndjson"})):
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [orjson.loads(line) for line in response.text.splitlines()]
+
+        assert lines[0]["type"] == "summary" and lines[0]["score"] == 7.5
+        assert [(part["type"], part["offset"], len(part["frames"])) for part in lines[1:-1]] == [
+            ("timeline", 0, 2), ("timeline", 2, 2), ("timeline", 4, 1)
+        ]
+        assert lines[-1] == {"type": "end", "parts": 3}
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from app.services.ai.save_analysis import analysis_summary, write_analysis
+
+
+def _write(db):
+    interview_id = ObjectId()
+    db["interviews"].add({"_id": interview_id, "user_id": "u1"})
+    return asyncio.run(write_analysis(
+        db, {"_id": ObjectId()},
+        interview_filter={"_id": interview_id, "user_id": "u1"},
+        interview_update=[],
+        admin_fields={"status": "analyzed"}
+    ))
+
+
+def test_replica_set_writes_share_one_transaction(make_db):
+    db = make_db("ReplicaSetWithPrimary")
+    assert _write(db) == 1
+    assert [c[:2] for c in db.calls] == [
+        ("interview_analysis", "insert"), ("interviews", "update"), ("admin_interview_summaries", "update")
+    ]
+    assert all(session is not None for _, _, session in db.calls)
+
+
+def test_standalone_writes_run_without_session(fake_db):
+    assert _write(fake_db) == 1
+    assert len(fake_db.calls) == 3
+    # The analysis exists before anything references it
+    assert fake_db.calls[0][:2] == ("interview_analysis", "insert")
+    assert all(session is None for _, _, session in fake_db.calls)
+
+
+def test_standalone_failed_insert_leaves_interview_untouched(fake_db):
+    async def failing_insert(doc, session=None):
+        raise RuntimeError("insert failed")
+
+    fake_db["interview_analysis"].insert_one = failing_insert
+
+    with pytest.raises(RuntimeError):
+        _write(fake_db)
+    assert fake_db.calls == []
+
+
+def _failing_summary_update(db):
+    async def failing_update(query, update, upsert=False, session=None):
+        raise RuntimeError("summary update failed")
+
+    db["admin_interview_summaries"].update_one = failing_update
+
+
+def test_summary_failure_aborts_the_transaction(make_db):
+    db = make_db("ReplicaSetWithPrimary")
+    _failing_summary_update(db)
+
+    with pytest.raises(RuntimeError):
+        _write(db)
+
+
+def test_standalone_summary_failure_is_only_logged(fake_db):
+    _failing_summary_update(fake_db)
+
+    assert _write(fake_db) == 1
+    assert [c[:2] for c in fake_db.calls] == [("interview_analysis", "insert"), ("interviews", "update")]
+
+
+def test_interview_keeps_only_a_compact_summary():
+    summary = analysis_summary({
+        "facial_summary": {"top_3": [("happy", 4), ("neutral", 2)], "emotion_percentage": {}},
+        "speech_summary": {"overall_sentiment": "positive"},
+        "candidate_feedback": "Good job.",
+        "suggestions": ["..."]
+    }, speech_score=8)
+
+    assert summary["dominant_emotion"] == "happy"
+    assert summary["speech_score"] == 8
+    assert "suggestions" not in summary and "facial_summary" not in summary
@@ -16,6 +16,29 @@ class Settings:
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
+    # Authenticated user cache (per worker)
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", 10000))
+    # Build the user from signed token claims (no DB lookup) until the token expires
+    AUTH_TRUST_TOKEN_CLAIMS: bool = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() == "true"
+
+    # Rate Limiting ("mongo" and "redis" are shared across workers, "memory" is per process)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "mongo").lower()
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Only enable behind a proxy that sets X-Forwarded-For
+    RATE_LIMIT_TRUST_FORWARDED: bool = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+    RATE_LIMIT_LOGIN: str = os.getenv("RATE_LIMIT_LOGIN", "5/minute")
+    RATE_LIMIT_PASSWORD_RESET: str = os.getenv("RATE_LIMIT_PASSWORD_RESET", "3/minute")
+    RATE_LIMIT_AUTH: str = os.getenv("RATE_LIMIT_AUTH", "10/minute")
+    RATE_LIMIT_UPLOAD: str = os.getenv("RATE_LIMIT_UPLOAD", "10/minute")
+    RATE_LIMIT_FRAMES: str = os.getenv("RATE_LIMIT_FRAMES", "120/minute")
+
+    # Password Hashing
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+
     # MongoDB Configuration
     MONGO_USER: str = os.getenv("MONGO_USER", "")
     MONGO_PASSWORD: str = os.getenv("MONGO_PASSWORD", "")
@@ -23,19 +46,56 @@ class Settings:
     MONGO_PORT: int = int(os.getenv("MONGO_PORT", 27017))
     MONGO_DB_NAME: str = os.getenv("DB_NAME", "ai_interview")
 
-    if MONGO_USER and MONGO_PASSWORD:
+    # A full MONGO_URI (e.g. from docker-compose) takes precedence over the parts above
+    if os.getenv("MONGO_URI"):
+        MONGO_URI = os.getenv("MONGO_URI")
+    elif MONGO_USER and MONGO_PASSWORD:
         encoded_user = urllib.parse.quote_plus(MONGO_USER)
         encoded_password = urllib.parse.quote_plus(MONGO_PASSWORD)
         MONGO_URI = f"mongodb://{encoded_user}:{encoded_password}@{MONGO_HOST}:{MONGO_PORT}/{MONGO_DB_NAME}?authSource=admin"
     else:
         MONGO_URI = f"mongodb://{MONGO_HOST}:{MONGO_PORT}/{MONGO_DB_NAME}"
 
+    # Connection pool (per worker process; total connections = workers x MONGO_MAX_POOL_SIZE)
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", 5))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 60000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000))
+    # Dev mode: profile collection scans and periodically log unindexed query shapes
+    INDEX_AUDIT_ENABLED: bool = os.getenv("INDEX_AUDIT_ENABLED", "false").lower() == "true"
+    INDEX_AUDIT_INTERVAL_SECONDS: float = float(os.getenv("INDEX_AUDIT_INTERVAL_SECONDS", 300))
+    # Comma-separated; zstd and snappy need their optional packages installed
+    MONGO_COMPRESSORS: str = os.getenv("MONGO_COMPRESSORS", "zlib")
+    MONGO_READ_PREFERENCE: str = os.getenv("MONGO_READ_PREFERENCE", "primary")
+
     # Email Configuration
     SMTP_USERNAME: str = os.getenv("SMTP_USERNAME")
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD")
     EMAIL_FROM: str = os.getenv("EMAIL_FROM", SMTP_USERNAME)
     SMTP_SERVER: str = os.getenv("SMTP_SERVER", "smtp.gmail.com")
     SMTP_PORT: int = int(os.getenv("SMTP_PORT", 587))
+    # Disable for a local SMTP stand-in (e.g. `python -m aiosmtpd -n -l localhost:1025`)
+    SMTP_START_TLS: bool = os.getenv("SMTP_START_TLS", "true").lower() == "true"
+    SMTP_TIMEOUT: float = float(os.getenv("SMTP_TIMEOUT", 30))
+
+    # Compiled email template bytecode (defaults to a per-user temp directory)
+    EMAIL_TEMPLATE_CACHE_DIR: str = os.getenv("EMAIL_TEMPLATE_CACHE_DIR", "")
+
+    # Email Deliverability Checks (per-worker cache of domain MX lookups)
+    EMAIL_DNS_TIMEOUT_SECONDS: float = float(os.getenv("EMAIL_DNS_TIMEOUT_SECONDS", 2))
+    EMAIL_DOMAIN_CACHE_TTL_SECONDS: float = float(os.getenv("EMAIL_DOMAIN_CACHE_TTL_SECONDS", 3600))
+    EMAIL_DOMAIN_NEGATIVE_TTL_SECONDS: float = float(os.getenv("EMAIL_DOMAIN_NEGATIVE_TTL_SECONDS", 300))
+    EMAIL_DOMAIN_CACHE_MAX_SIZE: int = int(os.getenv("EMAIL_DOMAIN_CACHE_MAX_SIZE", 10000))
+
+    # Email Outbox ("smtp" delivers through a pool of persistent connections, "memory" only records messages)
+    EMAIL_TRANSPORT: str = os.getenv("EMAIL_TRANSPORT", "smtp").lower()
+    SMTP_POOL_SIZE: int = int(os.getenv("SMTP_POOL_SIZE", 2))
+    EMAIL_OUTBOX_BATCH_SIZE: int = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 20))
+    EMAIL_OUTBOX_POLL_SECONDS: float = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", 5))
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS: float = float(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", 30))
+    # A claimed message is retried by any worker if not settled within this lease
+    EMAIL_OUTBOX_LEASE_SECONDS: int = int(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", 120))
 
     # App Meta
     APP_NAME: str = os.getenv("APP_NAME", "Interview Genie")
@@ -43,6 +103,39 @@ class Settings:
     ADMIN_EMAIL: str = os.getenv("ADMIN_EMAIL", "admin@example.com")
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:8000")
 
+    # Question Bank (in-process index; other workers' edits are picked up within this interval)
+    QUESTION_BANK_POLL_SECONDS: float = float(os.getenv("QUESTION_BANK_POLL_SECONDS", 5))
+    QUESTION_SET_DEFAULT_SIZE: int = int(os.getenv("QUESTION_SET_DEFAULT_SIZE", 5))
+    QUESTION_SET_MAX_SIZE: int = int(os.getenv("QUESTION_SET_MAX_SIZE", 30))
+    QUESTION_HISTORY_CACHE_TTL_SECONDS: float = float(os.getenv("QUESTION_HISTORY_CACHE_TTL_SECONDS", 300))
+    QUESTION_HISTORY_CACHE_MAX_SIZE: int = int(os.getenv("QUESTION_HISTORY_CACHE_MAX_SIZE", 10000))
+
+    # Frame Analysis Batching
+    FRAME_BATCH_MAX_SIZE: int = int(os.getenv("FRAME_BATCH_MAX_SIZE", 8))
+    FRAME_BATCH_MAX_WAIT_MS: float = float(os.getenv("FRAME_BATCH_MAX_WAIT_MS", 5))
+    FRAME_INFERENCE_WORKERS: int = int(os.getenv("FRAME_INFERENCE_WORKERS", 1))
+    # Frames are downscaled during decode while the shorter side stays above this
+    FRAME_TARGET_MIN_SIDE: int = int(os.getenv("FRAME_TARGET_MIN_SIDE", 480))
+
+    # Execution pools for blocking analysis work; requests beyond MAX_PENDING get a 503
+    EXECUTOR_VIDEO_WORKERS: int = int(os.getenv("EXECUTOR_VIDEO_WORKERS", 1))
+    EXECUTOR_VIDEO_MAX_PENDING: int = int(os.getenv("EXECUTOR_VIDEO_MAX_PENDING", 4))
+    EXECUTOR_AUDIO_WORKERS: int = int(os.getenv("EXECUTOR_AUDIO_WORKERS", 2))
+    EXECUTOR_AUDIO_MAX_PENDING: int = int(os.getenv("EXECUTOR_AUDIO_MAX_PENDING", 8))
+    EXECUTOR_STT_WORKERS: int = int(os.getenv("EXECUTOR_STT_WORKERS", 4))
+    EXECUTOR_STT_MAX_PENDING: int = int(os.getenv("EXECUTOR_STT_MAX_PENDING", 16))
+    EXECUTOR_IO_WORKERS: int = int(os.getenv("EXECUTOR_IO_WORKERS", 4))
+    EXECUTOR_IO_MAX_PENDING: int = int(os.getenv("EXECUTOR_IO_MAX_PENDING", 16))
+    EXECUTOR_RETRY_AFTER_SECONDS: int = int(os.getenv("EXECUTOR_RETRY_AFTER_SECONDS", 10))
+
+    # Analysis responses streamed as NDJSON send the timeline in chunks of this many frames
+    ANALYSIS_STREAM_CHUNK_FRAMES: int = int(os.getenv("ANALYSIS_STREAM_CHUNK_FRAMES", 500))
+
+    # Downsampled chart timelines, cached per analysis and bucket count
+    TIMELINE_CHART_MAX_BUCKETS: int = int(os.getenv("TIMELINE_CHART_MAX_BUCKETS", 1000))
+    TIMELINE_CHART_CACHE_TTL_SECONDS: float = float(os.getenv("TIMELINE_CHART_CACHE_TTL_SECONDS", 600))
+    TIMELINE_CHART_CACHE_MAX_SIZE: int = int(os.getenv("TIMELINE_CHART_CACHE_MAX_SIZE", 1000))
+
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
 
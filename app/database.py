@@ -1,14 +1,8 @@
+import threading
+from collections import defaultdict
 from motor.motor_asyncio import AsyncIOMotorClient
-from dotenv import load_dotenv
-from app.config import logger
-import os
-
-load_dotenv()
-
-# Load MongoDB configurations
-MONGO_URI = os.getenv("MONGO_URI")
-client = AsyncIOMotorClient(MONGO_URI)
-DB_NAME = os.getenv("DB_NAME", "ai_interview")
+from pymongo import monitoring
+from app.config import logger, settings
 
 # MongoDB settings
 MONGODB_SETTINGS = {
@@ -18,22 +12,107 @@ MONGODB_SETTINGS = {
 }
 
 
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool utilization per server, fed by PyMongo's CMAP events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._servers = defaultdict(lambda: {
+            "open": 0,
+            "checked_out": 0,
+            "max_checked_out": 0,
+            "checkouts": 0,
+            "checkout_failures": 0,
+            "created": 0,
+            "closed": 0
+        })
+
+    def _update(self, event, **deltas):
+        with self._lock:
+            stats = self._servers[f"{event.address[0]}:{event.address[1]}"]
+            for key, delta in deltas.items():
+                stats[key] += delta
+            stats["max_checked_out"] = max(stats["max_checked_out"], stats["checked_out"])
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            servers = {address: dict(stats) for address, stats in self._servers.items()}
+        for stats in servers.values():
+            stats["max_pool_size"] = settings.MONGO_MAX_POOL_SIZE
+            stats["utilization"] = round(stats["checked_out"] / settings.MONGO_MAX_POOL_SIZE, 3)
+        return servers
+
+    def connection_created(self, event):
+        self._update(event, open=1, created=1)
+
+    def connection_closed(self, event):
+        self._update(event, open=-1, closed=1)
+
+    def connection_checked_out(self, event):
+        self._update(event, checked_out=1, checkouts=1)
+
+    def connection_checked_in(self, event):
+        self._update(event, checked_out=-1)
+
+    def connection_check_out_failed(self, event):
+        self._update(event, checkout_failures=1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+
+pool_metrics = PoolMetrics()
+
+
+def create_client(settings=settings) -> AsyncIOMotorClient:
+    """The one place a MongoDB client is built; pool sizing comes from Settings."""
+    options = dict(
+        MONGODB_SETTINGS,
+        maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        readPreference=settings.MONGO_READ_PREFERENCE,
+        event_listeners=[pool_metrics]
+    )
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    return AsyncIOMotorClient(settings.MONGO_URI, **options)
+
+
 class MongoDBManager:
     """MongoDB Connection Manager"""
 
-    def __init__(self, uri: str, db_name: str, settings: dict):
-        self.uri = uri
-        self.db_name = db_name
+    def __init__(self, settings=settings):
         self.settings = settings
+        self.db_name = settings.MONGO_DB_NAME
         self.client: AsyncIOMotorClient | None = None
         self.db = None
 
     async def connect(self):
         if not self.client:
             try:
-                self.client = AsyncIOMotorClient(self.uri, **MONGODB_SETTINGS)
+                self.client = create_client(self.settings)
                 self.db = self.client[self.db_name]
-                logger.info(f"✅ Connected to MongoDB: {self.db_name}")
+                logger.info(
+                    f"✅ Connected to MongoDB: {self.db_name} "
+                    f"(pool {self.settings.MONGO_MIN_POOL_SIZE}-{self.settings.MONGO_MAX_POOL_SIZE})"
+                )
             except Exception as e:
                 logger.error(f"❌ Error connecting to MongoDB: {e}", exc_info=True)
                 raise
@@ -54,8 +133,8 @@ class MongoDBManager:
         return self.db[name]
 
 
-# Initialize MongoDB Manager
-mongodb_manager = MongoDBManager(MONGO_URI, DB_NAME, MONGODB_SETTINGS)
+# Initialize MongoDB Manager (the only client in the process)
+mongodb_manager = MongoDBManager(settings)
 
 # Define the database instance
 database = mongodb_manager.db
@@ -70,15 +149,13 @@ async def get_database():
     return mongodb_manager.db
 
 
-async def ensure_indexes():
-    db = await get_database()
-    await db["interviews"].create_index([("user_id", 1)])
-    await db["interviews"].create_index([("created_at", 1)])
-    await db["interviews"].create_index([("status", 1)])
-    await db["interviews"].create_index([("session_id", 1)])
-    await db["facial_analysis"].create_index([("session_id", 1)])
-    await db["speech_analysis"].create_index([("session_id", 1)])
+def supports_transactions(client) -> bool:
+    """Multi-document transactions need a replica set or sharded cluster, not a standalone server."""
+    try:
+        return client.topology_description.topology_type_name in ("ReplicaSetWithPrimary", "Sharded")
+    except Exception:
+        return False
 
 
 # Explicitly export variables
-__all__ = ["database", "mongodb_manager", "get_database", "ensure_indexes"]
+__all__ = ["database", "mongodb_manager", "get_database", "create_client", "pool_metrics", "supports_transactions"]
@@ -0,0 +1,276 @@
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+from app.config import settings
+from app.services.admin_summaries import ADMIN_SUMMARIES
+from app.services.ai.answer_segments import ANSWER_ANALYSIS
+from app.services.email_outbox import EMAIL_OUTBOX
+from app.services.rate_limit import RATE_LIMITS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    keys: Tuple[Tuple[str, Any], ...]
+    unique: bool = False
+    sparse: bool = False
+    expire_after_seconds: Optional[int] = None
+    partial_filter: Optional[Dict[str, Any]] = field(default=None, hash=False)
+    name: Optional[str] = None
+
+    @property
+    def index_name(self) -> str:
+        # Same naming as pymongo, so existing indexes created by hand still match
+        return self.name or "_".join(f"{key}_{direction}" for key, direction in self.keys)
+
+    @property
+    def is_text(self) -> bool:
+        return any(direction == TEXT for _, direction in self.keys)
+
+    def options(self) -> Dict[str, Any]:
+        options = {"name": self.index_name}
+        if self.unique:
+            options["unique"] = True
+        if self.sparse:
+            options["sparse"] = True
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        if self.partial_filter:
+            options["partialFilterExpression"] = self.partial_filter
+        return options
+
+    def to_model(self) -> IndexModel:
+        return IndexModel(list(self.keys), **self.options())
+
+    def matches_keys(self, info: Dict[str, Any]) -> bool:
+        existing = [(key, direction) for key, direction in info["key"]]
+        if self.is_text:
+            # Text indexes are stored as {_fts: "text", _ftsx: 1} plus weights
+            return existing[:1] == [("_fts", "text")] and \
+                set(info.get("weights", {})) == {key for key, d in self.keys if d == TEXT}
+        return existing == list(self.keys)
+
+    def matches_options(self, info: Dict[str, Any]) -> bool:
+        return (
+            bool(info.get("unique")) == self.unique
+            and bool(info.get("sparse")) == self.sparse
+            and info.get("expireAfterSeconds") == self.expire_after_seconds
+            and info.get("partialFilterExpression") == self.partial_filter
+        )
+
+
+# -------------------------------------------------
+# Desired Indexes (one entry per hot query path)
+# -------------------------------------------------
+INDEXES: List[IndexSpec] = [
+    # Login / registration by email; token auth by client_id on every request
+    IndexSpec("users", (("email", ASCENDING),), unique=True),
+    IndexSpec("users", (("client_id", ASCENDING),), unique=True, sparse=True),
+
+    # Per-user interview listing (keyset on created_at, _id); lookups by
+    # (_id, user_id) are served by the _id index
+    IndexSpec("interviews", (("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING))),
+
+    # Latest analysis of an interview for its owner
+    IndexSpec("interview_analysis", (("interview_id", ASCENDING), ("user_id", ASCENDING), ("created_at", DESCENDING))),
+
+    # Per-question analysis of an interview, fetched one answer at a time
+    IndexSpec(ANSWER_ANALYSIS, (("interview_id", ASCENDING), ("question_index", ASCENDING)), unique=True),
+
+    # One answer per candidate and question
+    IndexSpec("candidate_answers", (("candidate_id", ASCENDING), ("question_id", ASCENDING)), unique=True),
+
+    # Question bank filters and keyword search
+    IndexSpec("questions", (("experience_level", ASCENDING),)),
+    IndexSpec("questions", (("category", ASCENDING),)),
+    IndexSpec("questions", (("question", TEXT), ("tags", TEXT))),
+    # Built-in questions are upserted by their seed key
+    IndexSpec("questions", (("seed_key", ASCENDING),), unique=True, sparse=True),
+
+    # Admin dashboard filters and keyset paging
+    IndexSpec(ADMIN_SUMMARIES, (("created_at", DESCENDING), ("_id", DESCENDING))),
+    IndexSpec(ADMIN_SUMMARIES, (("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING))),
+    IndexSpec(ADMIN_SUMMARIES, (("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING))),
+
+    # Outbox worker claims due messages; rate limit windows expire on their own
+    IndexSpec(EMAIL_OUTBOX, (("status", ASCENDING), ("next_attempt_at", ASCENDING))),
+    IndexSpec(RATE_LIMITS, (("expires_at", ASCENDING),), expire_after_seconds=0),
+]
+
+
+# -------------------------------------------------
+# Sync
+# -------------------------------------------------
+async def sync_collection_indexes(db, collection: str, specs: Iterable[IndexSpec]) -> Dict[str, List[str]]:
+    """
+    Create indexes missing from `collection`. Existing indexes are never
+    dropped: ones whose options differ from the declaration are reported as
+    drifted and keep serving until they are migrated by hand, and indexes
+    that are not declared are reported as undeclared.
+    """
+    report = {"created": [], "unchanged": [], "drifted": [], "undeclared": [], "failed": []}
+    existing = await db[collection].index_information()
+    declared = set()
+
+    to_create = []
+    for spec in specs:
+        match = next(
+            (name for name, info in existing.items() if spec.matches_keys(info)),
+            None
+        )
+        if match is None:
+            to_create.append(spec)
+            continue
+
+        declared.add(match)
+        if spec.matches_options(existing[match]):
+            report["unchanged"].append(match)
+            continue
+
+        # Dropping first could leave a hot path unindexed if the new build then
+        # fails (e.g. duplicates under a new unique option), and the server
+        # won't build a second index on the same keys alongside it
+        logger.warning(
+            f"⚠️ Index {collection}.{match} options differ from declaration "
+            f"{spec.options()}; leaving it in place."
+        )
+        report["drifted"].append(match)
+
+    for spec in to_create:
+        try:
+            await db[collection].create_indexes([spec.to_model()])
+            report["created"].append(spec.index_name)
+        except OperationFailure as e:
+            # e.g. duplicate values for a new unique index; keep serving without it
+            logger.error(f"❌ Failed to build index {collection}.{spec.index_name}: {e}")
+            report["failed"].append(spec.index_name)
+
+    report["undeclared"] = [name for name in existing if name != "_id_" and name not in declared]
+    if report["undeclared"]:
+        logger.info(f"ℹ️ Undeclared indexes on {collection}: {', '.join(report['undeclared'])}")
+    return report
+
+
+async def sync_indexes(db, specs: Iterable[IndexSpec] = INDEXES, collections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    by_collection = defaultdict(list)
+    for spec in specs:
+        by_collection[spec.collection].append(spec)
+    if collections is not None:
+        wanted = set(collections)
+        by_collection = {name: specs for name, specs in by_collection.items() if name in wanted}
+
+    reports = {}
+    for collection, collection_specs in by_collection.items():
+        try:
+            reports[collection] = await sync_collection_indexes(db, collection, collection_specs)
+        except Exception as e:
+            logger.error(f"❌ Index sync failed for {collection}: {e}")
+            reports[collection] = {"error": str(e)}
+
+    created = sum(len(r.get("created", [])) for r in reports.values())
+    logger.info(f"✅ Index sync finished: {created} built across {len(reports)} collections.")
+    return reports
+
+
+def start_index_sync(db) -> asyncio.Task:
+    """Build indexes in the background so startup doesn't wait on large collections."""
+    return asyncio.create_task(sync_indexes(db), name="index-sync")
+
+
+# -------------------------------------------------
+# Dev-mode Audit of Unindexed Queries
+# -------------------------------------------------
+def uses_collection_scan(plan: Dict[str, Any]) -> bool:
+    if plan.get("stage") == "COLLSCAN":
+        return True
+    children = plan.get("inputStages") or ([plan["inputStage"]] if "inputStage" in plan else [])
+    return any(uses_collection_scan(child) for child in children)
+
+
+async def explain_uses_index(db, collection: str, query: Dict[str, Any], sort: Optional[list] = None) -> bool:
+    """Run `explain` on a query and report whether its winning plan avoids a collection scan."""
+    cursor = db[collection].find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    explanation = await cursor.explain()
+    return not uses_collection_scan(explanation["queryPlanner"]["winningPlan"])
+
+
+def _query_shape(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _query_shape(inner) for key, inner in value.items()}
+    if isinstance(value, list):
+        return [_query_shape(inner) for inner in value[:1]]
+    return "?"
+
+
+async def enable_collscan_profiling(db) -> None:
+    # Only collection scans are recorded, so the profiler stays cheap
+    await db.command({"profile": 1, "filter": {"planSummary": "COLLSCAN"}})
+    logger.info("🔍 Profiling collection scans for the index audit.")
+
+
+async def audit_unindexed_queries(db, limit: int = 200) -> List[Dict[str, Any]]:
+    """Group recent COLLSCAN operations from system.profile by namespace and query shape."""
+    entries = await db["system.profile"].find(
+        {"planSummary": "COLLSCAN", "ns": {"$not": {"$regex": r"\.system\."}}},
+        {"ns": 1, "command": 1, "docsExamined": 1, "millis": 1}
+    ).sort("ts", -1).limit(limit).to_list(length=limit)
+
+    grouped: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for entry in entries:
+        command = entry.get("command", {})
+        shape = _query_shape(command.get("filter") or command.get("q") or command.get("query") or {})
+        key = (entry["ns"], repr(shape))
+        item = grouped.setdefault(key, {"ns": entry["ns"], "shape": shape, "count": 0, "max_docs_examined": 0})
+        item["count"] += 1
+        item["max_docs_examined"] = max(item["max_docs_examined"], entry.get("docsExamined", 0))
+
+    findings = sorted(grouped.values(), key=lambda item: item["count"], reverse=True)
+    for item in findings:
+        logger.warning(
+            f"⚠️ Unindexed query on {item['ns']} ({item['count']}x, up to "
+            f"{item['max_docs_examined']} docs scanned): {item['shape']}"
+        )
+    return findings
+
+
+async def run_index_audit(db, interval_seconds: float) -> None:
+    try:
+        await enable_collscan_profiling(db)
+    except Exception as e:
+        logger.error(f"❌ Could not enable profiling for the index audit: {e}")
+        return
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await audit_unindexed_queries(db)
+        except Exception as e:
+            logger.error(f"❌ Index audit failed: {e}")
+
+
+def start_index_audit(db) -> Optional[asyncio.Task]:
+    if not settings.INDEX_AUDIT_ENABLED:
+        return None
+    return asyncio.create_task(run_index_audit(db, settings.INDEX_AUDIT_INTERVAL_SECONDS), name="index-audit")
+
+
+async def stop_index_tasks(tasks: List[Optional[asyncio.Task]]) -> None:
+    """Cancel the background sync/audit and wait for them, so neither outlives the Mongo client."""
+    for task in tasks:
+        if task is None:
+            continue
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"⚠️ Background index task {task.get_name()} failed: {e}")
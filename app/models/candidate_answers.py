@@ -1,11 +1,12 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 
 class CandidateAnswer(BaseModel):
     candidate_id: str
     question_id: str
+    interview_id: Optional[str] = None
     answer_text: Optional[str] = None
     answer_audio: Optional[str] = None
     answer_video: Optional[str] = None
@@ -28,3 +29,31 @@ class CandidateAnswerDB(CandidateAnswer):
     id: str = Field(..., alias="_id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = None  # Optional: update when edits occur
+
+
+class CandidateAnswerItem(BaseModel):
+    question_id: str
+    answer_text: Optional[str] = None
+    answer_audio: Optional[str] = None
+    answer_video: Optional[str] = None
+    ai_feedback: Optional[str] = None
+
+
+class CandidateAnswerBatch(BaseModel):
+    candidate_id: str
+    interview_id: Optional[str] = None
+    answers: List[CandidateAnswerItem] = Field(..., min_length=1, max_length=100)
+
+
+class CandidateAnswerResult(BaseModel):
+    question_id: str
+    status: Literal["created", "duplicate", "failed"]
+    id: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class CandidateAnswerBatchResult(BaseModel):
+    created: int
+    duplicates: int
+    failed: int
+    results: List[CandidateAnswerResult]
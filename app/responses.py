@@ -0,0 +1,68 @@
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+import orjson
+from bson import ObjectId
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.services.ai.timeline import EmotionTimeline
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, EmotionTimeline):
+        return obj.to_records()
+    if isinstance(obj, set):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class AnalysisJSONResponse(JSONResponse):
+    """
+    orjson rendering for analysis payloads: numpy arrays and scalars, datetimes
+    and ObjectIds are serialized natively. Return an instance directly from a
+    route so FastAPI's jsonable_encoder pass is skipped as well.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def wants_ndjson(request: Request, stream: bool = False) -> bool:
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def timeline_chunks(timeline: Optional[EmotionTimeline], chunk_frames: int) -> Iterable[Dict[str, Any]]:
+    """Framewise records in chunks, expanded one chunk at a time from the columnar timeline."""
+    if timeline is None:
+        return
+    chunk_frames = max(1, chunk_frames)
+    for start in range(0, len(timeline), chunk_frames):
+        yield {
+            "type": "timeline",
+            "offset": start,
+            "frames": timeline.slice(start, start + chunk_frames).to_records()
+        }
+
+
+def ndjson_response(summary: Dict[str, Any], parts: Iterable[Dict[str, Any]] = ()) -> StreamingResponse:
+    """
+    One JSON object per line: the summary first, so clients can render
+    feedback straight away, then the bulk parts, then an end marker.
+    """
+
+    async def lines() -> AsyncIterator[bytes]:
+        yield dumps({"type": "summary", **summary}) + b"\n"
+        count = 0
+        for part in parts:
+            count += 1
+            yield dumps(part) + b"\n"
+        yield dumps({"type": "end", "parts": count}) + b"\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
 import logging
 from app.services.ai.facial_analysis import analyze_facial_expression_frame
+from app.services.rate_limit import rate_limit
+from app.config import settings
+from app.responses import AnalysisJSONResponse
 
-router = APIRouter(prefix="/api/ai", tags=["AI Analysis"])
+router = APIRouter(prefix="/api/ai", tags=["AI Analysis"], default_response_class=AnalysisJSONResponse)
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
-@router.post("/analyze-frame/")
+@router.post("/analyze-frame/", dependencies=[Depends(rate_limit(settings.RATE_LIMIT_FRAMES, "frames"))])
 async def analyze_frame(file: UploadFile = File(...)):
     try:
         # Check for file type (e.g., image, video)
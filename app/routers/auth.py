@@ -1,15 +1,18 @@
 import uuid
 import random
-import asyncio
 from datetime import datetime, timedelta
-from fastapi import APIRouter, HTTPException, Request, Depends
-from slowapi import Limiter
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request, Depends, Query
+from fastapi.responses import JSONResponse
 from jose import jwt, JWTError, ExpiredSignatureError
-from slowapi.util import get_remote_address
-from app.services.email import templates, APP_NAME, SUPPORT_EMAIL, send_email
+from app.services.email import APP_NAME, SUPPORT_EMAIL, send_email
+from app.services.email_validation import is_valid_email
+from app.services.email_templates import email_templates
 from ..services.email import send_otp_email,  send_admin_notification_email, send_welcome_email
-from ..services.auth import generate_otp, verify_otp_service, authenticate_user, create_access_token, get_current_user, validate_password, validate_registration_role
-from ..services.utils import get_password_hash
+from ..services.auth import create_otp, generate_otp, verify_otp_service, authenticate_user, create_access_token, get_current_user, validate_password, validate_registration_role, token_claims_for, invalidate_user
+from ..services.passwords import hash_password_async
+from ..services.admin_summaries import list_admin_summaries
+from ..services.rate_limit import rate_limit
 from ..database import get_database
 from ..schemas.auth import ForgotPasswordRequest, ResetPasswordRequest, VerifyOtpRequest
 from ..schemas.user import UserCreate, UserResponse, LoginRequest, OTPRequest, OTPResponse
@@ -17,20 +20,26 @@ from ..schemas.token import TokenResponse
 from app.config import settings
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-# Initialize router and rate limiter
+# Initialize router and rate limits (shared across workers)
 router = APIRouter(prefix="/auth", tags=["Authentication"])
-limiter = Limiter(key_func=get_remote_address)
+login_limit = Depends(rate_limit(settings.RATE_LIMIT_LOGIN, "login"))
+password_reset_limit = Depends(rate_limit(settings.RATE_LIMIT_PASSWORD_RESET, "password-reset"))
+auth_limit = Depends(rate_limit(settings.RATE_LIMIT_AUTH, "auth"))
 
 # Token expiration time from config
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
 
-@router.post("/register", response_model=UserResponse)
+@router.post("/register", response_model=UserResponse, dependencies=[auth_limit])
 async def register(request: Request, user: UserCreate):
     db = await get_database()
 
     validate_password(user.password)
 
+    # Reject undeliverable addresses before anything is stored
+    if not await is_valid_email(user.email):
+        raise HTTPException(status_code=400, detail="Invalid email address")
+
     # Check if email already exists
     existing_user = await db["users"].find_one({"email": user.email.lower()})
     if existing_user:
@@ -49,15 +58,10 @@ async def register(request: Request, user: UserCreate):
 
     # Generate unique client ID and secure password
     client_id = str(uuid.uuid4())
-    hashed_password = get_password_hash(user.password)
-
-    # Generate OTP
-    otp_response = await generate_otp(user.email, user.Name)
+    hashed_password = await hash_password_async(user.password)
 
-    if "error" in otp_response:
-        raise HTTPException(status_code=400, detail=otp_response["error"])
-
-    otp = otp_response["otp"]
+    # Generate OTP (emailed once the user exists)
+    otp = create_otp()
 
     # Create new user document (Ensure OTP is stored here)
     new_user = {
@@ -76,10 +80,17 @@ async def register(request: Request, user: UserCreate):
 
     # Insert user into MongoDB
     result = await db["users"].insert_one(new_user)
-    await send_otp_email(user.email, user.Name, otp)
+
+    # Emails are queued to the outbox and delivered in the background
+    otp_response = await send_otp_email(user.email, user.Name, otp)
+    if "error" in otp_response:
+        # Don't leave a half-registered user behind, or every retry hits "Email already registered"
+        await db["users"].delete_one({"_id": result.inserted_id})
+        raise HTTPException(status_code=400, detail=otp_response["error"])
+
     await send_welcome_email(user.email, user.Name)
     email_response = await send_admin_notification_email(user.Name, user.email, user.role)
-    
+
     if email_response is False:
         raise HTTPException(status_code=500, detail="Failed to notify admin.")
 
@@ -102,24 +113,23 @@ async def generate_otp_route(email: str, user_name: str, user=Depends(get_curren
 
     return {"otp": response["otp"]}
 
-@router.post("/verify-otp")
+@router.post("/verify-otp", dependencies=[auth_limit])
 async def verify_otp(request: Request, body: VerifyOtpRequest):
     return await verify_otp_service(body.email, body.otp)
 
 
-@router.post("/login", response_model=TokenResponse)
+@router.post("/login", response_model=TokenResponse, dependencies=[login_limit])
 async def login(request: LoginRequest):
     user = await authenticate_user(request.email, request.password)
 
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    access_token = create_access_token({"sub": user["client_id"], "role": user["role"]})
+    access_token = create_access_token(token_claims_for(user))
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@router.post("/forgot-password")
-@limiter.limit("3/minute")  # 3 attempts per minute to prevent abuse
+@router.post("/forgot-password", dependencies=[password_reset_limit])  # 3 attempts per minute to prevent abuse
 async def forgot_password(request: Request, body: ForgotPasswordRequest):
     db = await get_database()
 
@@ -143,13 +153,13 @@ async def forgot_password(request: Request, body: ForgotPasswordRequest):
         }}
     )
 
-    # Send OTP asynchronously
-    asyncio.create_task(send_otp_email(body.email, user_name, reset_otp))
+    # Queue the OTP email for background delivery
+    await send_otp_email(body.email, user_name, reset_otp)
 
     return {"message": "OTP sent for password reset"}
 
 
-@router.post("/reset-password")
+@router.post("/reset-password", dependencies=[password_reset_limit])
 async def reset_password(request: Request, body: ResetPasswordRequest):
     db = await get_database()
     user = await db["users"].find_one({"email": body.email})
@@ -168,15 +178,17 @@ async def reset_password(request: Request, body: ResetPasswordRequest):
     validate_password(body.new_password)
 
     # Hash the new password
-    hashed_password = get_password_hash(body.new_password)
+    hashed_password = await hash_password_async(body.new_password)
 
     # Update password and remove OTP fields
     await db["users"].update_one(
         {"email": body.email},
         {"$set": {"password": hashed_password}, "$unset": {"reset_otp": "", "reset_otp_expires_at": ""}}
     )
+    invalidate_user(user.get("client_id"))
 
-    html = templates.get_template("emails/password_reset_success.html").render(
+    html = email_templates.render(
+        "emails/password_reset_success.html",
         user_name=user.get("Name", user["email"]),
         app_name=APP_NAME,
         support_email=SUPPORT_EMAIL,
@@ -189,8 +201,7 @@ async def reset_password(request: Request, body: ResetPasswordRequest):
     return {"message": "Password reset successful"}
 
 
-@router.post("/token", response_model=TokenResponse)
-@limiter.limit("5/minute")  # Limit login attempts to prevent brute force attacks
+@router.post("/token", response_model=TokenResponse, dependencies=[login_limit])  # Limit login attempts to prevent brute force attacks
 async def login_for_access_token(request: Request, login_data: LoginRequest):
     print(f"🔍 Attempting login for: {login_data.email}")
     user = await authenticate_user(login_data.email, login_data.password)
@@ -200,11 +211,11 @@ async def login_for_access_token(request: Request, login_data: LoginRequest):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     # Generate JWT token
-    access_token = create_access_token(data={"sub": user["client_id"], "role": user["role"]})
+    access_token = create_access_token(data=token_claims_for(user))
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@router.post("/send-otp/", response_model=OTPResponse)
+@router.post("/send-otp/", response_model=OTPResponse, dependencies=[auth_limit])
 async def send_otp(request: OTPRequest):
     response = await generate_otp(request.email, request.name)
 
@@ -231,29 +242,18 @@ def verify_hr_invite_token(token: str):
     except JWTError:
         raise HTTPException(status_code=400, detail="Invalid invite token")
 @router.get("/admin/interviews")
-async def get_admin_results(db: AsyncIOMotorDatabase = Depends(get_database)):
-    interviews = await db["interviews"].aggregate([
-        {"$lookup": {
-            "from": "users",
-            "localField": "user_id",
-            "foreignField": "client_id",
-            "as": "user"
-        }},
-        {"$unwind": "$user"},
-        {"$project": {
-            "interview_id": {"$toString": "$_id"},
-            "user_name": "$user.Name",
-            "status": "$status",
-            "score": "$ai_feedback.score",
-            "summary": "$ai_feedback.feedback"
-        }}
-    ]).to_list(length=100)
-
-    # Flatten score and feedback from last AI entry
-    for i in interviews:
-        if isinstance(i["score"], list):
-            i["score"] = i["score"][-1] if i["score"] else None
-        if isinstance(i["summary"], list):
-            i["summary"] = i["summary"][-1] if i["summary"] else None
+async def get_admin_results(
+    status: Optional[str] = Query(None),
+    user_id: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    # Served from the incrementally maintained admin_interview_summaries collection
+    try:
+        rows, next_cursor = await list_admin_summaries(db, status=status, user_id=user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return interviews
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return JSONResponse(content=rows, headers=headers)
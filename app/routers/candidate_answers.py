@@ -1,10 +1,27 @@
 from fastapi import APIRouter, HTTPException
+from bson import ObjectId
 from datetime import datetime
 import logging
+import time
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from app.database import get_database
-from app.models.candidate_answers import CandidateAnswer, CandidateAnswerDB
+from app.models.candidate_answers import (
+    CandidateAnswer,
+    CandidateAnswerDB,
+    CandidateAnswerBatch,
+    CandidateAnswerBatchResult,
+    CandidateAnswerResult
+)
 
 router = APIRouter(prefix="/candidate_answers", tags=["Candidate Answers"])
+
+# (candidate_id, question_id) is unique (see app/indexes.py), so duplicates
+# are rejected by the insert itself instead of a lookup beforehand
+DUPLICATE_KEY_ERROR = 11000
+ANSWER_KEYS = [("candidate_id", 1), ("question_id", 1)]
+DUPLICATE_DETAIL = "Candidate has already answered this question"
+
+
 async def get_answers_collection():
     db = await get_database()  # Ensure connection
     return db.get_collection("candidate_answers")
@@ -13,43 +30,63 @@ async def get_answers_collection():
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class UniqueIndexCheck:
+    """
+    Whether the unique answer index exists. It is built in the background at
+    startup and a build can fail on existing duplicates, so until it is seen,
+    callers fall back to looking duplicates up before inserting. Once found
+    it is trusted for the life of the process; a miss is re-checked at most
+    every `negative_ttl` seconds.
+    """
+
+    def __init__(self, negative_ttl: float = 30.0):
+        self.ready = False
+        self.negative_ttl = negative_ttl
+        self._checked_at = None
+        self._warned = False
+
+    async def __call__(self, collection) -> bool:
+        if self.ready:
+            return True
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.negative_ttl:
+            return False
+        self._checked_at = now
+        indexes = await collection.index_information()
+        self.ready = any(
+            info.get("unique") and [tuple(key) for key in info["key"]] == ANSWER_KEYS
+            for info in indexes.values()
+        )
+        if not self.ready and not self._warned:
+            self._warned = True
+            logger.error(
+                "❌ Unique index on candidate_answers(candidate_id, question_id) is missing; "
+                "checking for duplicates before each insert until it is built."
+            )
+        return self.ready
+
+
+unique_answer_index = UniqueIndexCheck()
+
 # Store candidate's answer
 @router.post("/", response_model=CandidateAnswerDB)
 async def store_answer(answer: CandidateAnswer):
-    # Check if the candidate has already answered this question
-    existing_answer = await answers_collection.find_one({
-        "candidate_id": answer.candidate_id,
-        "question_id": answer.question_id
-    })
-
-    if existing_answer:
-        logger.warning(
-            f"⚠️ Candidate {answer.candidate_id} has already answered "
-            f"question {answer.question_id}"
-        )
-        raise HTTPException(
-            status_code=400,
-            detail="Candidate has already answered this question"
-        )
+    answers_collection = await get_answers_collection()
 
     # Prepare the answer for insertion
     answer_dict = answer.model_dump()
     answer_dict["created_at"] = datetime.utcnow()
 
-    # Insert answer into the database
     try:
-        result = await answers_collection.insert_one(answer_dict)
-        
-        # If insert is successful, return the answer
-        if result.inserted_id:
-            logger.info(
-                f"✅ Answer stored successfully for candidate {answer.candidate_id}, "
-                f"question {answer.question_id}"
-            )
-            return CandidateAnswerDB(**answer_dict, id=str(result.inserted_id))
-        else:
-            raise Exception("Insert operation failed.")
-    
+        # Without the unique index a stored answer is looked up; with it the insert rejects duplicates
+        duplicate = not await unique_answer_index(answers_collection) and await answers_collection.find_one(
+            {"candidate_id": answer.candidate_id, "question_id": answer.question_id}, {"_id": 1}
+        ) is not None
+        if not duplicate:
+            result = await answers_collection.insert_one(answer_dict)
+    except DuplicateKeyError:
+        duplicate = True
     # Catch any exceptions during database insertion
     except Exception as e:
         logger.error(
@@ -57,3 +94,93 @@ async def store_answer(answer: CandidateAnswer):
             f"question {answer.question_id}: {str(e)}"
         )
         raise HTTPException(status_code=500, detail="Failed to store answer")
+
+    if duplicate:
+        logger.warning(
+            f"⚠️ Candidate {answer.candidate_id} has already answered "
+            f"question {answer.question_id}"
+        )
+        raise HTTPException(
+            status_code=400,
+            detail=DUPLICATE_DETAIL
+        )
+
+    logger.info(
+        f"✅ Answer stored successfully for candidate {answer.candidate_id}, "
+        f"question {answer.question_id}"
+    )
+    answer_dict["_id"] = str(result.inserted_id)
+    return CandidateAnswerDB(**answer_dict)
+
+
+async def find_duplicates(answers_collection, candidate_id: str, docs: list) -> dict:
+    """Duplicate errors by position, for answers already stored or repeated within the batch."""
+    question_ids = [doc["question_id"] for doc in docs]
+    seen = {
+        doc["question_id"]
+        async for doc in answers_collection.find(
+            {"candidate_id": candidate_id, "question_id": {"$in": question_ids}}, {"question_id": 1}
+        )
+    }
+    errors = {}
+    for i, question_id in enumerate(question_ids):
+        if question_id in seen:
+            errors[i] = {"code": DUPLICATE_KEY_ERROR}
+        seen.add(question_id)
+    return errors
+
+
+# Store all answers of an interview in one round trip
+@router.post("/bulk", response_model=CandidateAnswerBatchResult)
+async def store_answers(batch: CandidateAnswerBatch):
+    answers_collection = await get_answers_collection()
+    now = datetime.utcnow()
+
+    # _ids are assigned up front so every item can be reported without a read back
+    docs = [
+        {
+            "_id": ObjectId(),
+            "candidate_id": batch.candidate_id,
+            "interview_id": batch.interview_id,
+            **item.model_dump(),
+            "created_at": now
+        }
+        for item in batch.answers
+    ]
+    errors = {}
+    try:
+        if not await unique_answer_index(answers_collection):
+            errors = await find_duplicates(answers_collection, batch.candidate_id, docs)
+
+        # insert_many reports errors by position in the list it was given
+        positions = [i for i in range(len(docs)) if i not in errors]
+        if positions:
+            await answers_collection.insert_many([docs[i] for i in positions], ordered=False)
+    except BulkWriteError as e:
+        errors.update({positions[error["index"]]: error for error in e.details.get("writeErrors", [])})
+    except Exception as e:
+        logger.error(f"❌ Failed to store answers for candidate {batch.candidate_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to store answers")
+
+    results = []
+    for i, doc in enumerate(docs):
+        error = errors.get(i)
+        if error is None:
+            results.append(CandidateAnswerResult(question_id=doc["question_id"], status="created", id=str(doc["_id"])))
+        elif error.get("code") == DUPLICATE_KEY_ERROR:
+            results.append(CandidateAnswerResult(
+                question_id=doc["question_id"], status="duplicate", detail=DUPLICATE_DETAIL
+            ))
+        else:
+            results.append(CandidateAnswerResult(
+                question_id=doc["question_id"], status="failed", detail=error.get("errmsg")
+            ))
+
+    counts = {status: sum(1 for r in results if r.status == status) for status in ("created", "duplicate", "failed")}
+    logger.info(
+        f"✅ Stored {counts['created']} answers for candidate {batch.candidate_id} "
+        f"({counts['duplicate']} duplicates, {counts['failed']} failed)"
+    )
+    return CandidateAnswerBatchResult(
+        created=counts["created"], duplicates=counts["duplicate"], failed=counts["failed"], results=results
+    )
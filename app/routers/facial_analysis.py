@@ -1,15 +1,22 @@
-from fastapi import APIRouter, HTTPException, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Query, Request
 from datetime import datetime
 import shutil
 import tempfile
 import os
 import logging
-from app.services.ai.ai_analysis import analyze_video_audio
+from app.services.ai.ai_analysis import analyze_video_audio, summarize_emotions
+from app.config import settings
+from app.responses import AnalysisJSONResponse, ndjson_response, timeline_chunks, wants_ndjson
+from app.services.rate_limit import rate_limit
+from app.services.executors import executors, require_capacity, IO, STT, VIDEO
 from app.services.ai.facial_analysis import (
     analyze_facial_expression,
 )
 
-router = APIRouter(prefix="/api", tags=["Facial & Speech Analysis"])
+router = APIRouter(prefix="/api", tags=["Facial & Speech Analysis"], default_response_class=AnalysisJSONResponse)
+upload_limit = Depends(rate_limit(settings.RATE_LIMIT_UPLOAD, "upload"))
+video_capacity = Depends(require_capacity(IO, VIDEO))
+analysis_capacity = Depends(require_capacity(IO, VIDEO, STT))
 
 # Logger setup
 logging.basicConfig(level=logging.INFO)
@@ -23,7 +30,7 @@ ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png"}
 # -----------------------------------------
 # Facial Expression Analysis from Video File
 # -----------------------------------------
-@router.post("/analyze_facial")
+@router.post("/analyze_facial", dependencies=[upload_limit, video_capacity])
 async def analyze_facial(file: UploadFile = File(...)):
     temp_video_path = None
     try:
@@ -31,7 +38,7 @@ async def analyze_facial(file: UploadFile = File(...)):
             raise HTTPException(status_code=400, detail="Only MP4 video files are allowed.")
 
         with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_video:
-            shutil.copyfileobj(file.file, temp_video)
+            await executors.run(IO, shutil.copyfileobj, file.file, temp_video)
             temp_video_path = temp_video.name
 
         result = await analyze_facial_expression(temp_video_path)
@@ -39,9 +46,8 @@ async def analyze_facial(file: UploadFile = File(...)):
         if result["status"] != "success":
             raise HTTPException(status_code=500, detail=result["message"])
 
-        # Split data for frontend and internal use
-        full_data = result["data"]
-        summary_data = full_data.get("summary")
+        # Send only the summary to the frontend
+        summary_data = summarize_emotions(result["timeline"])
 
         return {
             "status": "success",
@@ -66,10 +72,12 @@ async def analyze_facial(file: UploadFile = File(...)):
 # -----------------------------------------
 # Combined Video + Audio Analysis
 # -----------------------------------------
-@router.post("/analyze_video_audio")
+@router.post("/analyze_video_audio", dependencies=[upload_limit, analysis_capacity])
 async def analyze_video_and_audio(
+    request: Request,
     video: UploadFile = File(...),
     audio: UploadFile = File(...),
+    stream: bool = Query(False, description="Stream NDJSON: summary first, then the framewise timeline"),
 ):
     temp_video_path = None
     temp_audio_path = None
@@ -84,19 +92,30 @@ async def analyze_video_and_audio(
 
         # Save the uploaded video file to a temporary file
         with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_video:
-            shutil.copyfileobj(video.file, temp_video)
+            await executors.run(IO, shutil.copyfileobj, video.file, temp_video)
             temp_video_path = temp_video.name
 
         # Save the uploaded audio file to a temporary file
         with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-            shutil.copyfileobj(audio.file, temp_audio)
+            await executors.run(IO, shutil.copyfileobj, audio.file, temp_audio)
             temp_audio_path = temp_audio.name
 
         # Perform combined video + audio analysis
-        result = await analyze_video_audio(temp_video_path, temp_audio_path)
+        streaming = wants_ndjson(request, stream)
+        result = await analyze_video_audio(temp_video_path, temp_audio_path, include_timeline=streaming)
+
+        if streaming and result.get("status") == "success":
+            # Framewise records follow the summary in chunks instead of inline
+            timeline = result.pop("timeline", None)
+            result["data"].pop("facial_analysis", None)
+            return ndjson_response(
+                {"video_audio_analysis": result},
+                timeline_chunks(timeline, settings.ANALYSIS_STREAM_CHUNK_FRAMES)
+            )
 
         # Return the result of video + audio analysis
-        return {"video_audio_analysis": result}
+        result.pop("timeline", None)
+        return AnalysisJSONResponse({"video_audio_analysis": result})
 
     except HTTPException as he:
         # Raise HTTP exceptions for invalid file types
@@ -2,6 +2,7 @@ import asyncio
 import logging
 from fastapi import WebSocket, APIRouter, WebSocketDisconnect
 from app.services.ai.ai_analysis import analyze_video_audio
+from app.services.executors import PoolSaturated
 
 router = APIRouter(tags=["Real-time Feedback"])
 
@@ -50,6 +51,11 @@ async def websocket_feedback(websocket: WebSocket, interview_id: str):
                     "status": "success",
                     "feedback": feedback
                 })
+            except PoolSaturated as busy:
+                await websocket.send_json({
+                    "error": busy.detail,
+                    "retry_after": int(busy.headers["Retry-After"])
+                })
             except Exception as analysis_error:
                 logger.error(f"❌ AI analysis failed: {str(analysis_error)}")
                 await websocket.send_json({
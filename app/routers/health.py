@@ -1,8 +1,11 @@
 # app/router/health.py
 
 from fastapi import APIRouter, Depends, HTTPException
-from app.database import get_database
+from app.database import get_database, pool_metrics
 from app.config import logger
+from app.services.passwords import password_hasher
+from app.services.ai.save_analysis import analysis_write_metrics
+from app.services.executors import executors
 
 router = APIRouter()
 
@@ -18,3 +21,13 @@ async def health_check(db=Depends(get_database)):
             status_code=500,
             detail=f"MongoDB connection error: {str(e)}"
         )
+
+
+@router.get("/health/metrics")
+async def health_metrics():
+    return {
+        "password_hashing": password_hasher.metrics(),
+        "mongo_pool": pool_metrics.snapshot(),
+        "analysis_writes": analysis_write_metrics.snapshot(),
+        "executors": executors.metrics()
+    }
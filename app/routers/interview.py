@@ -1,59 +1,98 @@
-from fastapi import APIRouter, Depends, HTTPException, Form, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Form, File, UploadFile, Query, Request
+from fastapi.responses import JSONResponse
 from bson import ObjectId
 from bson.errors import InvalidId
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import logging
+import json
 import subprocess
 import tempfile
 import os
 from app.database import get_database
 from ..schemas.interview import (
     InterviewCreate,
+    InterviewGenerate,
     InterviewResponse,
+    InterviewSummary,
+    QuestionSegment,
     ResponseSubmission,
     AIAnalysis,
     AIFeedbackEntry
 )
 from ..services.utils import extract_audio_from_video, get_video_duration
-from ..services.ai.save_analysis import save_interview_analysis_to_db
+from ..services.ai.save_analysis import save_interview_analysis_to_db, expand_interview_analysis
 from ..services.auth import get_current_user
+from ..services.rate_limit import rate_limit
+from ..services.executors import executors, require_capacity, AUDIO, IO, STT, VIDEO
+from ..config import settings
+from ..responses import AnalysisJSONResponse, ndjson_response, timeline_chunks, wants_ndjson
+from ..services.interview import get_interviews_by_user
+from ..services.question_sets import question_sets
+from ..services.admin_summaries import record_interview_created, record_interview_status, record_interview_feedback
 from ..services.ai.facial_analysis import extract_framewise_emotions
 from ..services.ai.ai_analysis import analyze_video_audio
-from ..services.ai.speech_analysis import analyze_speech
+from ..services.ai.speech_analysis import analyze_speech, rms_envelope
+from ..services.ai.answer_segments import (
+    ANSWER_ANALYSIS, build_answer_analyses, question_positions, save_answer_analyses, public_answer_analysis
+)
+from ..services.ai.timeline import decode_timeline, EMOTION_LABELS
+from ..services.ai.timeline_chart import get_chart_timeline
+from pydantic import TypeAdapter, ValidationError
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 ALLOWED_VIDEO_MIME_TYPES = {"video/mp4", "video/x-msvideo", "video/quicktime", "video/webm"}
 ALLOWED_AUDIO_MIME_TYPES = {"audio/wav", "audio/x-wav"}
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/interviews", tags=["Interviews"])
-
-
-@router.get("/", response_model=List[InterviewResponse])
-async def get_interviews(current_user: dict = Depends(get_current_user), db: AsyncIOMotorDatabase = Depends(get_database)):
+router = APIRouter(prefix="/api/interviews", tags=["Interviews"], default_response_class=AnalysisJSONResponse)
+upload_limit = Depends(rate_limit(settings.RATE_LIMIT_UPLOAD, "upload"))
+# Reject up front when the pools an analysis needs are already full
+video_capacity = Depends(require_capacity(VIDEO))
+analysis_capacity = Depends(require_capacity(IO, VIDEO, STT, AUDIO))
+
+
+@router.get("/", response_model=List[InterviewSummary])
+async def get_interviews(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    current_user: dict = Depends(get_current_user)
+):
     user_id = str(current_user["client_id"])
-    interviews = await db["interviews"].find({"user_id": user_id}).to_list(length=100)
-    return [InterviewResponse(**{**i, "id": str(i["_id"])}) for i in interviews]
+    try:
+        items, next_cursor = await get_interviews_by_user(user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Items are already JSON-ready; skip per-item response model validation
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return JSONResponse(content=items, headers=headers)
+
+
+async def _insert_interview(db, current_user: dict, interview_data: dict) -> dict:
+    interview_data.update({
+        "user_id": str(current_user["client_id"]),
+        "responses": [],
+        "feedback": None,
+        "ai_feedback": [],
+        "status": "pending",
+        "status_history": ["pending"],
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    })
+
+    result = await db["interviews"].insert_one(interview_data)
+    interview_data["id"] = str(result.inserted_id)
+    await record_interview_created(
+        db, result.inserted_id, interview_data["user_id"], current_user.get("Name")
+    )
+    return interview_data
 
 
 @router.post("/", response_model=InterviewResponse)
 async def create_interview(interview: InterviewCreate, current_user: dict = Depends(get_current_user), db: AsyncIOMotorDatabase = Depends(get_database)):
     try:
-        interview_data = interview.model_dump()
-        interview_data.update({
-            "user_id": str(current_user["client_id"]),
-            "responses": [],
-            "feedback": None,
-            "ai_feedback": [],
-            "status": "pending",
-            "status_history": ["pending"],
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        })
-
-        result = await db["interviews"].insert_one(interview_data)
-        interview_data["id"] = str(result.inserted_id)
+        interview_data = await _insert_interview(db, current_user, interview.model_dump())
 
         logger.info(f"✅ Interview created for user: {current_user['client_id']}")
         return InterviewResponse(**interview_data)
@@ -63,6 +102,47 @@ async def create_interview(interview: InterviewCreate, current_user: dict = Depe
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@router.post("/generate", response_model=InterviewResponse)
+async def generate_interview(
+    request: InterviewGenerate,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Create an interview from a question set balanced across categories,
+    skipping questions this user has already been given.
+    """
+    user_id = str(current_user["client_id"])
+    count = min(request.count or settings.QUESTION_SET_DEFAULT_SIZE, settings.QUESTION_SET_MAX_SIZE)
+    try:
+        questions, reused = await question_sets.generate(
+            db, user_id, count,
+            experience_level=request.experience_level,
+            categories=request.categories
+        )
+        if not questions:
+            raise HTTPException(status_code=404, detail="No questions match the requested filters")
+
+        question_ids = [q["_id"] for q in questions]
+        interview_data = await _insert_interview(db, current_user, {
+            "questions": [q["question"] for q in questions],
+            "question_ids": question_ids
+        })
+        await question_sets.mark_seen(db, user_id, question_ids)
+
+        logger.info(
+            f"✅ Generated interview with {len(questions)} questions for user: {user_id}"
+            + (f" ({reused} repeated)" if reused else "")
+        )
+        return InterviewResponse(**interview_data)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"❌ Error generating interview: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
 @router.post("/{interview_id}/responses/")
 async def submit_response(
     interview_id: str,
@@ -92,6 +172,7 @@ async def submit_response(
             logger.warning(f"⚠️ Interview not found or unauthorized: {interview_id}")
             raise HTTPException(status_code=404, detail="Interview not found or not authorized")
 
+        await record_interview_status(db, interview_obj_id, "completed")
         logger.info(f"✅ Responses recorded for interview: {interview_id}")
         return {"status": "success", "message": "Responses recorded successfully"}
 
@@ -130,6 +211,7 @@ async def store_ai_feedback(
             logger.warning(f"⚠️ AI feedback: Interview not found: {interview_id}")
             raise HTTPException(status_code=404, detail="Interview not found or not authorized")
 
+        await record_interview_feedback(db, interview_obj_id, summary=feedback_data.feedback)
         logger.info(f"✅ AI feedback stored for interview: {interview_id}")
         return {"status": "success", "message": "AI feedback stored successfully"}
 
@@ -140,6 +222,106 @@ async def store_ai_feedback(
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@router.get("/{interview_id}/analysis")
+async def get_interview_analysis(
+    interview_id: str,
+    expand: bool = Query(False, description="Decode the stored framewise facial timeline"),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    user_id = str(current_user["client_id"])
+    projection = None if expand else {"facial_timeline": 0, "facial_analysis": 0}
+
+    analysis = await db["interview_analysis"].find_one(
+        {"interview_id": interview_id, "user_id": user_id},
+        projection,
+        sort=[("created_at", -1)]
+    )
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found or not authorized")
+
+    analysis["id"] = str(analysis.pop("_id"))
+    if expand:
+        expand_interview_analysis(analysis)
+    else:
+        analysis.pop("facial_timeline_format", None)
+    return analysis
+
+
+@router.get("/{interview_id}/timeline")
+async def get_timeline_chart(
+    interview_id: str,
+    buckets: int = Query(100, ge=2, le=settings.TIMELINE_CHART_MAX_BUCKETS),
+    method: str = Query("mean", pattern="^(mean|lttb)$"),
+    emotion: Optional[str] = Query(None, description="Series LTTB preserves; defaults to the most frequent emotion"),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Emotion timeline of the latest analysis reduced to at most `buckets`
+    points for charting, as parallel arrays.
+    """
+    if emotion is not None and emotion not in EMOTION_LABELS:
+        raise HTTPException(status_code=400, detail=f"Unknown emotion. Choose from {', '.join(EMOTION_LABELS)}.")
+    try:
+        chart = await get_chart_timeline(
+            db, str(current_user["client_id"]), interview_id, buckets, method, emotion
+        )
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="Invalid interview ID format")
+    if chart is None:
+        raise HTTPException(status_code=404, detail="Analysis not found or not authorized")
+    return AnalysisJSONResponse(chart)
+
+
+@router.get("/{interview_id}/answers")
+async def get_answer_analyses(
+    interview_id: str,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Per-question analysis summaries, without the framewise timelines."""
+    user_id = str(current_user["client_id"])
+    docs = await db[ANSWER_ANALYSIS].find(
+        {"interview_id": interview_id, "user_id": user_id},
+        {"facial_timeline": 0}
+    ).sort("question_index", 1).to_list(length=None)
+    return [public_answer_analysis(doc) for doc in docs]
+
+
+@router.get("/{interview_id}/answers/{question_index}")
+async def get_answer_analysis(
+    interview_id: str,
+    question_index: int,
+    expand: bool = Query(False, description="Decode this answer's framewise facial timeline"),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    user_id = str(current_user["client_id"])
+    doc = await db[ANSWER_ANALYSIS].find_one(
+        {"interview_id": interview_id, "question_index": question_index, "user_id": user_id},
+        None if expand else {"facial_timeline": 0}
+    )
+    if not doc:
+        raise HTTPException(status_code=404, detail="Answer analysis not found or not authorized")
+
+    encoded = doc.get("facial_timeline")
+    result = public_answer_analysis(doc)
+    if expand and encoded is not None:
+        result["facial_analysis"] = decode_timeline(encoded).to_records()
+    return result
+
+
+def parse_segments(segments: Optional[str]) -> Optional[List[dict]]:
+    if not segments:
+        return None
+    try:
+        parsed = TypeAdapter(List[QuestionSegment]).validate_python(json.loads(segments))
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid segments: {e}")
+    return [segment.model_dump() for segment in parsed]
+
+
 def convert_webm_to_mp4(webm_path: str) -> str:
     mp4_path = f"{os.path.splitext(webm_path)[0]}.mp4"
     command = [
@@ -158,18 +340,26 @@ def convert_webm_to_mp4(webm_path: str) -> str:
         raise RuntimeError(f"WebM to MP4 conversion failed: {e}")
 
 
-@router.post("/{interview_id}/analyze/final")
+@router.post("/{interview_id}/analyze/final", dependencies=[upload_limit, analysis_capacity])
 async def finalize_interview_analysis(
+    request: Request,
     interview_id: str,
     user_id: str = Form(...),
     video: UploadFile = File(...),
+    segments: Optional[str] = Form(
+        None, description='JSON list of {"start", "end"[, "question_id"]} in seconds, one per question'
+    ),
+    stream: bool = Query(False, description="Stream NDJSON: summary first, then the framewise timeline"),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
+    question_segments = parse_segments(segments)
     webm_path = video_path = audio_path = None
     try:
         interview = await db["interviews"].find_one({"_id": ObjectId(interview_id), "user_id": user_id})
         if not interview:
             raise HTTPException(status_code=404, detail="Interview not found or unauthorized")
+        if question_segments:
+            question_positions(interview, question_segments)  # reject bad segments before any analysis
 
         if video.content_type not in ALLOWED_VIDEO_MIME_TYPES:
             raise HTTPException(status_code=400, detail="Unsupported video MIME type")
@@ -182,20 +372,20 @@ async def finalize_interview_analysis(
 
         # Convert if needed
         if ext == ".webm":
-            video_path = convert_webm_to_mp4(webm_path)
+            video_path = await executors.run(IO, convert_webm_to_mp4, webm_path)
         else:
             video_path = webm_path
 
         # 🔍 Duration validation
-        duration = get_video_duration(video_path)
+        duration = await executors.run(IO, get_video_duration, video_path)
         if duration < 1:
             raise HTTPException(status_code=400, detail="Video too short or invalid.")
 
         # Extract audio
-        audio_path = extract_audio_from_video(video_path)
+        audio_path = await executors.run(IO, extract_audio_from_video, video_path)
 
         # Analyze
-        result = await analyze_video_audio(video_path, audio_path)
+        result = await analyze_video_audio(video_path, audio_path, include_timeline=True)
         if result["status"] == "error":
             raise HTTPException(status_code=500, detail=f"Analysis failed: {result['message']}")
 
@@ -203,20 +393,39 @@ async def finalize_interview_analysis(
         feedback = await save_interview_analysis_to_db(
             db, user_id, interview_id,
             facial_result=result["data"]["facial_analysis"],
-            speech_result=result["data"]["speech_analysis"]
+            speech_result=result["data"]["speech_analysis"],
+            facial_timeline=result.get("timeline"),
+            facial_summary=result["data"]["facial_summary"]
         )
 
-        return {
+        # Per-question slices of the same timeline and one RMS pass over the audio
+        answers = []
+        if question_segments:
+            envelope = await executors.run(AUDIO, rms_envelope, audio_path)
+            answer_docs = build_answer_analyses(
+                user_id, interview, question_segments, timeline=result.get("timeline"), envelope=envelope
+            )
+            await save_answer_analyses(db, interview_id, answer_docs)
+            answers = [public_answer_analysis(dict(doc)) for doc in answer_docs]
+
+        summary = {
             "status": "success",
             "message": "Interview analysis complete",
             "feedback_for_candidate": feedback,
-            "facial_analysis": result["data"]["facial_analysis"],
             "facial_summary": result["data"]["facial_summary"],
-            "speech_analysis": result["data"]["speech_analysis"]
+            "speech_analysis": result["data"]["speech_analysis"],
+            "answers": answers
         }
+        if wants_ndjson(request, stream):
+            return ndjson_response(
+                summary, timeline_chunks(result.get("timeline"), settings.ANALYSIS_STREAM_CHUNK_FRAMES)
+            )
+        return AnalysisJSONResponse({**summary, "facial_analysis": result["data"]["facial_analysis"]})
 
     except InvalidId:
         raise HTTPException(status_code=400, detail="Invalid ID format")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Final interview analysis failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Final analysis failed")
@@ -233,7 +442,7 @@ async def finalize_interview_analysis(
             logger.warning(f"Cleanup warning: {str(cleanup_err)}")
 
 
-@router.post("/analyze-facial-expression/")
+@router.post("/analyze-facial-expression/", dependencies=[upload_limit, video_capacity])
 async def analyze_facial_expression_api(
     video: UploadFile = File(...),
     user_id: str = Form(...),
@@ -252,7 +461,7 @@ async def analyze_facial_expression_api(
             temp_video.write(await video.read())
             video_path = temp_video.name
 
-        analysis_result = extract_framewise_emotions(video_path)
+        analysis_result = await executors.run(VIDEO, extract_framewise_emotions, video_path)
 
         analysis_doc = {
             "user_id": user_obj_id,
@@ -271,6 +480,8 @@ async def analyze_facial_expression_api(
 
     except InvalidId:
         raise HTTPException(status_code=400, detail="Invalid ObjectId format")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Facial expression DB save failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Facial analysis failed")
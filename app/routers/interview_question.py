@@ -4,6 +4,7 @@ from typing import List, Optional
 from app.schemas.interview_question import QuestionModel
 from app.services.interview_question import QuestionService
 from app.database import get_database
+from app.indexes import sync_indexes
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 router = APIRouter(prefix="/api/questions", tags=["Questions"])
@@ -60,17 +61,30 @@ async def seed_interview_questions(db: AsyncIOMotorDatabase = Depends(get_databa
 @router.post("/indexes")
 async def create_question_indexes(db: AsyncIOMotorDatabase = Depends(get_database)):
     """
-    Create indexes on question collection for optimized querying.
+    Sync the declared indexes of the question collection.
     """
-    await QuestionService.create_indexes(db)
-    return {"message": "Indexes created successfully."}
+    report = await sync_indexes(db, collections=["questions"])
+    return {"message": "Indexes synced successfully.", "report": report}
 
 @router.get("/search", response_model=List[QuestionModel])
 async def search_questions(
     category: str = None,
     keyword: str = None,
     difficulty: str = None,
+    experience_level: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    return await QuestionService.search_questions(db, category, keyword, difficulty, experience_level, limit)
+
+@router.get("/suggest")
+async def suggest_questions(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    return await QuestionService.search_questions(db, category, keyword, difficulty)
+    """
+    Typeahead suggestions for the question search box.
+    """
+    return await QuestionService.suggest_questions(db, q, limit)
 
@@ -1,16 +1,31 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, status
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status
 import shutil
 import tempfile
 import os
 import logging
 from pydub import AudioSegment
 from app.services.ai.speech_analysis import analyze_speech
+from app.services.rate_limit import rate_limit
+from app.services.executors import executors, require_capacity, AUDIO, IO, STT
+from app.config import settings
 
 router = APIRouter(prefix="/api/speech", tags=["Speech Analysis"])
 logger = logging.getLogger(__name__)
 
 
-@router.post("/analyze", summary="Analyze uploaded speech audio file")
+def convert_mp3_to_wav(mp3_path: str, wav_path: str) -> None:
+    audio = AudioSegment.from_file(mp3_path, format="mp3")
+    audio.export(wav_path, format="wav")
+
+
+@router.post(
+    "/analyze",
+    summary="Analyze uploaded speech audio file",
+    dependencies=[
+        Depends(rate_limit(settings.RATE_LIMIT_UPLOAD, "upload")),
+        Depends(require_capacity(IO, AUDIO, STT))
+    ]
+)
 async def analyze_speech_api(file: UploadFile = File(...)):
     if not file:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No file uploaded.")
@@ -33,19 +48,20 @@ async def analyze_speech_api(file: UploadFile = File(...)):
             suffix=".mp3" if file.filename.endswith(".mp3") else ".wav"
         ) as temp_audio:
             temp_audio_path = temp_audio.name
-            shutil.copyfileobj(file.file, temp_audio)
+            await executors.run(IO, shutil.copyfileobj, file.file, temp_audio)
 
         if file.filename.lower().endswith(".mp3"):
-            audio = AudioSegment.from_file(temp_audio_path, format="mp3")
-            audio.export(temp_wav_path, format="wav")
+            await executors.run(AUDIO, convert_mp3_to_wav, temp_audio_path, temp_wav_path)
         else:
             temp_wav_path = temp_audio_path
 
         logger.info(f"🎤 Analyzing speech from: {file.filename}")
-        result = analyze_speech(temp_wav_path)
+        result = await executors.run(STT, analyze_speech, temp_wav_path)
         logger.info(f"✅ Analysis complete: {result}")
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"❌ Error analyzing speech: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Speech analysis failed.")
@@ -2,6 +2,8 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, status, Depends
 import logging
 from typing import Dict, Any
 from app.services.ai.facial_analysis import analyze_facial_expression_frame
+from app.services.rate_limit import rate_limit
+from app.config import settings
 # from app.services.auth import get_current_user
 
 router = APIRouter(
@@ -12,7 +14,11 @@ router = APIRouter(
 logger = logging.getLogger(__name__)
 
 
-@router.post("/frame", response_model=Dict[str, Any])
+@router.post(
+    "/frame",
+    response_model=Dict[str, Any],
+    dependencies=[Depends(rate_limit(settings.RATE_LIMIT_FRAMES, "frames"))]
+)
 async def receive_frame(
     file: UploadFile = File(...),
     # current_user: dict = Depends(get_current_user)
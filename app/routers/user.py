@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Body, File, UploadFile
 from typing import List
 from app.schemas.user import UserResponse, UserUpdate, AdminUserUpdate, ChangePasswordRequest
-from app.services.auth import get_current_user, hash_password, verify_password, generate_hr_invite_token
+from app.services.auth import get_current_user, generate_hr_invite_token, invalidate_user
+from app.services.passwords import hash_password_async, verify_password_async
 from app.models.user import User
 from app.database import get_database
+from app.services.admin_summaries import rename_user_in_summaries
+from app.services.rate_limit import rate_limit
+from app.config import settings
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 import os
@@ -36,10 +40,13 @@ async def update_me(
     )
 
     updated_user = await db["users"].find_one({"_id": ObjectId(current_user.id)})
+    invalidate_user(updated_user["client_id"])
+    if "Name" in update_data:
+        await rename_user_in_summaries(db, updated_user["client_id"], update_data["Name"])
     return UserResponse(**updated_user, id=str(updated_user["_id"]))
 
 
-@router.post("/me/avatar")
+@router.post("/me/avatar", dependencies=[Depends(rate_limit(settings.RATE_LIMIT_UPLOAD, "upload"))])
 async def upload_avatar(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
@@ -66,10 +73,10 @@ async def change_password(
     current_user: User = Depends(get_current_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    if not verify_password(data.old_password, current_user.hashed_password):
+    if not await verify_password_async(data.old_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Old password is incorrect")
 
-    new_hashed = hash_password(data.new_password)
+    new_hashed = await hash_password_async(data.new_password)
     await db["users"].update_one(
         {"_id": ObjectId(current_user.id)},
         {"$set": {"hashed_password": new_hashed}}
@@ -103,15 +110,20 @@ async def admin_update_user(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can update other users.")
 
+    changes = {k: v for k, v in update_data.model_dump().items() if v is not None}
     await db["users"].update_one(
         {"_id": ObjectId(user_id)},
-        {"$set": {k: v for k, v in update_data.model_dump().items() if v is not None}}
+        {"$set": changes}
     )
 
     updated = await db["users"].find_one({"_id": ObjectId(user_id)})
     if not updated:
         raise HTTPException(status_code=404, detail="User not found")
 
+    invalidate_user(updated["client_id"])
+    if "Name" in changes:
+        await rename_user_in_summaries(db, updated["client_id"], changes["Name"])
+
     return UserResponse(**updated, id=str(updated["_id"]))
 
 
@@ -124,10 +136,12 @@ async def delete_user(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can delete users.")
 
-    result = await db["users"].delete_one({"_id": ObjectId(user_id)})
-    if result.deleted_count == 0:
+    deleted = await db["users"].find_one_and_delete({"_id": ObjectId(user_id)}, projection={"client_id": 1})
+    if not deleted:
         raise HTTPException(status_code=404, detail="User not found")
 
+    invalidate_user(deleted.get("client_id"))
+
     return {"message": "User deleted successfully"}
 
 
@@ -149,14 +163,17 @@ async def update_user_role(
     if new_role == "admin":
         raise HTTPException(status_code=403, detail="Cannot assign 'admin' role directly.")
 
-    result = await db["users"].update_one(
+    updated = await db["users"].find_one_and_update(
         {"_id": ObjectId(user_id)},
-        {"$set": {"role": new_role}}
+        {"$set": {"role": new_role}},
+        projection={"client_id": 1}
     )
 
-    if result.matched_count == 0:
+    if not updated:
         raise HTTPException(status_code=404, detail="User not found.")
 
+    invalidate_user(updated.get("client_id"))
+
     return {"message": f"User role updated to '{new_role}'"}
 
 @router.post("/generate-hr")
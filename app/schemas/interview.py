@@ -19,6 +19,27 @@ class InterviewCreate(BaseModel):
         from_attributes = True
 
 
+# Schema for generating an interview from the question bank
+class InterviewGenerate(BaseModel):
+    count: Optional[int] = Field(None, ge=1, description="Number of questions; server default when omitted")
+    experience_level: Optional[str] = None
+    categories: Optional[List[str]] = None
+
+
+# Start/end (seconds into the recording) of the answer to one question
+class QuestionSegment(BaseModel):
+    start: float = Field(..., ge=0)
+    end: float = Field(..., gt=0)
+    question_id: Optional[str] = None
+
+    @field_validator("end")
+    @classmethod
+    def end_after_start(cls, v, info: FieldValidationInfo):
+        if "start" in info.data and v <= info.data["start"]:
+            raise ValueError("end must be after start")
+        return v
+
+
 # Schema for AI-generated feedback entries
 class AIFeedbackEntry(BaseModel):
     feedback: str
@@ -30,6 +51,7 @@ class InterviewResponse(BaseModel):
     id: Optional[str] = None
     user_id: str
     questions: List[str]
+    question_ids: List[str] = Field(default_factory=list)
     responses: List[Optional[str]] = Field(default_factory=list)
     status: InterviewStatus = InterviewStatus.PENDING
     status_history: List[str] = Field(default_factory=list)
@@ -49,6 +71,15 @@ class InterviewResponse(BaseModel):
         from_attributes = True
 
 
+# Lightweight listing item (projected server-side, no embedded feedback)
+class InterviewSummary(BaseModel):
+    id: str
+    status: str
+    question_count: int = 0
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
 # Schema for submitting interview responses
 class ResponseSubmission(BaseModel):
     responses: List[str]
@@ -0,0 +1,148 @@
+from datetime import datetime
+from bson import ObjectId
+import logging
+from typing import Optional, List, Tuple, Union
+from app.services.pagination import encode_cursor, keyset_filter
+
+logger = logging.getLogger(__name__)
+
+# One document per interview, kept in sync as the interview changes, so the
+# admin dashboard never joins interviews with users at request time.
+ADMIN_SUMMARIES = "admin_interview_summaries"
+
+
+def _as_object_id(interview_id: Union[str, ObjectId]) -> ObjectId:
+    return interview_id if isinstance(interview_id, ObjectId) else ObjectId(interview_id)
+
+
+async def upsert_interview_summary(db, interview_id: Union[str, ObjectId], session=None, **fields) -> None:
+    """
+    Apply `fields` to an interview's summary row. Failures are logged, except
+    inside a transaction (`session` given), where they are raised so the
+    transaction aborts instead of committing without its summary.
+    """
+    try:
+        now = datetime.utcnow()
+        obj_id = _as_object_id(interview_id)
+        await db[ADMIN_SUMMARIES].update_one(
+            {"_id": obj_id},
+            {
+                "$set": {**fields, "updated_at": now},
+                "$setOnInsert": {"interview_id": str(obj_id), "created_at": now}
+            },
+            upsert=True,
+            session=session
+        )
+    except Exception as e:
+        logger.error(f"❌ Failed to update admin summary for interview {interview_id}: {e}")
+        if session is not None:
+            raise
+
+
+async def record_interview_created(db, interview_id, user_id: str, user_name: Optional[str], status: str = "pending"):
+    await upsert_interview_summary(
+        db, interview_id,
+        user_id=user_id,
+        user_name=user_name,
+        status=status,
+        score=None,
+        summary=None
+    )
+
+
+async def record_interview_status(db, interview_id, status: str):
+    await upsert_interview_summary(db, interview_id, status=status)
+
+
+async def record_interview_feedback(db, interview_id, summary: Optional[str], score: Optional[float] = None, status: Optional[str] = None):
+    fields = {"summary": summary}
+    if score is not None:
+        fields["score"] = score
+    if status:
+        fields["status"] = status
+    await upsert_interview_summary(db, interview_id, **fields)
+
+
+async def rename_user_in_summaries(db, user_id: str, user_name: str):
+    try:
+        await db[ADMIN_SUMMARIES].update_many({"user_id": user_id}, {"$set": {"user_name": user_name}})
+    except Exception as e:
+        logger.error(f"❌ Failed to rename user {user_id} in admin summaries: {e}")
+
+
+async def rebuild_admin_summaries(db) -> None:
+    """Backfill summary rows from existing interviews (one-off, server-side $merge)."""
+    await db["interviews"].aggregate([
+        {"$lookup": {
+            "from": "users",
+            "localField": "user_id",
+            "foreignField": "client_id",
+            "as": "user"
+        }},
+        {"$unwind": {"path": "$user", "preserveNullAndEmptyArrays": True}},
+        {"$project": {
+            "interview_id": {"$toString": "$_id"},
+            "user_id": 1,
+            "user_name": "$user.Name",
+            "status": 1,
+            "summary": {"$ifNull": [
+                "$analysis_summary.candidate_feedback",
+                {"$ifNull": [
+                    "$feedback.candidate_feedback",
+                    {"$arrayElemAt": ["$ai_feedback.feedback", -1]}
+                ]}
+            ]},
+            # Interviews from before created_at was stored are dated by their _id
+            "created_at": {"$ifNull": ["$created_at", {"$toDate": "$_id"}]},
+            "updated_at": {"$ifNull": ["$updated_at", {"$ifNull": ["$created_at", {"$toDate": "$_id"}]}]}
+        }},
+        {"$merge": {"into": ADMIN_SUMMARIES, "on": "_id", "whenMatched": "keepExisting"}}
+    ]).to_list(length=None)
+    logger.info("✅ Admin interview summaries rebuilt.")
+
+
+async def ensure_admin_summaries(db) -> None:
+    if await db[ADMIN_SUMMARIES].estimated_document_count() == 0 and \
+            await db["interviews"].estimated_document_count() > 0:
+        await rebuild_admin_summaries(db)
+
+
+async def list_admin_summaries(
+    db,
+    status: Optional[str] = None,
+    user_id: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Newest interviews first, keyset-paginated on (created_at, _id). Rows are
+    updated while an admin pages through them, so the immutable creation
+    time is used: an update never moves a row across a page boundary.
+    """
+    query = {}
+    if status:
+        query["status"] = status
+    if user_id:
+        query["user_id"] = user_id
+    if cursor:
+        query.update(keyset_filter("created_at", cursor))
+
+    projection = {"interview_id": 1, "user_name": 1, "status": 1, "score": 1, "summary": 1, "created_at": 1}
+    docs = await db[ADMIN_SUMMARIES].find(query, projection) \
+        .sort([("created_at", -1), ("_id", -1)]) \
+        .limit(limit + 1) \
+        .to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1].get("created_at"), docs[-1]["_id"])
+
+    rows = [{
+        "interview_id": doc.get("interview_id", str(doc["_id"])),
+        "user_name": doc.get("user_name"),
+        "status": doc.get("status"),
+        "score": doc.get("score"),
+        "summary": doc.get("summary")
+    } for doc in docs]
+    return rows, next_cursor
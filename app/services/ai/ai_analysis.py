@@ -1,16 +1,17 @@
 import asyncio
-from typing import Dict, Any, List
-from collections import Counter
-from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any, List, Union
+from fastapi import HTTPException
 from .facial_analysis import analyze_facial_expression
 from .speech_analysis import extract_audio_from_video
 from app.services.ai.speech_analysis import analyze_speech
+from .timeline import EmotionTimeline, as_timeline, summarize_timeline
+from app.services.executors import executors, STT
 import logging
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
-async def analyze_video_audio(video_path: str, audio_path: str) -> Dict[str, Any]:
+async def analyze_video_audio(video_path: str, audio_path: str, include_timeline: bool = False) -> Dict[str, Any]:
     try:
         logger.info(f"🔍 Starting combined analysis for video: {video_path} and audio: {audio_path}")
         
@@ -26,20 +27,21 @@ async def analyze_video_audio(video_path: str, audio_path: str) -> Dict[str, Any
         else:
             logger.info("✅ Facial analysis completed successfully.")
         
-        # Speech analysis (run blocking function in threadpool)
+        # Speech analysis (speech recognition is network bound, so it has its own pool)
         logger.info("🎙️ Analyzing speech from audio...")
-        speech_result = await run_in_threadpool(analyze_speech, audio_path)
+        speech_result = await executors.run(STT, analyze_speech, audio_path)
         if speech_result.get("status") == "error":
             logger.warning(f"❌ Speech analysis failed for {audio_path}: {speech_result.get('message')}")
         else:
             logger.info("✅ Speech analysis completed successfully.")
 
         # Summarize emotions if available
-        facial_summary = summarize_emotions(facial_result["data"]) if facial_result.get("data") else {}
+        timeline = facial_result.get("timeline")
+        facial_summary = summarize_emotions(timeline) if timeline is not None and len(timeline) else {}
         
         logger.info("🔍 Combining results and preparing the final output.")
 
-        return {
+        result = {
             "status": "success",
             "message": "Combined video and audio analysis completed.",
             "data": {
@@ -48,7 +50,14 @@ async def analyze_video_audio(video_path: str, audio_path: str) -> Dict[str, Any
                 "speech_analysis": speech_result.get("data", {})
             }
         }
+        # Columnar timeline for callers that persist or re-slice it (not JSON serializable)
+        if include_timeline:
+            result["timeline"] = timeline
+        return result
 
+    except HTTPException:
+        # Pool saturation is surfaced to the client as a 503 rather than an error payload
+        raise
     except Exception as e:
         logger.error(f"❌ Error during combined video and audio analysis: {str(e)}", exc_info=True)
         return {
@@ -57,32 +66,9 @@ async def analyze_video_audio(video_path: str, audio_path: str) -> Dict[str, Any
             "data": None
         }
 
-def summarize_emotions(framewise_data: List[Dict]) -> Dict:
-    if not framewise_data:
+def summarize_emotions(framewise_data: Union[EmotionTimeline, List[Dict]]) -> Dict:
+    if framewise_data is None or not len(framewise_data):
         return {"message": "No emotions detected in frames."}
-    
-    all_emotions = [f["dominant_emotion"] for f in framewise_data if f["dominant_emotion"] != "error"]
-    
-    if not all_emotions:
-        return {"message": "No valid emotions detected."}
-    
-    # Count occurrences of each emotion
-    emotion_counts = dict(Counter(all_emotions))
-    total_frames = len(all_emotions)
-    
-    # Calculate percentage for each emotion
-    emotion_percentage = {emotion: (count / total_frames) * 100 for emotion, count in emotion_counts.items()}
-    
-    # Get top 3 most common emotions
-    most_common = Counter(all_emotions).most_common(3)
-
-    # Adding timestamp data
-    emotion_timestamps = {emotion: [f["time"] for f in framewise_data if f["dominant_emotion"] == emotion] 
-                          for emotion in emotion_counts}
 
-    return {
-        "dominant_emotions": emotion_counts,
-        "emotion_percentage": emotion_percentage,  # Percentage breakdown of each emotion
-        "top_3": most_common,
-        "emotion_timestamps": emotion_timestamps  # Emotions over time
-    }
+    # Counts, percentages, top-3, timestamps and rolling stats in one vectorized pass
+    return summarize_timeline(as_timeline(framewise_data))
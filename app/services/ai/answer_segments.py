@@ -0,0 +1,122 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from bson import Binary
+from fastapi import HTTPException
+from pymongo import ReplaceOne
+from .timeline import EmotionTimeline, TIMELINE_FORMAT, encode_timeline, summarize_segments
+
+logger = logging.getLogger(__name__)
+
+# One document per (interview_id, question_index), where question_index is the
+# question's position in the interview; see app/indexes.py
+ANSWER_ANALYSIS = "interview_answer_analysis"
+
+
+def segment_clarity(times: np.ndarray, rms: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> List[Optional[float]]:
+    """
+    Per-segment clarity with the same SNR formula as `calculate_speech_clarity`,
+    from prefix sums over one RMS envelope. None where a segment has no audio.
+    """
+    rms = np.asarray(rms, dtype=np.float64)
+    lo = np.searchsorted(times, starts, side="left")
+    hi = np.searchsorted(times, ends, side="left")
+    sums = np.concatenate(([0.0], np.cumsum(rms)))
+    square_sums = np.concatenate(([0.0], np.cumsum(rms ** 2)))
+
+    counts = hi - lo
+    safe = np.maximum(counts, 1)
+    mean = (sums[hi] - sums[lo]) / safe
+    mean_square = (square_sums[hi] - square_sums[lo]) / safe
+    variance = np.maximum(mean_square - mean ** 2, 0.0)
+    with np.errstate(divide="ignore"):
+        snr = 10 * np.log10(mean_square / (variance + 1e-10))
+    clarity = np.clip(snr / 10, 0, 10)
+    return [round(float(c), 2) if n else None for c, n in zip(clarity, counts)]
+
+
+def question_positions(interview: Dict[str, Any], segments: Sequence[Dict[str, Any]]) -> List[int]:
+    """
+    The interview position each segment answers. Segments naming their
+    question may arrive out of order or skip some; the others answer the
+    question at their own position. Unknown or repeated questions are a 400.
+    """
+    question_ids = interview.get("question_ids") or []
+    position_of = {str(qid): pos for pos, qid in enumerate(question_ids)}
+
+    positions = []
+    for i, segment in enumerate(segments):
+        if segment.get("question_id"):
+            pos = position_of.get(str(segment["question_id"]))
+            if pos is None:
+                raise HTTPException(status_code=400, detail=f"Unknown question_id in segment {i}: {segment['question_id']}")
+        else:
+            pos = i
+        if pos in positions:
+            raise HTTPException(status_code=400, detail=f"Segment {i} answers question {pos} again")
+        positions.append(pos)
+    return positions
+
+
+def build_answer_analyses(
+    user_id: str,
+    interview: Dict[str, Any],
+    segments: Sequence[Dict[str, Any]],
+    timeline: Optional[EmotionTimeline] = None,
+    envelope: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> List[Dict[str, Any]]:
+    """One analysis document per answered question, each with its own timeline slice."""
+    starts = np.array([s["start"] for s in segments], dtype=np.float64)
+    ends = np.array([s["end"] for s in segments], dtype=np.float64)
+    facial = summarize_segments(timeline, starts, ends) if timeline is not None else [None] * len(segments)
+    clarity = segment_clarity(*envelope, starts, ends) if envelope is not None else [None] * len(segments)
+
+    questions = interview.get("questions") or []
+    question_ids = interview.get("question_ids") or []
+    interview_id = str(interview["_id"])
+    now = datetime.utcnow()
+
+    docs = []
+    for i, pos in enumerate(question_positions(interview, segments)):
+        doc = {
+            "interview_id": interview_id,
+            "user_id": user_id,
+            "question_index": pos,
+            "question_id": str(question_ids[pos]) if pos < len(question_ids) else None,
+            "question": questions[pos] if pos < len(questions) else None,
+            "start": float(starts[i]),
+            "end": float(ends[i]),
+            "speech": {"clarity": clarity[i], "duration": round(float(ends[i] - starts[i]), 2)},
+            "created_at": now
+        }
+        if facial[i] is not None:
+            lo, hi = facial[i].pop("frame_range")
+            doc["facial_summary"] = facial[i]
+            doc["facial_timeline"] = Binary(encode_timeline(timeline.slice(lo, hi)))
+            doc["facial_timeline_format"] = TIMELINE_FORMAT
+        docs.append(doc)
+    return docs
+
+
+async def save_answer_analyses(db, interview_id: str, docs: List[Dict[str, Any]]) -> int:
+    """Replace the per-question analyses of an interview; questions this run did not cover are removed."""
+    operations = [
+        ReplaceOne({"interview_id": interview_id, "question_index": doc["question_index"]}, doc, upsert=True)
+        for doc in docs
+    ]
+    if operations:
+        await db[ANSWER_ANALYSIS].bulk_write(operations, ordered=False)
+    await db[ANSWER_ANALYSIS].delete_many({
+        "interview_id": interview_id, "question_index": {"$nin": [doc["question_index"] for doc in docs]}
+    })
+    logger.info(f"✅ Saved {len(docs)} per-question analyses for interview_id: {interview_id}")
+    return len(docs)
+
+
+def public_answer_analysis(doc: Dict[str, Any]) -> Dict[str, Any]:
+    if "_id" in doc:
+        doc["id"] = str(doc.pop("_id"))
+    doc.pop("facial_timeline", None)
+    doc.pop("facial_timeline_format", None)
+    return doc
@@ -1,19 +1,25 @@
-import os
 import cv2
+import struct
 import logging
-import tempfile
-from fastapi import UploadFile
+import numpy as np
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, UploadFile
 from deepface import DeepFace
+from deepface.modules import preprocessing
 from collections import Counter
-from typing import Dict, Any
-from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any, List, Optional, Tuple
+from app.config import settings
+from app.services.executors import executors, VIDEO
+from .batching import MicroBatcher
+from .timeline import EmotionTimeline, EMOTION_LABELS, EMOTION_CODES, ERROR_CODE
 
 logger = logging.getLogger(__name__)
 
 # --------------------------------------------
 # Frame-by-Frame Facial Emotion Extraction
 # --------------------------------------------
-def extract_framewise_emotions(video_path: str, seconds_between_frames: int = 1):  # 1 second interval
+def extract_emotion_timeline(video_path: str, seconds_between_frames: int = 1) -> EmotionTimeline:  # 1 second interval
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
         raise ValueError("Failed to open video file.")
@@ -21,8 +27,8 @@ def extract_framewise_emotions(video_path: str, seconds_between_frames: int = 1)
     fps = int(cap.get(cv2.CAP_PROP_FPS))
     frame_interval = max(1, fps * seconds_between_frames)
     frame_count = 0
-    framewise_results = []
-    all_emotions = []
+    times, codes, scores = [], [], []
+    error_scores = [0.0] * len(EMOTION_LABELS)
 
     while cap.isOpened():
         ret, frame = cap.read()
@@ -30,27 +36,25 @@ def extract_framewise_emotions(video_path: str, seconds_between_frames: int = 1)
             break
 
         if frame_count % frame_interval == 0:
+            times.append(round(frame_count / fps, 2))
             try:
                 analysis = DeepFace.analyze(frame, actions=["emotion"], enforce_detection=False)
-                dominant_emotion = analysis[0]["dominant_emotion"]
-                all_emotions.append(dominant_emotion)
-                framewise_results.append({
-                    "time": round(frame_count / fps, 2),
-                    "dominant_emotion": dominant_emotion,
-                    "emotion_scores": analysis[0]["emotion"]
-                })
+                emotion_scores = analysis[0]["emotion"]
+                codes.append(EMOTION_CODES.get(analysis[0]["dominant_emotion"], ERROR_CODE))
+                scores.append([emotion_scores.get(label, 0.0) for label in EMOTION_LABELS])
             except Exception as e:
                 logger.error(f"[ERROR] Frame {frame_count}: {str(e)}")
-                framewise_results.append({
-                    "time": round(frame_count / fps, 2),
-                    "dominant_emotion": "error",  # indicate error in processing
-                    "emotion_scores": {}
-                })
+                codes.append(ERROR_CODE)  # indicate error in processing
+                scores.append(error_scores)
 
         frame_count += 1
 
     cap.release()
-    return framewise_results
+    return EmotionTimeline.from_columns(times, codes, scores)
+
+
+def extract_framewise_emotions(video_path: str, seconds_between_frames: int = 1):
+    return extract_emotion_timeline(video_path, seconds_between_frames).to_records()
 
 
 # -------------------------------------------------
@@ -58,45 +62,169 @@ def extract_framewise_emotions(video_path: str, seconds_between_frames: int = 1)
 # -------------------------------------------------
 async def analyze_facial_expression(video_path: str) -> Dict[str, Any]:
     try:
-        # Running the emotion extraction in a thread pool to avoid blocking the event loop
-        analysis_result = await run_in_threadpool(extract_framewise_emotions, video_path)
+        # Running the emotion extraction on the video pool to avoid blocking the event loop
+        timeline = await executors.run(VIDEO, extract_emotion_timeline, video_path)
         return {
             "status": "success",
             "message": "Facial expression analysis completed.",
-            "data": analysis_result
+            "data": timeline.to_records(),
+            "timeline": timeline
         }
+    except HTTPException:
+        raise
     except Exception as e:
         return {
             "status": "error",
             "message": str(e),
-            "data": None
+            "data": None,
+            "timeline": None
         }
 
 
+# -------------------------------------------------
+# Batched Frame Inference
+# -------------------------------------------------
+# Faces are handed to the emotion model the way DeepFace.analyze does: BGR, padded to 224x224.
+# The model client does its own grayscale/48x48 preprocessing; see requirements.txt for the pinned version.
+ANALYZE_FACE_SIZE = (224, 224)
+
+
+@lru_cache(maxsize=1)
+def emotion_model():
+    """DeepFace's emotion client, loaded once per process."""
+    return DeepFace.build_model(task="facial_attribute", model_name="Emotion")
+
+
+def preprocess_face(image: np.ndarray) -> np.ndarray:
+    """Detect the first face in a BGR frame and prepare it as DeepFace.analyze does."""
+    faces = DeepFace.extract_faces(img_path=image, detector_backend="opencv", enforce_detection=False)
+    face = faces[0]["face"][:, :, ::-1]  # RGB -> BGR
+    return preprocessing.resize_image(img=face, target_size=ANALYZE_FACE_SIZE)[0]
+
+
+def analyze_frame_batch(images: List[Any]) -> List[Any]:
+    """
+    Emotion inference for a batch of frames: faces are detected per frame,
+    then stacked into a single model call. Detection failures are returned
+    per item; a failed model call fails the whole batch.
+    """
+    results: List[Any] = [None] * len(images)
+    inputs, positions = [], []
+    for i, image in enumerate(images):
+        try:
+            inputs.append(preprocess_face(image))
+            positions.append(i)
+        except Exception as e:
+            results[i] = e
+
+    if inputs:
+        # A single face comes back as one row of scores, a batch as one row per face
+        predictions = np.asarray(emotion_model().predict(inputs)).reshape(len(inputs), -1)
+        for i, row in zip(positions, predictions):
+            scores = 100 * row / max(float(row.sum()), 1e-12)
+            results[i] = {
+                "dominant_emotion": EMOTION_LABELS[int(np.argmax(scores))],
+                "emotion": {label: float(score) for label, score in zip(EMOTION_LABELS, scores)}
+            }
+    return results
+
+
+# Dedicated inference thread(s) so DeepFace never runs on the event loop
+frame_inference_executor = ThreadPoolExecutor(
+    max_workers=settings.FRAME_INFERENCE_WORKERS,
+    thread_name_prefix="frame-inference"
+)
+
+frame_batcher = MicroBatcher(
+    analyze_frame_batch,
+    max_batch_size=settings.FRAME_BATCH_MAX_SIZE,
+    max_wait_ms=settings.FRAME_BATCH_MAX_WAIT_MS,
+    executor=frame_inference_executor,
+    name="frame-batcher"
+)
+
+
+# -------------------------------------------------
+# In-Memory Frame Decoding
+# -------------------------------------------------
+# JPEG start-of-frame markers carrying the image dimensions
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+_REDUCED_COLOR_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def probe_image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Read (width, height) from a JPEG or PNG header without decoding pixels."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        width, height = struct.unpack(">II", data[16:24])
+        return width, height
+
+    if data[:2] == b"\xff\xd8":
+        i = 2
+        while i + 9 < len(data):
+            if data[i] != 0xFF:
+                i += 1
+                continue
+            marker = data[i + 1]
+            if marker in _JPEG_SOF_MARKERS:
+                height, width = struct.unpack(">HH", data[i + 5:i + 9])
+                return width, height
+            if marker == 0xFF or marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+                i += 1 if marker == 0xFF else 2
+                continue
+            segment_length = struct.unpack(">H", data[i + 2:i + 4])[0]
+            i += 2 + segment_length
+
+    return None
+
+
+def decode_frame_bytes(data: bytes, target_min_side: int = settings.FRAME_TARGET_MIN_SIDE) -> np.ndarray:
+    """
+    Decode an uploaded image into a BGR array, scaling it down during decode
+    while its shorter side stays at or above `target_min_side`.
+    """
+    if not data:
+        raise ValueError("Empty frame received.")
+
+    flag = cv2.IMREAD_COLOR
+    size = probe_image_size(data)
+    if size and target_min_side > 0:
+        min_side = min(size)
+        for factor, reduced_flag in _REDUCED_COLOR_FLAGS:
+            if min_side // factor >= target_min_side:
+                flag = reduced_flag
+                break
+
+    frame = cv2.imdecode(np.frombuffer(data, np.uint8), flag)
+    if frame is None:
+        raise ValueError("Invalid image frame received.")
+    return frame
+
+
 # -------------------------------------------------
 # Frame Facial Emotion Analysis (single image frame)
 # -------------------------------------------------
-async def analyze_facial_expression_frame(file: UploadFile) -> Dict[str, Any]:
-    try:
-        # Save frame temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-            tmp.write(await file.read())
-            temp_path = tmp.name
+async def analyze_frame_array(frame: np.ndarray) -> Dict[str, Any]:
+    # Batched with frames from concurrent requests and inferred off the event loop
+    emotion_data = await frame_batcher.submit(frame)
+    return {
+        "dominant_emotion": emotion_data["dominant_emotion"],
+        "emotion_scores": emotion_data["emotion"]
+    }
 
-        # Ensure the file is a valid image (add further checks for file type/size if needed)
-        analysis = DeepFace.analyze(img_path=temp_path, actions=["emotion"], enforce_detection=False)
-        emotion_data = analysis[0]
 
-        # Clean up the temporary file
-        os.remove(temp_path)
+async def analyze_facial_expression_frame(file: UploadFile) -> Dict[str, Any]:
+    try:
+        frame = decode_frame_bytes(await file.read())
 
         return {
             "status": "success",
             "message": "Frame emotion analysis completed.",
-            "data": {
-                "dominant_emotion": emotion_data["dominant_emotion"],
-                "emotion_scores": emotion_data["emotion"]
-            }
+            "data": await analyze_frame_array(frame)
         }
 
     except Exception as e:
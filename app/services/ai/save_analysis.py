@@ -1,7 +1,14 @@
+import asyncio
+import time
 from datetime import datetime
-from bson import ObjectId
+from bson import ObjectId, Binary
 import logging
 from typing import Dict, Any, Optional, List
+from app.database import supports_transactions
+from app.services.admin_summaries import upsert_interview_summary
+from .timeline import (
+    EmotionTimeline, TIMELINE_FORMAT, as_timeline, encode_timeline, decode_timeline, summarize_timeline
+)
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -99,12 +106,139 @@ def generate_ai_suggestions(
     logger.info(f"Generated AI suggestions: {suggestions}")
     return suggestions
 
+def compact_facial_summary(facial_summary: Dict[str, Any]) -> Dict[str, Any]:
+    # Per-emotion timestamps are derivable from the stored timeline
+    return {k: v for k, v in facial_summary.items() if k != "emotion_timestamps"}
+
+
+def expand_interview_analysis(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode the compact facial timeline of an `interview_analysis` document in place."""
+    encoded = doc.pop("facial_timeline", None)
+    timeline_format = doc.pop("facial_timeline_format", None)
+    if encoded is not None and timeline_format == TIMELINE_FORMAT:
+        timeline = decode_timeline(encoded)
+        doc["facial_analysis"] = timeline.to_records()
+        if isinstance(doc.get("facial_summary"), dict):
+            doc["facial_summary"] = summarize_timeline(timeline)
+    return doc
+
+
+# -------------------------------------------------
+# Analysis Persistence
+# -------------------------------------------------
+class WriteMetrics:
+    """Latency of analysis writes, reported on /health/metrics."""
+
+    def __init__(self):
+        self.count = 0
+        self.transactional = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float, transactional: bool) -> None:
+        self.count += 1
+        self.transactional += int(transactional)
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "writes": self.count,
+            "transactional": self.transactional,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2)
+        }
+
+
+analysis_write_metrics = WriteMetrics()
+
+
+def analysis_summary(feedback_payload: Dict[str, Any], speech_score: Optional[float] = None) -> Dict[str, Any]:
+    """The few fields list and detail views need; the full payload stays in interview_analysis."""
+    top_3 = feedback_payload.get("facial_summary", {}).get("top_3") or []
+    return {
+        "candidate_feedback": feedback_payload.get("candidate_feedback"),
+        "dominant_emotion": top_3[0][0] if top_3 and isinstance(top_3[0], (list, tuple)) else None,
+        "speech_score": speech_score,
+        "overall_sentiment": feedback_payload.get("speech_summary", {}).get("overall_sentiment"),
+        "analyzed_at": feedback_payload.get("timestamp")
+    }
+
+
+def interview_analysis_update(analysis_id: ObjectId, summary: Dict[str, Any], now: datetime) -> List[Dict[str, Any]]:
+    """
+    Point the interview at its latest analysis. Re-analysis overwrites the
+    reference instead of growing the document: "analyzed" is only appended to
+    the status history on the first analysis, and the legacy embedded
+    feedback payload is dropped.
+    """
+    return [
+        {"$set": {"status_history": {"$cond": [
+            {"$eq": ["$status", "analyzed"]},
+            "$status_history",
+            {"$concatArrays": [{"$ifNull": ["$status_history", []]}, ["analyzed"]]}
+        ]}}},
+        {"$set": {
+            "status": "analyzed",
+            "analysis_id": analysis_id,
+            "analysis_summary": {"$literal": summary},
+            "updated_at": now
+        }},
+        {"$unset": "feedback"}
+    ]
+
+
+async def write_analysis(
+    db,
+    analysis_doc: Dict[str, Any],
+    interview_filter: Dict[str, Any],
+    interview_update: List[Dict[str, Any]],
+    admin_fields: Dict[str, Any]
+) -> int:
+    """
+    Insert the analysis, update the interview and its admin summary. Runs as
+    one transaction on replica sets. Standalone servers insert the analysis
+    first, so the interview never points at a missing document, then issue
+    the two updates concurrently. Returns how many interviews matched.
+    """
+    interview_id = interview_filter["_id"]
+
+    async def writes(session=None):
+        await db["interview_analysis"].insert_one(analysis_doc, session=session)
+        result = await db["interviews"].update_one(interview_filter, interview_update, session=session)
+        await upsert_interview_summary(db, interview_id, session=session, **admin_fields)
+        return result.matched_count
+
+    started = time.perf_counter()
+    transactional = supports_transactions(db.client)
+    if transactional:
+        async with await db.client.start_session() as session:
+            matched = await session.with_transaction(writes)
+    else:
+        await db["interview_analysis"].insert_one(analysis_doc)
+        result, _ = await asyncio.gather(
+            db["interviews"].update_one(interview_filter, interview_update),
+            upsert_interview_summary(db, interview_id, **admin_fields)
+        )
+        matched = result.matched_count
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    analysis_write_metrics.record(elapsed_ms, transactional)
+    logger.info(
+        f"💾 Analysis writes for interview_id: {interview_id} took {elapsed_ms:.1f} ms"
+        + (" (transaction)" if transactional else "")
+    )
+    return matched
+
+
 async def save_interview_analysis_to_db(
     db,
     user_id: str,
     interview_id: str,
-    facial_result: dict,
-    speech_result: Optional[dict] = None
+    facial_result: Any,
+    speech_result: Optional[dict] = None,
+    facial_timeline: Optional[EmotionTimeline] = None,
+    facial_summary: Optional[Dict[str, Any]] = None
 ) -> Optional[Dict[str, Any]]:
     try:
         # Validate inputs
@@ -114,14 +248,21 @@ async def save_interview_analysis_to_db(
         if not isinstance(user_id, str) or not user_id.strip():
             raise ValueError("Invalid user_id")
         
-        # Use the facial_result directly
-        facial_summary = {}
-        if isinstance(facial_result, dict):
-            summary_candidate = facial_result.get("summary", facial_result)
-            if isinstance(summary_candidate, dict):
-                facial_summary = summary_candidate
-            else:
-                logger.warning("⚠️ facial_result['summary'] is not a dict — skipping")
+        # Framewise results are stored as a compact binary timeline
+        if facial_timeline is None and isinstance(facial_result, list):
+            facial_timeline = as_timeline(facial_result)
+
+        if facial_summary is None:
+            facial_summary = {}
+            if facial_timeline is not None and len(facial_timeline):
+                facial_summary = summarize_timeline(facial_timeline)
+            elif isinstance(facial_result, dict):
+                summary_candidate = facial_result.get("summary", facial_result)
+                if isinstance(summary_candidate, dict):
+                    facial_summary = summary_candidate
+                else:
+                    logger.warning("⚠️ facial_result['summary'] is not a dict — skipping")
+        facial_summary = compact_facial_summary(facial_summary)
 
         # Extract speech summary safely
         speech_summary = {}
@@ -154,40 +295,43 @@ async def save_interview_analysis_to_db(
             "facial_summary": facial_summary,
             "speech_summary": speech_summary,
             "suggestions": generate_ai_suggestions(facial_summary, speech_summary),
-            "candidate_feedback": generate_candidate_feedback(facial_result, speech_result),
+            "candidate_feedback": generate_candidate_feedback(facial_summary, speech_result),
             "timestamp": datetime.utcnow()
         }
 
         logger.info(f"Saving interview analysis for interview_id: {interview_id} to DB.")
-        # Save full analysis to separate collection
-        await db["interview_analysis"].insert_one({
+        # Full analysis lives in its own collection; _id is assigned here so the
+        # interview can reference it in the same round of writes
+        now = datetime.utcnow()
+        analysis_id = ObjectId()
+        analysis_doc = {
+            "_id": analysis_id,
             "user_id": user_id,
             "interview_id": interview_id,
-            "facial_analysis": facial_result,  # Save facial_result directly
             "facial_summary": facial_summary,
             "speech_analysis": speech_result,
             "ai_feedback": feedback_payload,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        })
-
-        # Update the main interview document
-        update_result = await db["interviews"].update_one(
-            {"_id": interview_id, "user_id": user_id},
-            {
-                "$set": {
-                    "status": "analyzed",
-                    "feedback": feedback_payload,
-                    "updated_at": datetime.utcnow()
-                },
-                "$push": {
-                    "status_history": "analyzed"
-                }
-            }
+            "created_at": now,
+            "updated_at": now
+        }
+        if facial_timeline is not None:
+            analysis_doc["facial_timeline"] = Binary(encode_timeline(facial_timeline))
+            analysis_doc["facial_timeline_format"] = TIMELINE_FORMAT
+        elif facial_result is not None:
+            analysis_doc["facial_analysis"] = facial_result
+
+        speech_score = speech_result.get("speech_score") if isinstance(speech_result, dict) else None
+        summary = analysis_summary(feedback_payload, speech_score)
+        matched = await write_analysis(
+            db, analysis_doc,
+            interview_filter={"_id": ObjectId(interview_id), "user_id": user_id},
+            interview_update=interview_analysis_update(analysis_id, summary, now),
+            admin_fields={"summary": summary["candidate_feedback"], "status": "analyzed",
+                          **({"score": speech_score} if speech_score is not None else {})}
         )
 
         # Check for modifications
-        if update_result.modified_count == 0:
+        if matched == 0:
             logger.warning(f"⚠️ No interview updated for interview_id: {interview_id}")
 
         logger.info(f"✅ Saved AI analysis for interview_id: {interview_id}")
@@ -62,6 +62,13 @@ def calculate_speech_clarity(audio_path: str) -> float:
         logger.error(f"❌ Error calculating speech clarity: {e}")
         return 0.0  # Default to 0 if calculation fails
 
+def rms_envelope(audio_path: str, hop_length: int = 512):
+    """RMS energy per hop and its start time in seconds; computed once and sliced per question."""
+    y, sr_librosa = librosa.load(audio_path, sr=None)
+    rms = librosa.feature.rms(y=y, hop_length=hop_length)[0]
+    times = librosa.frames_to_time(np.arange(len(rms)), sr=sr_librosa, hop_length=hop_length)
+    return times, rms
+
 def calculate_speech_rate(transcript: str, audio_duration: float) -> float:
     """Calculate the speech rate as words per second."""
     try:
@@ -0,0 +1,346 @@
+import struct
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence
+
+# DeepFace emotion labels, in the order used for score columns and emotion codes
+EMOTION_LABELS = ("angry", "disgust", "fear", "happy", "sad", "surprise", "neutral")
+EMOTION_CODES = {label: code for code, label in enumerate(EMOTION_LABELS)}
+ERROR_CODE = -1
+
+# Compact binary timeline encoding:
+#   header  <4s magic, B version, B label count, H reserved, I frame count>
+#   body    uint32 times (ms) | int8 codes | uint8 scores quantized from 0-100 to 0-255
+TIMELINE_FORMAT = "emt1"
+TIMELINE_MAGIC = b"EMT1"
+TIMELINE_VERSION = 1
+_TIMELINE_HEADER = struct.Struct("<4sBBHI")
+_SCORE_SCALE = 255 / 100
+
+# Default rolling window (in sampled frames) for summary statistics
+ROLLING_WINDOW_FRAMES = 5
+
+
+# -------------------------------------------------
+# Columnar Framewise Emotion Timeline
+# -------------------------------------------------
+class EmotionTimeline:
+    """
+    Framewise emotion results kept as columns: `times` (float64 seconds),
+    `codes` (int8 index into EMOTION_LABELS, ERROR_CODE for failed frames)
+    and `scores` (float32 matrix, one column per label).
+    """
+
+    __slots__ = ("times", "codes", "scores")
+
+    def __init__(self, times: np.ndarray, codes: np.ndarray, scores: np.ndarray):
+        self.times = np.asarray(times, dtype=np.float64)
+        self.codes = np.asarray(codes, dtype=np.int8)
+        self.scores = np.asarray(scores, dtype=np.float32).reshape(-1, len(EMOTION_LABELS))
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def slice(self, start: int, stop: int) -> "EmotionTimeline":
+        return EmotionTimeline(self.times[start:stop], self.codes[start:stop], self.scores[start:stop])
+
+    @classmethod
+    def from_columns(cls, times: Sequence[float], codes: Sequence[int], scores: Sequence[Sequence[float]]):
+        return cls(
+            np.array(times, dtype=np.float64),
+            np.array(codes, dtype=np.int8),
+            np.array(scores, dtype=np.float32).reshape(-1, len(EMOTION_LABELS))
+        )
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "EmotionTimeline":
+        """Build a timeline from the legacy list-of-dicts framewise format."""
+        times, codes, scores = [], [], []
+        for record in records:
+            times.append(record.get("time", 0.0))
+            codes.append(EMOTION_CODES.get(record.get("dominant_emotion"), ERROR_CODE))
+            record_scores = record.get("emotion_scores") or {}
+            scores.append([record_scores.get(label, 0.0) for label in EMOTION_LABELS])
+        return cls.from_columns(times, codes, scores)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Expand back into the list-of-dicts format returned by the API."""
+        records = []
+        for time, code, row in zip(self.times.tolist(), self.codes.tolist(), self.scores.tolist()):
+            if code == ERROR_CODE:
+                records.append({"time": time, "dominant_emotion": "error", "emotion_scores": {}})
+            else:
+                records.append({
+                    "time": time,
+                    "dominant_emotion": EMOTION_LABELS[code],
+                    "emotion_scores": dict(zip(EMOTION_LABELS, row))
+                })
+        return records
+
+
+# -------------------------------------------------
+# Compact Binary Encoding
+# -------------------------------------------------
+def encode_timeline(timeline: EmotionTimeline) -> bytes:
+    """Pack a timeline into ~12 bytes per frame for storage."""
+    count = len(timeline)
+    header = _TIMELINE_HEADER.pack(TIMELINE_MAGIC, TIMELINE_VERSION, len(EMOTION_LABELS), 0, count)
+    times_ms = np.rint(timeline.times * 1000).clip(0, np.iinfo(np.uint32).max).astype("<u4")
+    scores = np.rint(timeline.scores * _SCORE_SCALE).clip(0, 255).astype(np.uint8)
+    return b"".join((header, times_ms.tobytes(), timeline.codes.astype(np.int8).tobytes(), scores.tobytes()))
+
+
+def decode_timeline(data: bytes) -> EmotionTimeline:
+    """Inverse of `encode_timeline`; scores come back with ~0.2 point precision."""
+    data = bytes(data)
+    if len(data) < _TIMELINE_HEADER.size:
+        raise ValueError("Timeline payload is truncated.")
+
+    magic, version, label_count, _, count = _TIMELINE_HEADER.unpack_from(data)
+    if magic != TIMELINE_MAGIC or version != TIMELINE_VERSION:
+        raise ValueError("Unsupported timeline encoding.")
+    if label_count != len(EMOTION_LABELS):
+        raise ValueError(f"Timeline has {label_count} emotion columns, expected {len(EMOTION_LABELS)}.")
+
+    offset = _TIMELINE_HEADER.size
+    expected = offset + count * (4 + 1 + label_count)
+    if len(data) != expected:
+        raise ValueError("Timeline payload length does not match its header.")
+
+    times = np.frombuffer(data, dtype="<u4", count=count, offset=offset) / 1000
+    offset += count * 4
+    codes = np.frombuffer(data, dtype=np.int8, count=count, offset=offset)
+    offset += count
+    scores = np.frombuffer(data, dtype=np.uint8, count=count * label_count, offset=offset)
+    scores = (scores.astype(np.float32) / _SCORE_SCALE).reshape(count, label_count)
+    return EmotionTimeline(times, codes.copy(), scores)
+
+
+# -------------------------------------------------
+# Vectorized Emotion Summary
+# -------------------------------------------------
+def summarize_timeline(timeline: EmotionTimeline, rolling_window: int = ROLLING_WINDOW_FRAMES) -> Dict[str, Any]:
+    if not len(timeline):
+        return {"message": "No emotions detected in frames."}
+
+    valid = timeline.codes != ERROR_CODE
+    codes = timeline.codes[valid].astype(np.intp)
+    if not len(codes):
+        return {"message": "No valid emotions detected."}
+
+    times = timeline.times[valid]
+    scores = timeline.scores[valid]
+    total_frames = len(codes)
+
+    counts = np.bincount(codes, minlength=len(EMOTION_LABELS))
+
+    # Detected emotions in order of first appearance (matches Counter ordering)
+    present, first_index = np.unique(codes, return_index=True)
+    present = present[np.argsort(first_index)]
+
+    emotion_counts = {EMOTION_LABELS[c]: int(counts[c]) for c in present}
+    emotion_percentage = {EMOTION_LABELS[c]: int(counts[c]) / total_frames * 100 for c in present}
+
+    top = present[np.argsort(-counts[present], kind="stable")][:3]
+    most_common = [(EMOTION_LABELS[c], int(counts[c])) for c in top]
+
+    # Group timestamps per emotion with one stable sort instead of a scan per emotion
+    grouped_times = np.split(times[np.argsort(codes, kind="stable")], np.cumsum(counts)[:-1])
+    emotion_timestamps = {EMOTION_LABELS[c]: grouped_times[c].tolist() for c in present}
+
+    return {
+        "dominant_emotions": emotion_counts,
+        "emotion_percentage": emotion_percentage,
+        "top_3": most_common,
+        "emotion_timestamps": emotion_timestamps,
+        "emotion_changes": int(np.count_nonzero(codes[1:] != codes[:-1])),
+        "rolling_window": rolling_window_stats(times, scores, rolling_window)
+    }
+
+
+def rolling_window_stats(times: np.ndarray, scores: np.ndarray, window: int) -> Dict[str, Any]:
+    """Peak rolling-mean score per emotion over `window` consecutive frames."""
+    window = max(1, min(window, len(times)))
+
+    cumulative = np.zeros((len(scores) + 1, scores.shape[1]), dtype=np.float64)
+    np.cumsum(scores, axis=0, out=cumulative[1:])
+    rolling_mean = (cumulative[window:] - cumulative[:-window]) / window
+
+    peak_index = rolling_mean.argmax(axis=0)
+    peak_score = rolling_mean[peak_index, np.arange(len(EMOTION_LABELS))]
+
+    return {
+        "frames": window,
+        "peak_mean_score": {label: round(float(score), 2) for label, score in zip(EMOTION_LABELS, peak_score)},
+        "peak_start_time": {label: float(times[i]) for label, i in zip(EMOTION_LABELS, peak_index)}
+    }
+
+
+# -------------------------------------------------
+# Per-question Segments
+# -------------------------------------------------
+def summarize_segments(timeline: EmotionTimeline, starts: np.ndarray, ends: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Summarize the frames in each [start, end) window (seconds) with one pass
+    over the timeline: prefix sums over the valid frames turn every
+    segment's counts, mean scores and emotion changes into two lookups.
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    lo = np.searchsorted(timeline.times, starts, side="left")
+    hi = np.searchsorted(timeline.times, ends, side="left")
+
+    valid_positions = np.flatnonzero(timeline.codes != ERROR_CODE)
+    codes = timeline.codes[valid_positions].astype(np.intp)
+    one_hot = np.zeros((len(codes), len(EMOTION_LABELS)), dtype=np.int64)
+    one_hot[np.arange(len(codes)), codes] = 1
+
+    count_sums = np.zeros((len(codes) + 1, len(EMOTION_LABELS)), dtype=np.int64)
+    np.cumsum(one_hot, axis=0, out=count_sums[1:])
+    score_sums = np.zeros((len(codes) + 1, len(EMOTION_LABELS)), dtype=np.float64)
+    np.cumsum(timeline.scores[valid_positions], axis=0, out=score_sums[1:])
+    change_sums = np.zeros(len(codes) + 1, dtype=np.int64)
+    if len(codes) > 1:
+        np.cumsum(codes[1:] != codes[:-1], out=change_sums[2:])
+
+    # Segment bounds in valid-frame space
+    first = np.searchsorted(valid_positions, lo)
+    last = np.searchsorted(valid_positions, hi)
+
+    segments = []
+    for i in range(len(starts)):
+        a, b = int(first[i]), int(last[i])
+        frames = b - a
+        segment = {
+            "start": float(starts[i]),
+            "end": float(ends[i]),
+            "frame_range": [int(lo[i]), int(hi[i])],
+            "frames": frames
+        }
+        if frames:
+            counts = count_sums[b] - count_sums[a]
+            means = (score_sums[b] - score_sums[a]) / frames
+            present = np.flatnonzero(counts)
+            segment.update({
+                "dominant_emotion": EMOTION_LABELS[int(counts.argmax())],
+                "emotion_percentage": {EMOTION_LABELS[c]: int(counts[c]) / frames * 100 for c in present},
+                "mean_scores": {label: round(float(score), 2) for label, score in zip(EMOTION_LABELS, means)},
+                "emotion_changes": int(change_sums[b] - change_sums[a + 1])
+            })
+        else:
+            segment.update({"dominant_emotion": None, "emotion_percentage": {}, "mean_scores": {}, "emotion_changes": 0})
+        segments.append(segment)
+    return segments
+
+
+# -------------------------------------------------
+# Downsampling for Charts
+# -------------------------------------------------
+def _chart_points(timeline: EmotionTimeline, index: np.ndarray) -> Dict[str, Any]:
+    codes = timeline.codes[index]
+    return {
+        "times": timeline.times[index].tolist(),
+        "dominant_emotion": [EMOTION_LABELS[c] if c != ERROR_CODE else None for c in codes.tolist()],
+        "scores": {label: np.round(timeline.scores[index, i], 2).tolist() for i, label in enumerate(EMOTION_LABELS)}
+    }
+
+
+def bucket_timeline(timeline: EmotionTimeline, buckets: int) -> Dict[str, Any]:
+    """
+    Split the timeline into `buckets` equal time spans and report each span's
+    dominant emotion, mean scores and frame count. Failed frames are left
+    out; spans without valid frames are dropped.
+    """
+    valid = timeline.codes != ERROR_CODE
+    times = timeline.times[valid]
+    codes = timeline.codes[valid].astype(np.intp)
+    scores = timeline.scores[valid].astype(np.float64)
+    label_count = len(EMOTION_LABELS)
+    if not len(times):
+        return {
+            "method": "mean", "times": [], "ends": [], "frames": [], "dominant_emotion": [],
+            "scores": {label: [] for label in EMOTION_LABELS}
+        }
+
+    start, end = float(timeline.times[0]), float(timeline.times[-1])
+    span = (end - start) / buckets or 1.0
+    bucket = np.minimum(((times - start) / span).astype(np.intp), buckets - 1)
+
+    frames = np.bincount(bucket, minlength=buckets)
+    counts = np.bincount(bucket * label_count + codes, minlength=buckets * label_count).reshape(buckets, label_count)
+    sums = np.stack(
+        [np.bincount(bucket, weights=scores[:, i], minlength=buckets) for i in range(label_count)], axis=1
+    )
+
+    present = np.flatnonzero(frames)
+    means = sums[present] / frames[present, None]
+    bucket_starts = start + present * span
+    return {
+        "method": "mean",
+        "times": np.round(bucket_starts, 3).tolist(),
+        "ends": np.round(np.minimum(bucket_starts + span, end), 3).tolist(),
+        "frames": frames[present].tolist(),
+        "dominant_emotion": [EMOTION_LABELS[c] for c in counts[present].argmax(axis=1).tolist()],
+        "scores": {label: np.round(means[:, i], 2).tolist() for i, label in enumerate(EMOTION_LABELS)}
+    }
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the shape of y(x)."""
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        # Too few points for a middle bucket: just the endpoints
+        return np.array([0, n - 1][:max(threshold, 0)], dtype=np.intp)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_lo, next_hi = hi, min(max(edges[i + 2] if i + 2 < len(edges) else n, hi + 1), n)
+        # Third vertex: the average of the next bucket
+        avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        area = np.abs(
+            (x[previous] - avg_x) * (y[lo:hi] - y[previous])
+            - (x[previous] - x[lo:hi]) * (avg_y - y[previous])
+        )
+        previous = lo + int(area.argmax())
+        selected[i + 1] = previous
+    return selected
+
+
+def downsample_timeline(
+    timeline: EmotionTimeline,
+    buckets: int,
+    method: str = "mean",
+    emotion: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Chart-sized version of a timeline. `mean` aggregates per time bucket;
+    `lttb` keeps `buckets` real frames chosen to preserve the shape of one
+    emotion's score (the most frequent emotion by default).
+    """
+    buckets = max(1, buckets)
+    if method == "mean":
+        result = bucket_timeline(timeline, buckets)
+    else:
+        valid = np.flatnonzero(timeline.codes != ERROR_CODE)
+        if emotion in EMOTION_CODES:
+            column = EMOTION_CODES[emotion]
+        elif len(valid):
+            column = int(np.bincount(timeline.codes[valid].astype(np.intp), minlength=len(EMOTION_LABELS)).argmax())
+        else:
+            column = EMOTION_CODES["neutral"]
+        index = valid[lttb_indices(timeline.times[valid], timeline.scores[valid, column], buckets)]
+        result = {"method": "lttb", "emotion": EMOTION_LABELS[column], **_chart_points(timeline, index)}
+
+    result.update({"source_frames": len(timeline), "points": len(result["times"])})
+    return result
+
+
+def as_timeline(framewise_data: Optional[Any]) -> EmotionTimeline:
+    if isinstance(framewise_data, EmotionTimeline):
+        return framewise_data
+    return EmotionTimeline.from_records(framewise_data or [])
@@ -0,0 +1,65 @@
+import logging
+from typing import Any, Dict, Optional
+from bson import ObjectId
+from app.config import settings
+from app.services.cache import TTLCache
+from .timeline import TIMELINE_FORMAT, as_timeline, decode_timeline, downsample_timeline
+
+logger = logging.getLogger(__name__)
+
+# Keyed by analysis id, so a re-analysis (new analysis document) never hits a stale entry
+chart_cache = TTLCache(
+    maxsize=settings.TIMELINE_CHART_CACHE_MAX_SIZE,
+    ttl=settings.TIMELINE_CHART_CACHE_TTL_SECONDS
+)
+
+
+async def latest_analysis_id(db, user_id: str, interview_id: str) -> Optional[ObjectId]:
+    """Resolve the interview's current analysis with small reads; None if missing or not the user's."""
+    interview = await db["interviews"].find_one(
+        {"_id": ObjectId(interview_id), "user_id": user_id}, {"analysis_id": 1}
+    )
+    if not interview:
+        return None
+    if interview.get("analysis_id"):
+        return interview["analysis_id"]
+
+    # Interviews analyzed before the reference was stored
+    latest = await db["interview_analysis"].find_one(
+        {"interview_id": interview_id, "user_id": user_id}, {"_id": 1}, sort=[("created_at", -1)]
+    )
+    return latest["_id"] if latest else None
+
+
+async def get_chart_timeline(
+    db,
+    user_id: str,
+    interview_id: str,
+    buckets: int,
+    method: str = "mean",
+    emotion: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    analysis_id = await latest_analysis_id(db, user_id, interview_id)
+    if analysis_id is None:
+        return None
+
+    key = (str(analysis_id), buckets, method, emotion)
+    chart = chart_cache.get(key)
+    if chart is not None:
+        return chart
+
+    doc = await db["interview_analysis"].find_one(
+        {"_id": analysis_id}, {"facial_timeline": 1, "facial_timeline_format": 1, "facial_analysis": 1}
+    )
+    if not doc:
+        return None
+    if doc.get("facial_timeline") is not None and doc.get("facial_timeline_format") == TIMELINE_FORMAT:
+        timeline = decode_timeline(doc["facial_timeline"])
+    else:
+        records = doc.get("facial_analysis")
+        timeline = as_timeline(records if isinstance(records, list) else [])
+
+    chart = {"interview_id": interview_id, "analysis_id": str(analysis_id),
+             **downsample_timeline(timeline, buckets, method, emotion)}
+    chart_cache.set(key, chart)
+    return chart
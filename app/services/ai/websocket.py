@@ -1,5 +1,3 @@
-import numpy as np
-import cv2
 import tempfile
 import os
 import logging
@@ -9,8 +7,9 @@ from datetime import datetime
 from bson import ObjectId
 
 from app.database import get_database
-from app.services.ai.ai_analysis import analyze_facial_expression
+from app.services.ai.facial_analysis import decode_frame_bytes, analyze_frame_array
 from app.services.ai.speech_analysis import analyze_speech
+from app.services.executors import executors, STT
 
 logger = logging.getLogger(__name__)
 
@@ -25,16 +24,12 @@ async def process_facial_expression(video_data, interview_id, user_id, websocket
     try:
         db = await get_database()
 
-        video_array = np.frombuffer(video_data, np.uint8)
-        frame = cv2.imdecode(video_array, cv2.IMREAD_COLOR)
-
-        if frame is None:
-            raise ValueError("Invalid video frame received.")
+        frame = decode_frame_bytes(video_data)
 
         logger.info(f"[FACIAL] Analyzing expression for user {user_id}")
 
-        emotion = await analyze_facial_expression(frame)
-        emotion_history.append(emotion)
+        emotion = await analyze_frame_array(frame)
+        emotion_history.append(emotion["dominant_emotion"])
         batch_counter += 1
 
         await db.facial_analysis.insert_one({
@@ -78,7 +73,7 @@ async def process_speech(audio_data, interview_id, user_id, websocket, session_i
 
         logger.info(f"[SPEECH] Analyzing speech for {user_id}...")
 
-        result = await analyze_speech(audio_path)
+        result = await executors.run(STT, analyze_speech, audio_path)
 
         sentiment_score = result.get("sentiment_score", 0.0)
         sentiment = result.get("sentiment", "unknown")
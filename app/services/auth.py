@@ -1,4 +1,3 @@
-import bcrypt
 import random
 import re
 import logging
@@ -6,10 +5,12 @@ from datetime import datetime, timedelta
 from jose import jwt, JWTError, ExpiredSignatureError
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
+from pymongo import ReturnDocument
 from app.schemas.enums import UserRole
 from app.config import settings
 from app.database import get_database
+from .cache import TTLCache
+from .passwords import bcrypt_hash, bcrypt_verify, password_hasher
 from .email import send_otp_email, send_admin_notification_email, send_welcome_email
 
 # Configuration
@@ -23,7 +24,10 @@ DEFAULT_EXPIRY = timedelta(hours=1)
 # Logger and security tools
 logger = logging.getLogger(__name__)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# client_id -> user projection; invalidated on profile/role changes in this worker
+USER_PROJECTION = {"_id": 0, "client_id": 1, "Name": 1, "email": 1, "role": 1}
+user_cache = TTLCache(maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
 
 
 def validate_registration_role(role: UserRole):
@@ -34,18 +38,33 @@ def validate_registration_role(role: UserRole):
         )
 
 
+def invalidate_user(client_id: str):
+    user_cache.pop(client_id)
+
+
+def token_claims_for(user: dict) -> dict:
+    """Claims embedded in access tokens; enough to rebuild the user when claims are trusted."""
+    return {"sub": user["client_id"], "role": user["role"], "name": user.get("Name"), "email": user.get("email")}
+
+
 async def get_user(client_id: str):
+    cached = user_cache.get(client_id)
+    if cached is not None:
+        return dict(cached)
+
     try:
         db = await get_database()
-        user = await db["users"].find_one({"client_id": client_id})
+        user = await db["users"].find_one({"client_id": client_id}, USER_PROJECTION)
 
         if user:
-            return {
+            user = {
                 "client_id": str(user["client_id"]),
                 "Name": user["Name"],
                 "email": user["email"],
                 "role": user["role"]
             }
+            user_cache.set(client_id, user)
+            return dict(user)
 
         logger.warning(f"⚠️ User not found: {client_id}")
         return None
@@ -69,72 +88,97 @@ def validate_password(password: str):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# Blocking variants; async handlers should use app.services.passwords instead
 def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed_password.decode('utf-8')
+    return bcrypt_hash(password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    return bcrypt_verify(password, hashed_password)
+
+
+def _failed_login_pipeline(now: datetime) -> list:
+    """
+    Aggregation-pipeline update that records a failed login atomically: an
+    expired lock starts a fresh count, and reaching MAX_LOGIN_ATTEMPTS locks
+    the account (keeping any lock a concurrent request already set).
+    """
+    lock_expired = {"$and": [
+        {"$eq": [{"$type": "$locked_until"}, "date"]},
+        {"$lte": ["$locked_until", now]}
+    ]}
+    limit_reached = {"$gte": ["$login_attempts", MAX_LOGIN_ATTEMPTS]}
+    return [
+        {"$set": {
+            "login_attempts": {"$cond": [
+                lock_expired, 1, {"$add": [{"$ifNull": ["$login_attempts", 0]}, 1]}
+            ]},
+            "is_locked": {"$cond": [lock_expired, "$$REMOVE", "$is_locked"]},
+            "locked_until": {"$cond": [lock_expired, "$$REMOVE", "$locked_until"]}
+        }},
+        {"$set": {
+            "is_locked": {"$cond": [limit_reached, True, "$$REMOVE"]},
+            "locked_until": {"$cond": [
+                limit_reached,
+                {"$ifNull": ["$locked_until", now + ACCOUNT_LOCK_DURATION]},
+                "$$REMOVE"
+            ]}
+        }}
+    ]
 
 
 async def authenticate_user(email: str, password: str):
     db = await get_database()
-    user = await db["users"].find_one({"email": email.lower()})
+    email = email.lower()
+    user = await db["users"].find_one({"email": email})
 
     if not user or "password" not in user:
         return None
 
-    # Unlock account if lock period has passed
-    if user.get("locked_until") and datetime.utcnow() >= user["locked_until"]:
-        await db["users"].update_one(
-            {"email": email.lower()},
-            {
-                "$set": {"login_attempts": 0},
-                "$unset": {"is_locked": "", "locked_until": ""}
-            }
+    # Still locked? (an expired lock is cleared by the next write below)
+    now = datetime.utcnow()
+    locked_until = user.get("locked_until")
+    if user.get("is_locked") and locked_until and now < locked_until:
+        remaining_time = locked_until - now
+        minutes, seconds = divmod(remaining_time.total_seconds(), 60)
+        raise HTTPException(
+            status_code=403,
+            detail=f"Account temporarily locked. Try again in {int(minutes)} minutes and {int(seconds)} seconds."
         )
-        user["login_attempts"] = 0
-        user.pop("is_locked", None)
-        user.pop("locked_until", None)
-
-    # Still locked?
-    if user.get("is_locked"):
-        locked_until = user.get("locked_until", datetime.utcnow())
-        if datetime.utcnow() < locked_until:
-            remaining_time = locked_until - datetime.utcnow()
-            minutes, seconds = divmod(remaining_time.total_seconds(), 60)
-            raise HTTPException(
-                status_code=403,
-                detail=f"Account temporarily locked. Try again in {int(minutes)} minutes and {int(seconds)} seconds."
-            )
 
-    # Verify password
-    if not verify_password(password, user["password"]):
-        await db["users"].update_one(
-            {"email": email.lower()},
-            {"$inc": {"login_attempts": 1}}
+    # Verify password off the event loop; rehash transparently if the cost changed
+    is_valid, new_hash = await password_hasher.verify_and_update(password, user["password"])
+    if not is_valid:
+        updated = await db["users"].find_one_and_update(
+            {"email": email},
+            _failed_login_pipeline(now),
+            projection={"_id": 0, "is_locked": 1},
+            return_document=ReturnDocument.AFTER
         )
-
-        user = await db["users"].find_one({"email": email.lower()})
-        if user.get("login_attempts", 0) >= MAX_LOGIN_ATTEMPTS:
-            await db["users"].update_one(
-                {"email": email.lower()},
-                {"$set": {
-                    "is_locked": True,
-                    "locked_until": datetime.utcnow() + ACCOUNT_LOCK_DURATION
-                }}
-            )
+        if updated and updated.get("is_locked"):
             raise HTTPException(status_code=403, detail="Account locked due to failed login attempts")
 
         return None
 
-    # Reset login attempts
-    await db["users"].update_one(
-        {"email": email.lower()},
-        {"$set": {"login_attempts": 0}, "$unset": {"is_locked": "", "locked_until": ""}}
-    )
+    # Reset login attempts, skipping the write when there is nothing to reset
+    reset = {}
+    if user.get("login_attempts"):
+        reset["login_attempts"] = 0
+    if new_hash:
+        reset["password"] = new_hash
+        user["password"] = new_hash
+    clear_lock = "is_locked" in user or "locked_until" in user
+
+    if reset or clear_lock:
+        update = {}
+        if reset:
+            update["$set"] = reset
+        if clear_lock:
+            update["$unset"] = {"is_locked": "", "locked_until": ""}
+        await db["users"].update_one({"email": email}, update)
+        user["login_attempts"] = 0
+        user.pop("is_locked", None)
+        user.pop("locked_until", None)
 
     return user
 
@@ -164,6 +208,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         logger.error("❌ Invalid JWT token")
         raise credentials_exception
 
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and payload.get("role") and payload.get("email"):
+        return {
+            "client_id": client_id,
+            "Name": payload.get("name"),
+            "email": payload["email"],
+            "role": payload["role"]
+        }
+
     user = await get_user(client_id)
     if user is None:
         raise credentials_exception
@@ -201,14 +253,18 @@ def create_access_token(data: dict, expires_delta: timedelta = DEFAULT_EXPIRY):
         raise HTTPException(status_code=500, detail="Token generation error")
 
 
+def create_otp() -> str:
+    return str(random.randint(100000, 999999))
+
+
 async def generate_otp(email: str, user_name: str):
     try:
-        otp = str(random.randint(100000, 999999))
+        otp = create_otp()
         email_response = await send_otp_email(email, user_name, otp)
         print(f"📧 Email Response: {email_response}")
 
-        if not email_response:
-            return {"error": "Failed to send OTP"}
+        if not email_response or "error" in email_response:
+            return {"error": email_response.get("error", "Failed to send OTP") if email_response else "Failed to send OTP"}
 
         return {"otp": otp}
 
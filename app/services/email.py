@@ -1,42 +1,30 @@
 import os
 from datetime import datetime, timedelta
-from email.message import EmailMessage
 from app.config import settings
-import aiosmtplib
-from email_validator import validate_email, EmailNotValidError
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 import logging
 
 from app.database import get_database
+from app.services.email_outbox import enqueue_email
+from app.services.email_templates import email_templates
+from app.services.email_validation import is_valid_email
 
 # SMTP Configuration
 SMTP_USERNAME = os.getenv("SMTP_USERNAME")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 EMAIL_FROM = os.getenv("EMAIL_FROM", SMTP_USERNAME)
-SMTP_SERVER = "smtp.gmail.com"
-SMTP_PORT = 587
+SMTP_SERVER = settings.SMTP_SERVER
+SMTP_PORT = settings.SMTP_PORT
 
 # App info
 APP_NAME = os.getenv("APP_NAME", "Interview Genie")
 SUPPORT_EMAIL = os.getenv("SUPPORT_EMAIL", "support@example.com")
 
-# Jinja2 setup for email templates
-templates = Environment(
-    loader=FileSystemLoader("app/templates"),
-    autoescape=select_autoescape(['html', 'xml'])
-)
+# Precompiled email templates; `templates` is the underlying Jinja2 environment
+templates = email_templates.environment
 
 # Logger setup
 logger = logging.getLogger(__name__)
 
-# Email validation
-def is_valid_email(email: str) -> bool:
-    try:
-        validate_email(email, check_deliverability=True)
-        return True
-    except EmailNotValidError:
-        return False
-
 # Resend limiter
 async def can_resend_otp(email: str, limit: int = 3, window_minutes: int = 15) -> bool:
     db = await get_database()
@@ -81,32 +69,18 @@ async def can_resend_otp(email: str, limit: int = 3, window_minutes: int = 15) -
         )
         return True
 
-# Send an email using SMTP with HTML template
+# Queue an HTML email for delivery by the outbox worker
 async def send_email(email: str, subject: str, html_body: str) -> dict:
-    if not is_valid_email(email):
+    if not await is_valid_email(email):
         logger.error(f"Invalid email address: {email}")
         return {"error": "Invalid email address"}
 
     try:
-        msg = EmailMessage()
-        msg["Subject"] = subject
-        msg["From"] = EMAIL_FROM
-        msg["To"] = email
-        msg.set_content("This is an HTML email. Please use an HTML-compatible email viewer.")
-        msg.add_alternative(html_body, subtype='html')
-
-        async with aiosmtplib.SMTP(hostname=SMTP_SERVER, port=SMTP_PORT) as server:
-            await server.login(SMTP_USERNAME, SMTP_PASSWORD)
-            await server.send_message(msg)
-
-        logger.info(f"Email sent successfully to {email} with subject '{subject}'")
-        return {"message": "Email sent successfully!"}
-
-    except aiosmtplib.SMTPException as e:
-        logger.error(f"SMTP error while sending email to {email}: {str(e)}")
-        return {"error": f"SMTP error occurred: {str(e)}"}
+        outbox_id = await enqueue_email(email, subject, html_body)
+        logger.info(f"Email queued for {email} with subject '{subject}'")
+        return {"message": "Email queued successfully!", "outbox_id": outbox_id}
     except Exception as e:
-        logger.error(f"Unexpected error while sending email to {email}: {str(e)}")
+        logger.error(f"Unexpected error while queueing email to {email}: {str(e)}")
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
 # OTP Email sender with template and limit checking
@@ -117,7 +91,8 @@ async def send_otp_email(email: str, user_name: str, otp: str) -> dict:
         return {"error": "Too many OTP requests. Please try again later."}
 
     try:
-        html = templates.get_template("emails/otp.html").render(
+        html = email_templates.render(
+            "emails/otp.html",
             user_name=user_name,
             otp=otp,
             app_name=APP_NAME,
@@ -132,7 +107,8 @@ async def send_otp_email(email: str, user_name: str, otp: str) -> dict:
 # Welcome Email
 async def send_welcome_email(email: str, user_name: str) -> dict:
     try:
-        html = templates.get_template("emails/welcome.html").render(
+        html = email_templates.render(
+            "emails/welcome.html",
             user_name=user_name,
             app_name=APP_NAME,
             support_email=SUPPORT_EMAIL,
@@ -147,18 +123,10 @@ async def send_welcome_email(email: str, user_name: str) -> dict:
 
 async def send_admin_notification_email(name: str, email: str, role: str):
     subject = f"🚀 New {role.capitalize()} Signup Notification"
-    admin_email = settings.SUPPORT_EMAIL
+    admin_email = settings.ADMIN_EMAIL
 
-    # Determine which template to use based on role
-    template_name = f"admin_signup_{role}.html"
-    template_path = f"{template_name}"
-
-    # If the role-specific template doesn’t exist, fall back to generic
-    try:
-        template = templates.get_template(template_path)
-    except Exception as e:
-        logger.warning(f"⚠️ Template for role '{role}' not found. Falling back to default.")
-        template = templates.get_template("admin_signup_notification.html")
+    # Role-specific template if one exists, otherwise the generic one
+    template = email_templates.admin_signup_template(getattr(role, "value", role))
 
     rendered = template.render({
         "name": name,
@@ -167,24 +135,10 @@ async def send_admin_notification_email(name: str, email: str, role: str):
         "timestamp": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
     })
 
-    message = EmailMessage()
-    message["From"] = settings.SMTP_USERNAME
-    message["To"] = settings.ADMIN_EMAIL
-    message["Subject"] = subject
-    message.set_content(f"A new {role} has registered.")
-    message.add_alternative(rendered, subtype="html")
-
     try:
-        await aiosmtplib.send(
-            message,
-            hostname=settings.SMTP_SERVER,
-            port=settings.SMTP_PORT,
-            username=settings.SMTP_USERNAME,
-            password=settings.SMTP_PASSWORD,
-            start_tls=True
-        )
-        logger.info(f"✅ Admin notified of new {role} signup: {email}")
+        await enqueue_email(admin_email, subject, rendered, text=f"A new {role} has registered.")
+        logger.info(f"✅ Admin notification queued for new {role} signup: {email}")
         return True
     except Exception as e:
-        logger.error(f"❌ Failed to send admin signup email: {e}")
+        logger.error(f"❌ Failed to queue admin signup email: {e}")
         return False
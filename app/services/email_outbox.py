@@ -0,0 +1,296 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import List, Optional
+import aiosmtplib
+from pymongo import ReturnDocument, UpdateOne
+from app.config import settings
+from app.database import get_database
+
+logger = logging.getLogger(__name__)
+
+# Messages are written here by request handlers and delivered by OutboxWorker
+EMAIL_OUTBOX = "email_outbox"
+
+STATUS_PENDING = "pending"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+RETRY_MAX_DELAY_SECONDS = 3600
+
+
+def build_message(to: str, subject: str, html: str, text: Optional[str] = None, sender: Optional[str] = None) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = sender or settings.EMAIL_FROM or settings.SMTP_USERNAME
+    message["To"] = to
+    message.set_content(text or "This is an HTML email. Please use an HTML-compatible email viewer.")
+    message.add_alternative(html, subtype="html")
+    return message
+
+
+def retry_delay(attempts: int, base: float = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS) -> float:
+    """Exponential backoff with jitter: base, 2*base, 4*base ... capped at an hour."""
+    delay = min(base * (2 ** max(attempts - 1, 0)), RETRY_MAX_DELAY_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+# -------------------------------------------------
+# Transports
+# -------------------------------------------------
+class SMTPPoolTransport:
+    """
+    Keeps up to `size` authenticated SMTP connections open between batches
+    so each message costs one DATA exchange instead of a TCP/TLS/AUTH handshake.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        start_tls: bool = True,
+        timeout: float = 30,
+        size: int = 2
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username or None
+        self.password = password or None
+        self.start_tls = start_tls
+        self.timeout = timeout
+        self.size = max(1, size)
+        self._idle: "asyncio.Queue[Optional[aiosmtplib.SMTP]]" = asyncio.Queue()
+        for _ in range(self.size):
+            self._idle.put_nowait(None)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+            timeout=self.timeout
+        )
+        await client.connect()
+        logger.info(f"📨 Opened SMTP connection to {self.hostname}:{self.port}")
+        return client
+
+    async def send(self, message: EmailMessage) -> None:
+        client = await self._idle.get()
+        try:
+            for attempt in range(2):
+                if client is None or not client.is_connected:
+                    client = await self._connect()
+                try:
+                    await client.send_message(message)
+                    return
+                except aiosmtplib.SMTPServerDisconnected:
+                    # Idle connections get dropped by the server; reconnect once
+                    client = None
+                    if attempt:
+                        raise
+        except (aiosmtplib.SMTPConnectError, aiosmtplib.SMTPTimeoutError, OSError):
+            await self._discard(client)
+            client = None
+            raise
+        finally:
+            # Rejected recipients etc. leave the connection usable, so it goes back to the pool
+            self._idle.put_nowait(client if client is not None and client.is_connected else None)
+
+    async def _discard(self, client: Optional[aiosmtplib.SMTP]) -> None:
+        if client is not None and client.is_connected:
+            try:
+                await client.quit()
+            except Exception:
+                client.close()
+
+    async def close(self) -> None:
+        for _ in range(self.size):
+            await self._discard(await self._idle.get())
+        for _ in range(self.size):
+            self._idle.put_nowait(None)
+
+
+class MemoryTransport:
+    """Records messages instead of sending them; for tests and local development."""
+
+    def __init__(self):
+        self.sent: List[EmailMessage] = []
+
+    async def send(self, message: EmailMessage) -> None:
+        self.sent.append(message)
+
+    async def close(self) -> None:
+        pass
+
+
+def create_transport():
+    if settings.EMAIL_TRANSPORT == "memory":
+        return MemoryTransport()
+    return SMTPPoolTransport(
+        hostname=settings.SMTP_SERVER,
+        port=settings.SMTP_PORT,
+        username=settings.SMTP_USERNAME,
+        password=settings.SMTP_PASSWORD,
+        start_tls=settings.SMTP_START_TLS,
+        timeout=settings.SMTP_TIMEOUT,
+        size=settings.SMTP_POOL_SIZE
+    )
+
+
+# -------------------------------------------------
+# Outbox
+# -------------------------------------------------
+async def enqueue_email(to: str, subject: str, html: str, text: Optional[str] = None, sender: Optional[str] = None) -> str:
+    """Persist a message for background delivery and return its outbox id."""
+    db = await get_database()
+    now = datetime.utcnow()
+    result = await db[EMAIL_OUTBOX].insert_one({
+        "to": to,
+        "subject": subject,
+        "html": html,
+        "text": text,
+        "sender": sender,
+        "status": STATUS_PENDING,
+        "attempts": 0,
+        "next_attempt_at": now,
+        "created_at": now
+    })
+    outbox_worker.notify()
+    return str(result.inserted_id)
+
+
+class OutboxWorker:
+    """
+    Background task that claims due outbox messages in batches and delivers
+    them over a shared transport. Claims are atomic, so several app workers
+    can drain the same outbox; a crashed claim is retried after its lease.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 20,
+        poll_seconds: float = 5,
+        max_attempts: int = 5,
+        lease_seconds: int = 120
+    ):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.transport = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    def start(self, transport=None) -> None:
+        if self._task and not self._task.done():
+            return
+        self.transport = transport or create_transport()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="email-outbox")
+        logger.info("✅ Email outbox worker started.")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.transport:
+            await self.transport.close()
+        logger.info("✅ Email outbox worker stopped.")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delivered = await self.process_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Email outbox batch failed: {e}", exc_info=True)
+                delivered = 0
+
+            # A full batch means more may be waiting; otherwise sleep until notified or polled
+            if delivered < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def _claim(self, db) -> List[dict]:
+        now = datetime.utcnow()
+        due = {"$or": [
+            {"status": STATUS_PENDING, "next_attempt_at": {"$lte": now}},
+            {"status": STATUS_SENDING, "lease_until": {"$lte": now}}
+        ]}
+        claim = {"$set": {"status": STATUS_SENDING, "lease_until": now + timedelta(seconds=self.lease_seconds)}}
+
+        batch = []
+        for _ in range(self.batch_size):
+            doc = await db[EMAIL_OUTBOX].find_one_and_update(
+                due, claim,
+                sort=[("next_attempt_at", 1)],
+                return_document=ReturnDocument.AFTER
+            )
+            if doc is None:
+                break
+            batch.append(doc)
+        return batch
+
+    async def _deliver(self, doc: dict) -> UpdateOne:
+        attempts = doc.get("attempts", 0) + 1
+        try:
+            message = build_message(doc["to"], doc["subject"], doc["html"], doc.get("text"), doc.get("sender"))
+            await self.transport.send(message)
+            logger.info(f"📧 Email sent to {doc['to']} with subject '{doc['subject']}'")
+            return UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {"status": STATUS_SENT, "attempts": attempts, "sent_at": datetime.utcnow()},
+                 "$unset": {"lease_until": "", "last_error": ""}}
+            )
+        except Exception as e:
+            failed = attempts >= self.max_attempts
+            logger.error(
+                f"❌ Email to {doc['to']} failed (attempt {attempts}/{self.max_attempts}): {e}"
+            )
+            return UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {
+                    "status": STATUS_FAILED if failed else STATUS_PENDING,
+                    "attempts": attempts,
+                    "last_error": str(e),
+                    "next_attempt_at": datetime.utcnow() + timedelta(seconds=retry_delay(attempts))
+                }, "$unset": {"lease_until": ""}}
+            )
+
+    async def process_batch(self) -> int:
+        """Claim and deliver one batch; returns the number of messages processed."""
+        db = await get_database()
+        batch = await self._claim(db)
+        if not batch:
+            return 0
+
+        # The SMTP pool bounds how many of these are in flight at once
+        results = await asyncio.gather(*(self._deliver(doc) for doc in batch))
+        await db[EMAIL_OUTBOX].bulk_write(list(results), ordered=False)
+        return len(batch)
+
+
+outbox_worker = OutboxWorker(
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    poll_seconds=settings.EMAIL_OUTBOX_POLL_SECONDS,
+    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    lease_seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS
+)
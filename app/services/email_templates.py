@@ -0,0 +1,61 @@
+import logging
+import os
+from typing import Dict, Optional
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, TemplateNotFound, select_autoescape
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+ADMIN_SIGNUP_FALLBACK = "admin_signup_notification.html"
+
+
+class TemplateRegistry:
+    """
+    Compiles every email template once at startup and hands out the compiled
+    objects by name. Compiled bytecode is also cached on disk so new workers
+    skip the Jinja parse step; templates are not re-checked for changes.
+    """
+
+    def __init__(self, directory: str = TEMPLATE_DIR, bytecode_cache_dir: Optional[str] = None):
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+        self.environment = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=select_autoescape(["html", "xml"]),
+            bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir) if bytecode_cache_dir else FileSystemBytecodeCache(),
+            auto_reload=False,
+            cache_size=-1
+        )
+        self._templates: Dict[str, Template] = {}
+        self._role_templates: Dict[str, Template] = {}
+
+    def preload(self) -> int:
+        for name in self.environment.list_templates(extensions=["html"]):
+            self._templates[name] = self.environment.get_template(name)
+        logger.info(f"✅ Preloaded {len(self._templates)} email templates.")
+        return len(self._templates)
+
+    def get(self, name: str) -> Template:
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.environment.get_template(name)
+        return template
+
+    def render(self, name: str, **context) -> str:
+        return self.get(name).render(**context)
+
+    def admin_signup_template(self, role: str) -> Template:
+        """Role-specific admin signup template, or the generic one; misses are cached too."""
+        template = self._role_templates.get(role)
+        if template is None:
+            try:
+                template = self.get(f"admin_signup_{role}.html")
+            except TemplateNotFound:
+                logger.warning(f"⚠️ Template for role '{role}' not found. Falling back to default.")
+                template = self.get(ADMIN_SIGNUP_FALLBACK)
+            self._role_templates[role] = template
+        return template
+
+
+email_templates = TemplateRegistry(bytecode_cache_dir=settings.EMAIL_TEMPLATE_CACHE_DIR)
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+from email_validator import validate_email, EmailNotValidError
+from app.config import settings
+from app.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class DNSDeliverabilityResolver:
+    """
+    Decides whether a domain can receive mail: it needs MX records, or an
+    A/AAAA record as the implicit MX. A null MX ("0 .") means no mail.
+    Returns None when DNS could not give an answer (timeouts, SERVFAIL).
+    """
+
+    def __init__(self, timeout: float = 2.0):
+        self._resolver = dns.asyncresolver.Resolver()
+        self._resolver.lifetime = timeout
+
+    async def is_deliverable(self, domain: str) -> Optional[bool]:
+        try:
+            answer = await self._resolver.resolve(domain, "MX")
+            return not all(str(record.exchange) == "." for record in answer)
+        except dns.resolver.NXDOMAIN:
+            return False
+        except dns.resolver.NoAnswer:
+            pass
+        except (dns.exception.Timeout, dns.resolver.NoNameservers) as e:
+            logger.warning(f"⚠️ MX lookup for {domain} failed: {e}")
+            return None
+
+        for record_type in ("A", "AAAA"):
+            try:
+                await self._resolver.resolve(domain, record_type)
+                return True
+            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+                continue
+            except (dns.exception.Timeout, dns.resolver.NoNameservers):
+                return None
+        return False
+
+
+class EmailDomainChecker:
+    """
+    Caches deliverability per domain (shorter TTL for undeliverable domains)
+    and shares one in-flight lookup between concurrent callers.
+    """
+
+    def __init__(self, resolver, ttl: float = 3600, negative_ttl: float = 300, maxsize: int = 10000):
+        self.resolver = resolver
+        self.negative_ttl = negative_ttl
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    async def is_deliverable(self, domain: str) -> bool:
+        cached = self._cache.get(domain)
+        if cached is not None:
+            return cached
+
+        pending = self._inflight.get(domain)
+        if pending is None:
+            pending = asyncio.ensure_future(self._lookup(domain))
+            self._inflight[domain] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(domain, None))
+        return await asyncio.shield(pending)
+
+    async def _lookup(self, domain: str) -> bool:
+        try:
+            result = await self.resolver.is_deliverable(domain)
+        except Exception as e:
+            logger.error(f"❌ Deliverability check for {domain} failed: {e}")
+            result = None
+
+        if result is None:
+            # Don't reject addresses because DNS is flaky; don't cache either
+            return True
+        self._cache.set(domain, result, ttl=None if result else self.negative_ttl)
+        return result
+
+
+domain_checker = EmailDomainChecker(
+    DNSDeliverabilityResolver(timeout=settings.EMAIL_DNS_TIMEOUT_SECONDS),
+    ttl=settings.EMAIL_DOMAIN_CACHE_TTL_SECONDS,
+    negative_ttl=settings.EMAIL_DOMAIN_NEGATIVE_TTL_SECONDS,
+    maxsize=settings.EMAIL_DOMAIN_CACHE_MAX_SIZE
+)
+
+
+def set_resolver(resolver) -> None:
+    """Swap the deliverability resolver (e.g. a stub in tests) and drop cached results."""
+    domain_checker.resolver = resolver
+    domain_checker.clear()
+
+
+async def is_valid_email(email: str, check_deliverability: bool = True) -> bool:
+    try:
+        # Syntax only; the DNS part is done asynchronously below
+        validated = validate_email(email, check_deliverability=False)
+    except EmailNotValidError:
+        return False
+
+    if not check_deliverability:
+        return True
+    return await domain_checker.is_deliverable(validated.ascii_domain.lower())
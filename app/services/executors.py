@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, FrozenSet
+from fastapi import HTTPException, status
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pools the current request already holds a slot in (see require_capacity)
+_reserved: ContextVar[FrozenSet[str]] = ContextVar("reserved_pools", default=frozenset())
+
+
+class PoolSaturated(HTTPException):
+    """Raised when a pool's queue is full; clients should retry after `retry_after` seconds."""
+
+    def __init__(self, pool: str, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy analyzing other requests. Please try again shortly.",
+            headers={"Retry-After": str(retry_after)}
+        )
+        self.pool = pool
+
+
+class BoundedPool:
+    """
+    A named thread pool with its own worker count and queue limit. Calls
+    beyond `max_pending` (running plus queued) are rejected with
+    PoolSaturated instead of waiting behind other work. A request holding a
+    reservation runs its calls inside that one slot.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_pending: int, retry_after: int = 5):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(self.max_workers, max_pending)
+        self.retry_after = retry_after
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-pool")
+        self._pending = 0
+        self._stats = {"calls": 0, "rejected": 0, "queue_time_total": 0.0, "queue_time_max": 0.0, "run_time_total": 0.0}
+
+    @property
+    def saturated(self) -> bool:
+        return self._pending >= self.max_pending
+
+    def admit(self) -> None:
+        if self.saturated:
+            self._stats["rejected"] += 1
+            logger.warning(f"⚠️ {self.name} pool is full ({self._pending} pending); rejecting request.")
+            raise PoolSaturated(self.name, self.retry_after)
+
+    def reserve(self) -> None:
+        self.admit()
+        self._pending += 1
+
+    def release(self) -> None:
+        self._pending -= 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        reserved = self.name in _reserved.get()
+        if not reserved:
+            self.admit()
+        submitted = time.perf_counter()
+        timings = {}
+
+        def timed():
+            started = time.perf_counter()
+            timings["queue"] = started - submitted
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                timings["run"] = time.perf_counter() - started
+
+        if not reserved:
+            self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, timed)
+        finally:
+            if not reserved:
+                self._pending -= 1
+            self._stats["calls"] += 1
+            queue_time = timings.get("queue", 0.0)
+            self._stats["queue_time_total"] += queue_time
+            self._stats["queue_time_max"] = max(self._stats["queue_time_max"], queue_time)
+            self._stats["run_time_total"] += timings.get("run", 0.0)
+
+    def metrics(self) -> Dict[str, Any]:
+        calls = self._stats["calls"] or 1
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "calls": self._stats["calls"],
+            "rejected": self._stats["rejected"],
+            "avg_queue_ms": round(self._stats["queue_time_total"] / calls * 1000, 2),
+            "max_queue_ms": round(self._stats["queue_time_max"] * 1000, 2),
+            "avg_run_ms": round(self._stats["run_time_total"] / calls * 1000, 2)
+        }
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# -------------------------------------------------
+# Named Pools
+# -------------------------------------------------
+VIDEO = "video"   # DeepFace inference, frame batches, video decoding
+AUDIO = "audio"   # librosa DSP, format conversion
+STT = "stt"       # Speech recognition (network bound)
+IO = "io"         # ffmpeg/ffprobe subprocesses and other blocking I/O
+
+
+class ExecutorRegistry:
+    """
+    Keeps AI work off Starlette's shared threadpool, so a burst of video
+    analysis can only fill its own pool and never the threads that auth and
+    question endpoints rely on.
+    """
+
+    def __init__(self, pools: Dict[str, BoundedPool]):
+        self.pools = pools
+
+    @classmethod
+    def from_settings(cls, settings=settings) -> "ExecutorRegistry":
+        retry_after = settings.EXECUTOR_RETRY_AFTER_SECONDS
+        return cls({
+            VIDEO: BoundedPool(VIDEO, settings.EXECUTOR_VIDEO_WORKERS, settings.EXECUTOR_VIDEO_MAX_PENDING, retry_after),
+            AUDIO: BoundedPool(AUDIO, settings.EXECUTOR_AUDIO_WORKERS, settings.EXECUTOR_AUDIO_MAX_PENDING, retry_after),
+            STT: BoundedPool(STT, settings.EXECUTOR_STT_WORKERS, settings.EXECUTOR_STT_MAX_PENDING, retry_after),
+            IO: BoundedPool(IO, settings.EXECUTOR_IO_WORKERS, settings.EXECUTOR_IO_MAX_PENDING, retry_after),
+        })
+
+    def __getitem__(self, name: str) -> BoundedPool:
+        return self.pools[name]
+
+    async def run(self, name: str, fn: Callable, *args, **kwargs) -> Any:
+        return await self.pools[name].run(fn, *args, **kwargs)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {name: pool.metrics() for name, pool in self.pools.items()}
+
+    def shutdown(self) -> None:
+        for pool in self.pools.values():
+            pool.shutdown()
+
+
+executors = ExecutorRegistry.from_settings(settings)
+
+
+def require_capacity(*names: str):
+    """
+    Route dependency that reserves a slot in every pool the route uses, so a
+    request is turned away up front (before any temp files are written or
+    conversions started) rather than halfway through. The slots are held
+    until the request finishes; the route's own calls run inside them.
+    """
+
+    async def dependency() -> AsyncIterator[None]:
+        held = []
+        try:
+            for name in names:
+                executors[name].reserve()
+                held.append(executors[name])
+            _reserved.set(_reserved.get() | frozenset(names))
+            yield
+        finally:
+            for pool in held:
+                pool.release()
+
+    return dependency
+
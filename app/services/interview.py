@@ -1,12 +1,21 @@
 from datetime import datetime
 from bson import ObjectId
 import logging
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from app.database import get_database
-from app.schemas.interview import InterviewModel
+from app.services.pagination import encode_cursor, keyset_filter
+from app.services.admin_summaries import record_interview_created, record_interview_status
 
 logger = logging.getLogger(__name__)
 
+# Summary fields for listings; computed question count instead of the full payload
+INTERVIEW_SUMMARY_PROJECTION = {
+    "status": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "question_count": {"$size": {"$ifNull": ["$questions", []]}}
+}
+
 
 async def create_interview(user_id: str, candidate_name: str, questions: list):
     try:
@@ -17,21 +26,22 @@ async def create_interview(user_id: str, candidate_name: str, questions: list):
         if not isinstance(questions, list) or not questions:
             raise ValueError("Questions must be a non-empty list")
 
-        new_interview = InterviewModel(
-            user_id=user_id,
-            candidate_name=candidate_name,
-            questions=questions,
-            responses=[None] * len(questions),
-            feedback=None,
-            status="pending",
-            ai_feedback=[],
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
-            status_history=["pending"]
-        ).dict()
+        new_interview = {
+            "user_id": user_id,
+            "candidate_name": candidate_name,
+            "questions": questions,
+            "responses": [None] * len(questions),
+            "feedback": None,
+            "status": "pending",
+            "ai_feedback": [],
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+            "status_history": ["pending"]
+        }
 
         db = await get_database()
         result = await db["interviews"].insert_one(new_interview)
+        await record_interview_created(db, result.inserted_id, user_id, candidate_name)
 
         logger.info(f"✅ Interview created for user_id: {user_id}")
         return str(result.inserted_id)
@@ -41,23 +51,49 @@ async def create_interview(user_id: str, candidate_name: str, questions: list):
         return None
 
 
-async def get_interviews_by_user(user_id: str, skip: int = 0, limit: int = 10) -> List[dict]:
-    try:
-        if not isinstance(user_id, str) or not user_id.strip():
-            raise ValueError("Invalid user_id")
-
-        db = await get_database()
-        interviews = await db["interviews"].find({"user_id": user_id}).skip(skip).limit(limit).to_list(length=limit)
-
-        for interview in interviews:
-            interview["id"] = str(interview["_id"])
-            interview.pop("_id", None)
-
-        return interviews
-
-    except Exception as e:
-        logger.exception(f"❌ Error fetching interviews for user_id {user_id}: {str(e)}")
-        return []
+def serialize_interview_summary(doc: dict) -> dict:
+    # Interviews from before created_at was stored are dated by their ObjectId
+    created_at = doc.get("created_at") or doc["_id"].generation_time.replace(tzinfo=None)
+    updated_at = doc.get("updated_at")
+    return {
+        "id": str(doc["_id"]),
+        "status": doc.get("status", "pending"),
+        "question_count": doc.get("question_count", 0),
+        "created_at": created_at.isoformat() if created_at else None,
+        "updated_at": updated_at.isoformat() if updated_at else None
+    }
+
+
+async def get_interviews_by_user(
+    user_id: str,
+    limit: int = 10,
+    cursor: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Keyset-paginated interview summaries, newest first, served from the
+    (user_id, created_at, _id) index. Returns the page and the cursor for the
+    next one (None on the last page). Raises ValueError on a malformed cursor.
+    """
+    if not isinstance(user_id, str) or not user_id.strip():
+        raise ValueError("Invalid user_id")
+
+    query = {"user_id": user_id}
+    if cursor:
+        query.update(keyset_filter("created_at", cursor))
+
+    db = await get_database()
+    docs = await db["interviews"].find(query, INTERVIEW_SUMMARY_PROJECTION) \
+        .sort([("created_at", -1), ("_id", -1)]) \
+        .limit(limit + 1) \
+        .to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor(last.get("created_at"), last["_id"])
+
+    return [serialize_interview_summary(doc) for doc in docs], next_cursor
 
 
 async def get_interview_by_id(interview_id: str) -> Optional[dict]:
@@ -85,6 +121,8 @@ async def update_interview_status(interview_id: str, new_status: str) -> bool:
             "$push": {"status_history": new_status}
         }
         result = await db["interviews"].update_one({"_id": ObjectId(interview_id)}, update)
+        if result.modified_count == 1:
+            await record_interview_status(db, interview_id, new_status)
         return result.modified_count == 1
 
     except Exception as e:
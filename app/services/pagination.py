@@ -0,0 +1,33 @@
+from datetime import datetime
+from bson import ObjectId
+import base64
+from typing import Optional, Tuple
+
+
+# Opaque keyset cursors over (<datetime sort key>, _id), newest first. Documents
+# without the sort key (older rows) sort after all others, as null does in MongoDB;
+# their cursors carry an empty sort value and page on _id alone.
+def encode_cursor(sort_value: Optional[datetime], doc_id: ObjectId) -> str:
+    raw = f"{sort_value.isoformat() if sort_value else ''}|{doc_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], ObjectId]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, doc_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return (datetime.fromisoformat(sort_value) if sort_value else None), ObjectId(doc_id)
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+def keyset_filter(field: str, cursor: str) -> dict:
+    """Filter selecting documents strictly after `cursor` in (field desc, _id desc) order."""
+    sort_value, doc_id = decode_cursor(cursor)
+    if sort_value is None:
+        return {field: None, "_id": {"$lt": doc_id}}
+    return {"$or": [
+        {field: {"$lt": sort_value}},
+        {field: sort_value, "_id": {"$lt": doc_id}},
+        {field: None}
+    ]}
@@ -0,0 +1,128 @@
+import asyncio
+import bcrypt
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# bcrypt only uses the first 72 bytes of a password
+BCRYPT_MAX_BYTES = 72
+
+
+def _secret(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_BYTES]
+
+
+def bcrypt_hash(password: str, rounds: int = settings.BCRYPT_ROUNDS) -> str:
+    return bcrypt.hashpw(_secret(password), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def bcrypt_verify(password: str, hashed_password: str) -> bool:
+    try:
+        return bcrypt.checkpw(_secret(password), hashed_password.encode("utf-8"))
+    except ValueError:
+        # Malformed or non-bcrypt hash
+        return False
+
+
+def needs_rehash(hashed_password: str, rounds: int = settings.BCRYPT_ROUNDS) -> bool:
+    """True when a `$2b$<cost>$...` hash was made with a lower cost than configured."""
+    try:
+        return int(hashed_password.split("$")[2]) < rounds
+    except (IndexError, ValueError):
+        return True
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated thread pool so hashing never blocks the event
+    loop or competes with Starlette's shared threadpool. At most `max_workers`
+    hashes run at once; beyond `max_pending` queued calls, requests are
+    rejected with 503 instead of piling up.
+    """
+
+    def __init__(self, rounds: int = 12, max_workers: int = 2, max_pending: int = 64):
+        self.rounds = rounds
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._pending = 0
+        self._stats = {"calls": 0, "rejected": 0, "queue_time_total": 0.0, "queue_time_max": 0.0, "run_time_total": 0.0}
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        if self._pending >= self.max_pending:
+            self._stats["rejected"] += 1
+            logger.warning("⚠️ Password hashing queue is full; rejecting request.")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy. Please try again shortly.",
+                headers={"Retry-After": "1"}
+            )
+
+        submitted = time.perf_counter()
+        timings = {}
+
+        def timed():
+            started = time.perf_counter()
+            timings["queue"] = started - submitted
+            try:
+                return fn(*args)
+            finally:
+                timings["run"] = time.perf_counter() - started
+
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self._pending -= 1
+            self._stats["calls"] += 1
+            queue_time = timings.get("queue", 0.0)
+            self._stats["queue_time_total"] += queue_time
+            self._stats["queue_time_max"] = max(self._stats["queue_time_max"], queue_time)
+            self._stats["run_time_total"] += timings.get("run", 0.0)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(bcrypt_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(bcrypt_verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Returns (valid, new_hash); new_hash is set when the stored hash uses a lower cost than configured."""
+        def verify_then_rehash():
+            if not bcrypt_verify(password, hashed_password):
+                return False, None
+            if needs_rehash(hashed_password, self.rounds):
+                return True, bcrypt_hash(password, self.rounds)
+            return True, None
+
+        return await self._run(verify_then_rehash)
+
+    def metrics(self) -> Dict[str, Any]:
+        calls = self._stats["calls"] or 1
+        return {
+            "pending": self._pending,
+            "calls": self._stats["calls"],
+            "rejected": self._stats["rejected"],
+            "avg_queue_ms": round(self._stats["queue_time_total"] / calls * 1000, 2),
+            "max_queue_ms": round(self._stats["queue_time_max"] * 1000, 2),
+            "avg_run_ms": round(self._stats["run_time_total"] / calls * 1000, 2)
+        }
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(password, hashed_password)
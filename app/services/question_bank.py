@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+from app.config import settings
+from app.schemas.interview_question import QuestionModel
+
+logger = logging.getLogger(__name__)
+
+# {_id: "questions", version: int}; bumped on every question bank write
+QUESTION_BANK_META = "question_bank_meta"
+META_ID = "questions"
+
+# Questions with this experience level are shown to every level
+BOTH_LEVELS = "both"
+
+
+async def bump_question_version(db) -> int:
+    doc = await db[QUESTION_BANK_META].find_one_and_update(
+        {"_id": META_ID},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    version = doc["version"]
+    question_bank.invalidate()
+    return version
+
+
+async def get_question_version(db) -> int:
+    doc = await db[QUESTION_BANK_META].find_one({"_id": META_ID}, {"version": 1})
+    return doc["version"] if doc else 0
+
+
+# -------------------------------------------------
+# In-memory Question Index
+# -------------------------------------------------
+class QuestionIndex:
+    """
+    Immutable snapshot of the question bank with lookup tables by category
+    and experience level. Level lookups already include `both` questions,
+    matching the `$or` filter the Mongo query used.
+    """
+
+    def __init__(self, docs: List[Dict[str, Any]], version: int = 0):
+        self.version = version
+        self.docs: List[Dict[str, Any]] = []
+        self.models: List[QuestionModel] = []
+        self.positions: Dict[str, int] = {}
+
+        by_category: Dict[str, List[int]] = {}
+        by_level: Dict[str, List[int]] = {}
+        for position, doc in enumerate(docs):
+            doc = dict(doc, _id=str(doc["_id"]))
+            self.docs.append(doc)
+            self.models.append(QuestionModel(**doc))
+            self.positions[doc["_id"]] = position
+            by_category.setdefault(doc.get("category"), []).append(position)
+            by_level.setdefault(doc.get("experience_level"), []).append(position)
+
+        self.by_category = by_category
+        both = by_level.get(BOTH_LEVELS, [])
+        self.by_level = {
+            level: sorted(set(positions) | set(both)) for level, positions in by_level.items() if level
+        }
+        self.by_category_level: Dict[Tuple[str, str], List[int]] = {}
+        for category, positions in by_category.items():
+            members = set(positions)
+            for level, level_positions in self.by_level.items():
+                matched = [p for p in level_positions if p in members]
+                if matched:
+                    self.by_category_level[(category, level)] = matched
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def lookup(self, experience_level: Optional[str] = None, category: Optional[str] = None) -> List[int]:
+        if experience_level and category:
+            level = experience_level if experience_level in self.by_level else BOTH_LEVELS
+            return self.by_category_level.get((category, level), [])
+        if experience_level:
+            # Unknown levels still match the shared `both` questions
+            return self.by_level.get(experience_level, self.by_level.get(BOTH_LEVELS, []))
+        if category:
+            return self.by_category.get(category, [])
+        return range(len(self.docs))
+
+    def query(
+        self,
+        experience_level: Optional[str] = None,
+        category: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 10
+    ) -> List[QuestionModel]:
+        positions = self.lookup(experience_level, category)
+        return [self.models[p] for p in positions[skip:skip + limit]]
+
+    def get(self, question_id: str) -> Optional[Dict[str, Any]]:
+        position = self.positions.get(question_id)
+        return None if position is None else self.docs[position]
+
+
+class QuestionBankCache:
+    """
+    Holds the current QuestionIndex for this worker. Writes in this worker
+    invalidate it directly; other workers notice the bumped version through
+    a change stream on the meta collection when available, otherwise by
+    polling the version at most every `poll_seconds`.
+    """
+
+    def __init__(self, poll_seconds: float = 5.0):
+        self.poll_seconds = poll_seconds
+        self._index: Optional[QuestionIndex] = None
+        self._checked_at = 0.0
+        self._stale = False
+        self._lock = asyncio.Lock()
+        self._watching = False
+        self._watch_task: Optional[asyncio.Task] = None
+        self._listeners = []
+
+    def invalidate(self) -> None:
+        self._checked_at = 0.0
+        self._stale = True
+
+    def on_reload(self, listener) -> None:
+        """Register `listener(old_index, new_index)`, called after every rebuild."""
+        self._listeners.append(listener)
+
+    async def get(self, db) -> QuestionIndex:
+        index = self._index
+        now = time.monotonic()
+        if index is not None and not self._stale and \
+                (self._watching or now - self._checked_at < self.poll_seconds):
+            return index
+
+        async with self._lock:
+            if self._index is not None and self._index is not index:
+                return self._index
+            self._checked_at = time.monotonic()
+            version = await get_question_version(db)
+            if self._index is None or self._index.version != version or self._stale:
+                await self._reload(db, version)
+            return self._index
+
+    async def _reload(self, db, version: int) -> None:
+        self._stale = False
+        started = time.perf_counter()
+        docs = await db["questions"].find({}).sort("_id", 1).to_list(length=None)
+        old, self._index = self._index, QuestionIndex(docs, version)
+        for listener in self._listeners:
+            listener(old, self._index)
+        logger.info(
+            f"✅ Question bank v{version} loaded: {len(docs)} questions "
+            f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+
+    def start_watch(self, db) -> None:
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch(db), name="question-bank-watch")
+
+    async def stop_watch(self) -> None:
+        if self._watch_task:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    async def _watch(self, db) -> None:
+        try:
+            async with db[QUESTION_BANK_META].watch() as stream:
+                self._watching = True
+                logger.info("✅ Watching question bank version via change stream.")
+                async for _ in stream:
+                    self.invalidate()
+        except PyMongoError as e:
+            # Standalone servers have no change streams; polling covers it
+            logger.info(f"ℹ️ Question bank change stream unavailable, polling instead: {e}")
+        finally:
+            self._watching = False
+
+
+question_bank = QuestionBankCache(poll_seconds=settings.QUESTION_BANK_POLL_SECONDS)
@@ -0,0 +1,187 @@
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from app.services.question_bank import BOTH_LEVELS, QuestionIndex, question_bank
+
+# Field weights: a hit in the question itself counts more than one in the tips
+FIELD_WEIGHTS = {"question": 3.0, "tags": 2.0, "tips": 1.0}
+PREFIX_MATCH_WEIGHT = 0.7
+MIN_PREFIX_LENGTH = 2
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can do for from have how i if in is it me of on or "
+    "that the this to was we what when where which who why will with you your".split()
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SUFFIXES = ("ational", "ations", "ation", "ments", "ment", "ness", "ings", "ing", "ies", "ied", "ers", "er", "ed", "es", "ly", "s")
+
+
+def stem(word: str) -> str:
+    """Light suffix stripping; enough to match "handled" with "handle" and "deadlines" with "deadline"."""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            if suffix in ("ies", "ied"):
+                word += "y"
+            break
+    if len(word) > 4 and word.endswith("e"):
+        word = word[:-1]
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiousl":
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(item) for item in value)
+    return str(value or "")
+
+
+class QuestionSearchIndex:
+    """
+    Inverted index over question text, tags and tips. Postings map each
+    stemmed term to {question_id: weighted term frequency}; a sorted list of
+    the unstemmed words makes prefix (typeahead) expansion a bisect instead
+    of a scan.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.words: List[str] = []
+        self.word_refs: Counter = Counter()
+        self.doc_terms: Dict[str, Dict[str, float]] = {}
+        self.doc_words: Dict[str, set] = {}
+        self.doc_meta: Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.doc_terms)
+
+    # ---- Maintenance ----
+    def add(self, doc: Dict[str, Any]) -> None:
+        question_id = str(doc["_id"])
+        if question_id in self.doc_terms:
+            self.remove(question_id)
+
+        weights: Counter = Counter()
+        words = set()
+        for field, field_weight in FIELD_WEIGHTS.items():
+            for token in tokenize(_field_text(doc.get(field))):
+                weights[stem(token)] += field_weight
+                words.add(token)
+
+        self.doc_terms[question_id] = dict(weights)
+        self.doc_words[question_id] = words
+        self.doc_meta[question_id] = (doc.get("category"), doc.get("experience_level"), doc.get("difficulty"))
+        for term, weight in weights.items():
+            self.postings.setdefault(term, {})[question_id] = weight
+        for word in words:
+            if not self.word_refs[word]:
+                insort(self.words, word)
+            self.word_refs[word] += 1
+
+    def remove(self, question_id: str) -> None:
+        for term in self.doc_terms.pop(question_id, {}):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(question_id, None)
+            if not posting:
+                del self.postings[term]
+        for word in self.doc_words.pop(question_id, ()):
+            self.word_refs[word] -= 1
+            if not self.word_refs[word]:
+                del self.word_refs[word]
+                self.words.pop(bisect_left(self.words, word))
+        self.doc_meta.pop(question_id, None)
+
+    def sync(self, old: Optional[QuestionIndex], new: QuestionIndex) -> Dict[str, int]:
+        """Apply only the differences between two question bank snapshots."""
+        old_docs = {doc["_id"]: doc for doc in old.docs} if old is not None else {}
+        if old is None and self.doc_terms:
+            old_docs = {question_id: None for question_id in self.doc_terms}
+
+        new_docs = {doc["_id"]: doc for doc in new.docs}
+        removed = [question_id for question_id in old_docs if question_id not in new_docs]
+        changed = [doc for question_id, doc in new_docs.items() if old_docs.get(question_id) != doc]
+
+        for question_id in removed:
+            self.remove(question_id)
+        for doc in changed:
+            self.add(doc)
+        return {"added_or_updated": len(changed), "removed": len(removed)}
+
+    # ---- Querying ----
+    def _expand(self, token: str, is_prefix: bool) -> List[Tuple[str, float]]:
+        term = stem(token)
+        matches = {term: 1.0} if term in self.postings else {}
+        if is_prefix and len(token) >= MIN_PREFIX_LENGTH:
+            for position in range(bisect_left(self.words, token), len(self.words)):
+                word = self.words[position]
+                if not word.startswith(token):
+                    break
+                matches.setdefault(stem(word), PREFIX_MATCH_WEIGHT)
+        return list(matches.items())
+
+    def _accepts(self, question_id: str, category, experience_level, difficulty) -> bool:
+        doc_category, doc_level, doc_difficulty = self.doc_meta[question_id]
+        if category and doc_category != category:
+            return False
+        if experience_level and doc_level not in (experience_level, BOTH_LEVELS):
+            return False
+        if difficulty and doc_difficulty != difficulty:
+            return False
+        return True
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        experience_level: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        limit: int = 20,
+        prefix: bool = True
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank questions by TF-IDF over the query terms. With `prefix`, the last
+        token also matches longer terms (typeahead). Questions matching more
+        of the query rank first.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        total = max(len(self.doc_terms), 1)
+        scores: Dict[str, float] = {}
+        matched: Counter = Counter()
+        is_last_partial = prefix and not query[-1:].isspace()
+
+        for position, token in enumerate(tokens):
+            token_scores: Dict[str, float] = {}
+            for term, match_weight in self._expand(token, is_last_partial and position == len(tokens) - 1):
+                posting = self.postings[term]
+                idf = math.log(1 + total / len(posting))
+                for question_id, weight in posting.items():
+                    score = weight * idf * match_weight
+                    if score > token_scores.get(question_id, 0.0):
+                        token_scores[question_id] = score
+            for question_id, score in token_scores.items():
+                scores[question_id] = scores.get(question_id, 0.0) + score
+                matched[question_id] += 1
+
+        ranked = sorted(
+            (question_id for question_id in scores
+             if self._accepts(question_id, category, experience_level, difficulty)),
+            key=lambda question_id: (-matched[question_id], -scores[question_id])
+        )
+        return [(question_id, round(scores[question_id], 4)) for question_id in ranked[:limit]]
+
+
+question_search = QuestionSearchIndex()
+# Kept in step with every question bank reload, applying only the changed questions
+question_bank.on_reload(question_search.sync)
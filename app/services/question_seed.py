@@ -0,0 +1,298 @@
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.services.question_bank import QUESTION_BANK_META, bump_question_version
+from app.services.question_sets import QUESTION_HISTORY
+
+logger = logging.getLogger(__name__)
+
+# {_id: "seed", version: <hash of all seed hashes>} in the question bank meta collection
+SEED_META_ID = "seed"
+# Bumped when seeding itself changes, so databases on an already applied version re-run it once
+SEED_REVISION = 2
+
+# Where question _ids are stored; a question referenced from any of these is never deleted
+QUESTION_REFERENCES = (
+    ("interviews", "question_ids"),
+    ("candidate_answers", "question_id"),
+    (QUESTION_HISTORY, "seen"),
+)
+
+# Built-in questions. Each is identified by its text and experience level, so
+# the fresher and experienced variants of the same question are separate entries.
+SEED_QUESTIONS = [
+    {"category": "General", "question": "Tell me about yourself."},
+    {
+        "category": "General",
+        "question": "Where do you see yourself in five years?"
+        },
+    {
+        "category": "General",
+        "question": "Why should we hire you?"
+        },
+    {
+        "category": "General",
+        "question": "What do you know about our company?"
+        },
+    {"category": "General", "question": "What motivates you?"},
+    {"category": "General", "question": "How do you handle stress and pressure?"},
+    {"category": "Behavioral", "question": "Tell me about a time when you worked in a team."},
+    {"category": "Behavioral", "question": "Describe a situation where you had a conflict at work and how you resolved it."},
+    {"category": "Behavioral", "question": "Give an example of a time you took initiative."},
+    {"category": "Behavioral", "question": "Tell me about a time you failed and what you learned from it."},
+    {"category": "Behavioral", "question": "Describe a time you had to meet a tight deadline."},
+    {"category": "Technical", "question": "What tools/software are you proficient in?"},
+    {"category": "Technical", "question": "Can you walk me through a project you have worked on?"},
+    {"category": "Technical", "question": "How do you stay updated with industry trends?"},
+    {"category": "Technical", "question": "What additional certifications or training have you completed?"},
+    {"category": "Situational", "question": "How would you handle an unhappy client?"},
+    {"category": "Situational", "question": "How do you prioritize tasks in a busy work environment?"},
+    {"category": "Situational", "question": "If you were given a project outside of your expertise, how would you approach it?"},
+    {"category": "General", "question": "How has your academic background prepared you for this job?", "experience_level": "fresher"},
+    {"category": "General", "question": "What internships or projects have you worked on?", "experience_level": "fresher"},
+    {"category": "General", "question": "How do you plan to learn and grow in this industry?", "experience_level": "fresher"},
+    # Experienced-specific questions
+    {"category": "General", "question": "Tell us about your previous work experience and key achievements.", "experience_level": "experienced"},
+    {"category": "General", "question": "How have you handled conflicts in the workplace?", "experience_level": "experienced"},
+    {"category": "General", "question": "Describe a time you led a team or project.", "experience_level": "experienced"},
+    {
+        "category": "Behavioral",
+        "question": "Tell me about a project you completed successfully.",
+        "experience_level": "both",
+        "tips": "Use the STAR technique: Situation, Task, Action, Result.",
+        "example_answer": "I was leading a project with a tight deadline. Two team members were unavailable, "
+        "so I redistributed tasks, used UpWork to outsource some work, "
+        "and ensured communication was clear. As a result, we delivered the project on time without compromising quality."
+    },
+    {
+        "category": "General",
+        "question": "Why are you leaving your current job?",
+        "experience_level": "experienced"
+        },
+    {
+        "category": "Technical",
+        "question": "What experience do you have in this field?",
+        "experience_level": "experienced",
+        "tips": "Mention specific projects, technologies, and impact. Focus on achievements rather than just listing skills.",
+        "example_answer": "I have 3 years of experience in backend development, "
+        "primarily with FastAPI and MongoDB. One of my key projects involved optimizing API response times, which improved performance by 40%."
+    },
+    {
+        "category": "General",
+        "question": "Why did you decide to become a Software Engineer?",
+        "experience_level": "both",
+        "tips": "Talk about how your passion for this type of work goes back many years, and how you thrive in solving complex problems.",
+        "example_answer": "I've always been fascinated by technology. As a child, I enjoyed solving puzzles, "
+        "and coding felt like a natural extension of that. Over time, I realized software engineering allows me to create impactful solutions, and that’s what excites me the most."
+    },
+    {
+        "category": "Situational",
+        "question": "What would you do if you had multiple urgent deadlines at the same time?",
+        "experience_level": "both",
+        "tips": "Demonstrate prioritization, communication, and time management skills.",
+        "example_answer": "I would evaluate the urgency and impact of each task, discuss priorities with stakeholders, "
+        "and break down work into manageable steps. I’d also delegate where possible to ensure all deadlines are met efficiently."
+    },
+    {
+        "category": "General",
+        "question": "What experience do you have in this field?",
+        "experience_level": "fresher",
+        "tips": "Show enthusiasm and willingness to learn.",
+        "example_answer": "I may not have direct industry experience, but my [academic achievements, "
+        "project work, or certifications] have prepared me to take on real-world challenges OR "
+        "I am eager to leverage my skills and grow within the organization while contributing to its success."
+    },
+    {
+        "category": "Behavioral",
+        "experience_level": "both",
+        "question": "Can you describe a time when you faced a challenge at work and how you handled it?",
+        "tips": [
+            "Use the STAR method (Situation, Task, Action, Result) to structure your answer.",
+            "Describe a real challenge, how you approached it, and the successful outcome.",
+            "Show problem-solving skills and resilience."
+            ],
+        "example_answer": "SITUATION: A critical system crashed before a product launch. "
+        "TASK: I needed to find a quick solution to fix the issue. "
+        "ACTION: I coordinated with IT, identified the root cause, and implemented a fix. "
+        "RESULT: The system was restored within hours, ensuring the launch stayed on track."
+    },
+    {
+        "category": "Technical",
+        "experience_level": "both",
+        "question": "What are the most important skills and qualities needed to be a great Software Engineer?",
+        "tips": [
+            "Mention both technical and soft skills.",
+            "Highlight problem-solving, teamwork, and continuous learning.",
+            "Provide real-world examples if possible."
+            ],
+        "example_answer": "To be effective as a software engineer, you need strong coding, debugging, "
+        "and problem-solving skills. Teamwork, communication, and a passion for learning are equally important."
+    },
+    {
+        "category": "Career Motivation",
+        "experience_level": "both",
+        "question": "Why do you want to work for this company?",
+        "tips": [
+            "Show that you have researched the company.",
+            "Mention specific aspects you admire (culture, mission, innovation).",
+            "Connect your skills and career goals with what the company offers."
+            ],
+        "example_answer": "I admire your company’s commitment to sustainability and innovation. Your recent expansion into AI-driven solutions aligns with my background in AI,"
+        " and I’d love to contribute to your mission."
+    },
+    {
+        "category": "Self-Awareness",
+        "experience_level": "both",
+        "question": "What are your strengths and weaknesses?",
+        "tips": [
+            "Choose a strength that is relevant to the job.",
+            "For weaknesses, pick one that isn’t a deal-breaker and show how you’re improving it.",
+            "Keep your answer professional and constructive."
+            ],
+        "example_answer": "Strength: I excel at problem-solving and have improved operational efficiency in my previous roles. "
+        "Weakness: I used to struggle with delegating tasks, but I’ve learned to trust my team and focus on leadership."
+    }
+]
+
+def seed_key(question: Dict[str, Any]) -> str:
+    level = question.get("experience_level") or ""
+    return hashlib.sha1(f"{level}|{question['question'].strip().lower()}".encode()).hexdigest()
+
+
+def content_hash(question: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(question, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+async def referenced_question_ids(db, ids: List[Any]) -> set:
+    """The subset of `ids` (as strings) that interviews, answers or question history still point at."""
+    values = [str(_id) for _id in ids] + list(ids)
+    referenced = set()
+    for collection, field in QUESTION_REFERENCES:
+        async for doc in db[collection].find({field: {"$in": values}}, {field: 1}):
+            stored = doc.get(field)
+            referenced.update(str(value) for value in (stored if isinstance(stored, list) else [stored]))
+    return referenced & {str(_id) for _id in ids}
+
+
+def seed_version(seeds: List[Dict[str, Any]] = SEED_QUESTIONS) -> str:
+    combined = f"{SEED_REVISION}:" + "".join(sorted(content_hash(question) for question in seeds))
+    return hashlib.sha256(combined.encode()).hexdigest()[:16]
+
+
+async def seed_question_bank(db, seeds: List[Dict[str, Any]] = SEED_QUESTIONS) -> Dict[str, Any]:
+    """
+    Upsert the built-in questions whose content changed since they were last
+    seeded. When the recorded seed version matches, only the meta lookup runs.
+    Questions seeded before seed keys existed are adopted instead of being
+    inserted again: by text and experience level first, then a level-less
+    copy of the same text. Level-less copies left over after adoption (the
+    old duplicates of questions now seeded once for "both" levels) are
+    deleted only when nothing references them; anything else is left alone.
+    """
+    version = seed_version(seeds)
+    meta = await db[QUESTION_BANK_META].find_one({"_id": SEED_META_ID}, {"version": 1})
+    if meta and meta.get("version") == version:
+        logger.info(f"ℹ️ Question seed v{version} already applied, skipping.")
+        return {"version": version, "skipped": True}
+
+    wanted = {seed_key(question): question for question in seeds}
+    existing = {
+        doc["seed_key"]: doc.get("seed_hash")
+        async for doc in db["questions"].find({"seed_key": {"$in": list(wanted)}}, {"seed_key": 1, "seed_hash": 1})
+    }
+
+    seed_categories: Dict[str, set] = {}
+    for question in seeds:
+        seed_categories.setdefault(question["question"], set()).add(question.get("category"))
+    legacy_rows = [
+        doc async for doc in db["questions"].find(
+            {"seed_key": {"$exists": False}, "question": {"$in": sorted(seed_categories)}},
+            {"question": 1, "experience_level": 1, "category": 1}
+        ).sort("_id", 1)
+    ]
+    # Old seed copies had no level; a row with its own level may be an admin's question
+    copies = [
+        doc for doc in legacy_rows
+        if not doc.get("experience_level") and doc.get("category") in seed_categories[doc["question"]]
+    ]
+
+    # Keep existing _ids where possible so stored references stay valid
+    legacy: Dict[str, Any] = {}
+    claimed = set()
+    missing = [key for key in wanted if key not in existing]
+    exact = {}
+    for doc in legacy_rows:
+        exact.setdefault(seed_key(doc), doc["_id"])
+    for key in missing:
+        if key in exact:
+            legacy[key] = exact[key]
+            claimed.add(exact[key])
+    for key in missing:
+        if key in legacy:
+            continue
+        text = wanted[key]["question"]
+        doc = next((d for d in copies if d["_id"] not in claimed and d["question"] == text), None)
+        if doc is not None:
+            legacy[key] = doc["_id"]
+            claimed.add(doc["_id"])
+    leftovers = [doc["_id"] for doc in copies if doc["_id"] not in claimed]
+    referenced = await referenced_question_ids(db, leftovers) if leftovers else set()
+    superseded = [_id for _id in leftovers if str(_id) not in referenced]
+    if referenced:
+        logger.warning(
+            f"⚠️ Keeping {len(referenced)} duplicate legacy question(s) that are still referenced: "
+            f"{', '.join(sorted(referenced))}"
+        )
+
+    now = datetime.utcnow()
+    operations = []
+    for key, question in wanted.items():
+        digest = content_hash(question)
+        if existing.get(key) == digest:
+            continue
+        match = {"_id": legacy[key]} if key not in existing and key in legacy else {"seed_key": key}
+        operations.append(UpdateOne(
+            match,
+            {"$set": {**question, "seed_key": key, "seed_hash": digest, "updated_at": now},
+             "$setOnInsert": {"created_at": now}},
+            upsert=True
+        ))
+
+    written = 0
+    if operations:
+        try:
+            result = await db["questions"].bulk_write(operations, ordered=False)
+            written = result.upserted_count + result.modified_count
+        except BulkWriteError as e:
+            # Another worker seeding the same keys at the same time; the unique index keeps one copy
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+            written = e.details.get("nUpserted", 0) + e.details.get("nModified", 0)
+
+    if superseded:
+        await db["questions"].delete_many({"_id": {"$in": superseded}})
+    if operations or superseded:
+        await bump_question_version(db)
+
+    await db[QUESTION_BANK_META].update_one(
+        {"_id": SEED_META_ID},
+        {"$set": {"version": version, "updated_at": now}},
+        upsert=True
+    )
+    logger.info(
+        f"✅ Question seed v{version} applied: {written} written, "
+        f"{len(wanted) - len(operations)} unchanged, {len(legacy)} adopted, {len(superseded)} duplicates removed, "
+        f"{len(referenced)} kept."
+    )
+    return {
+        "version": version,
+        "skipped": False,
+        "written": written,
+        "adopted": len(legacy),
+        "removed": len(superseded),
+        "kept": sorted(referenced)
+    }
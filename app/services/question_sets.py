@@ -0,0 +1,178 @@
+import random
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+from app.services.cache import TTLCache
+from app.services.question_bank import BOTH_LEVELS, QuestionIndex, question_bank
+
+# {_id: user_id, seen: [question_id, ...]}; one document per user
+QUESTION_HISTORY = "user_question_history"
+
+# Random probes per draw before falling back to listing a bucket's free questions
+REJECTION_TRIES = 8
+
+
+class SamplingTables:
+    """
+    Per-bucket position arrays for one QuestionIndex snapshot: one bucket per
+    category, and per (category, experience level) with `both` questions
+    already merged in. Built once per reload, never per request.
+    """
+
+    def __init__(self, index: QuestionIndex):
+        self.index = index
+        self.categories: List[str] = sorted(c for c in index.by_category if c)
+        self.buckets: Dict[Tuple[str, Optional[str]], Tuple[int, ...]] = {
+            (category, None): tuple(positions) for category, positions in index.by_category.items()
+        }
+        for key, positions in index.by_category_level.items():
+            self.buckets[key] = tuple(positions)
+
+    def bucket(self, category: str, experience_level: Optional[str] = None) -> Tuple[int, ...]:
+        if experience_level and experience_level not in self.index.by_level:
+            experience_level = BOTH_LEVELS
+        return self.buckets.get((category, experience_level), ())
+
+
+class _BucketDraw:
+    """
+    Draws random positions from one bucket that `blocked` rejects. Random
+    probes cost O(1) while most of the bucket is free; only a mostly-used
+    bucket is listed once, after which draws are swap-pops.
+    """
+
+    def __init__(self, positions: Tuple[int, ...], blocked: Callable[[int], bool], rng: random.Random):
+        self.positions = positions
+        self.blocked = blocked
+        self.rng = rng
+        self.free: Optional[List[int]] = None
+
+    def next(self) -> Optional[int]:
+        if not self.positions:
+            return None
+        if self.free is None:
+            for _ in range(REJECTION_TRIES):
+                position = self.positions[self.rng.randrange(len(self.positions))]
+                if not self.blocked(position):
+                    return position
+            self.free = [p for p in self.positions if not self.blocked(p)]
+
+        while self.free:
+            i = self.rng.randrange(len(self.free))
+            self.free[i], self.free[-1] = self.free[-1], self.free[i]
+            position = self.free.pop()
+            if not self.blocked(position):
+                return position
+        return None
+
+
+def sample_question_set(
+    tables: SamplingTables,
+    count: int,
+    seen: Optional[bytearray] = None,
+    experience_level: Optional[str] = None,
+    categories: Optional[Iterable[str]] = None,
+    rng: Optional[random.Random] = None
+) -> Tuple[List[int], int]:
+    """
+    Pick `count` question positions round-robin across categories, skipping
+    questions in `seen`. Only when unseen questions run out are seen ones
+    reused; returns (positions, number reused).
+    """
+    rng = rng or random.Random()
+    wanted = [c for c in (categories or tables.categories) if tables.bucket(c, experience_level)]
+    rng.shuffle(wanted)
+
+    picked: List[int] = []
+    taken = set()
+    reused = 0
+    passes = [lambda p: p in taken or (seen is not None and seen[p])]
+    if seen is not None:
+        passes.append(lambda p: p in taken)
+
+    for pass_number, blocked in enumerate(passes):
+        draws = [_BucketDraw(tables.bucket(c, experience_level), blocked, rng) for c in wanted]
+        while draws and len(picked) < count:
+            for draw in list(draws):
+                if len(picked) >= count:
+                    break
+                position = draw.next()
+                if position is None:
+                    draws.remove(draw)
+                    continue
+                picked.append(position)
+                taken.add(position)
+                reused += pass_number
+    return picked, reused
+
+
+class QuestionSetGenerator:
+    """
+    Assembles balanced question sets per user. Sampling tables follow the
+    question bank; each user's seen questions are cached as a bitset over the
+    current snapshot's positions and rebuilt from their history document
+    only when the snapshot changes or the entry expires.
+    """
+
+    def __init__(self, cache_ttl: float = 300, cache_maxsize: int = 10000):
+        self._tables: Optional[SamplingTables] = None
+        self._seen = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
+
+    def on_reload(self, old: Optional[QuestionIndex], new: QuestionIndex) -> None:
+        self._tables = SamplingTables(new)
+
+    def tables_for(self, index: QuestionIndex) -> SamplingTables:
+        if self._tables is None or self._tables.index is not index:
+            self._tables = SamplingTables(index)
+        return self._tables
+
+    async def seen_bits(self, db, user_id: str, index: QuestionIndex) -> bytearray:
+        cached = self._seen.get(user_id)
+        if cached is not None and cached[0] is index:
+            return cached[1]
+
+        bits = bytearray(len(index))
+        doc = await db[QUESTION_HISTORY].find_one({"_id": user_id}, {"seen": 1})
+        for question_id in (doc or {}).get("seen", []):
+            position = index.positions.get(question_id)
+            if position is not None:
+                bits[position] = 1
+        self._seen.set(user_id, (index, bits))
+        return bits
+
+    async def generate(
+        self,
+        db,
+        user_id: str,
+        count: int,
+        experience_level: Optional[str] = None,
+        categories: Optional[List[str]] = None
+    ) -> Tuple[List[dict], int]:
+        index = await question_bank.get(db)
+        tables = self.tables_for(index)
+        seen = await self.seen_bits(db, user_id, index)
+        positions, reused = sample_question_set(
+            tables, count, seen, experience_level=experience_level, categories=categories
+        )
+        return [index.docs[p] for p in positions], reused
+
+    async def mark_seen(self, db, user_id: str, question_ids: List[str]) -> None:
+        await db[QUESTION_HISTORY].update_one(
+            {"_id": user_id},
+            {"$addToSet": {"seen": {"$each": question_ids}}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        cached = self._seen.get(user_id)
+        if cached is not None:
+            index, bits = cached
+            for question_id in question_ids:
+                position = index.positions.get(question_id)
+                if position is not None:
+                    bits[position] = 1
+
+
+question_sets = QuestionSetGenerator(
+    cache_ttl=settings.QUESTION_HISTORY_CACHE_TTL_SECONDS,
+    cache_maxsize=settings.QUESTION_HISTORY_CACHE_MAX_SIZE
+)
+question_bank.on_reload(question_sets.on_reload)
@@ -0,0 +1,224 @@
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, Request, status
+from pymongo import ReturnDocument
+from app.config import settings
+from app.database import get_database
+from app.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMITS = "rate_limits"
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    limit: int
+    window: int
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse slowapi-style strings such as "5/minute" or "100/hour"."""
+        try:
+            count, period = value.strip().lower().split("/")
+            return cls(int(count), _PERIODS[period.rstrip("s")])
+        except (ValueError, KeyError):
+            raise ValueError(f"Invalid rate limit: {value!r}")
+
+
+def sliding_window_count(current: int, previous: int, elapsed: float, window: int) -> float:
+    """
+    Approximate number of hits in the last `window` seconds from two fixed
+    windows: all of the current one plus the part of the previous one that
+    still overlaps the sliding window.
+    """
+    return current + previous * max(0.0, 1 - elapsed / window)
+
+
+# -------------------------------------------------
+# Shared Counter Backends
+# -------------------------------------------------
+class MemoryBackend:
+    """Per-process counters; for tests and single-worker development only."""
+
+    def __init__(self):
+        self._counts: Dict[Tuple[str, int], int] = {}
+
+    async def hit(self, key: str, window_start: int, window: int) -> Tuple[int, int]:
+        # Forget windows that can no longer affect any decision
+        for stale in [k for k in self._counts if k[1] < window_start - window]:
+            del self._counts[stale]
+        current = self._counts.get((key, window_start), 0) + 1
+        self._counts[(key, window_start)] = current
+        return current, self._counts.get((key, window_start - window), 0)
+
+
+class MongoBackend:
+    """
+    One document per key holding the current and previous window counts,
+    advanced with a single atomic pipeline upsert; a TTL index drops idle keys.
+    """
+
+    def __init__(self, collection: str = RATE_LIMITS):
+        self.collection = collection
+
+    async def hit(self, key: str, window_start: int, window: int) -> Tuple[int, int]:
+        db = await get_database()
+        # Every expression in the $set sees the document as it was before this hit
+        same_window = {"$eq": ["$window_start", window_start]}
+        next_window = {"$eq": ["$window_start", window_start - window]}
+        doc = await db[self.collection].find_one_and_update(
+            {"_id": key},
+            [{"$set": {
+                "previous": {"$switch": {
+                    "branches": [
+                        {"case": same_window, "then": {"$ifNull": ["$previous", 0]}},
+                        {"case": next_window, "then": {"$ifNull": ["$count", 0]}}
+                    ],
+                    "default": 0
+                }},
+                "count": {"$cond": [same_window, {"$add": [{"$ifNull": ["$count", 0]}, 1]}, 1]},
+                "window_start": window_start,
+                "expires_at": datetime.utcfromtimestamp(window_start + 2 * window)
+            }}],
+            upsert=True,
+            projection={"_id": 0, "count": 1, "previous": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        return doc["count"], doc["previous"]
+
+
+class RedisBackend:
+    """Redis (or any Redis-compatible server) INCR + EXPIRE per fixed window."""
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package.")
+        self._redis = redis_asyncio.from_url(url)
+
+    async def hit(self, key: str, window_start: int, window: int) -> Tuple[int, int]:
+        current_key = f"rl:{key}:{window_start}"
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.incr(current_key)
+        pipe.expire(current_key, 2 * window)
+        pipe.get(f"rl:{key}:{window_start - window}")
+        current, _, previous = await pipe.execute()
+        return int(current), int(previous or 0)
+
+
+def create_backend():
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return MemoryBackend()
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisBackend(settings.REDIS_URL)
+    return MongoBackend()
+
+
+# -------------------------------------------------
+# Limiter
+# -------------------------------------------------
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: int, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class RateLimiter:
+    """
+    Sliding-window limits enforced in shared storage, so they hold across
+    workers. Each worker keeps a token bucket per key as a fast path: a key
+    that has exhausted its limit locally, or was recently denied by the
+    shared store, is rejected without a storage round trip.
+    """
+
+    def __init__(self, backend=None, enabled: bool = True, clock: Callable[[], float] = time.time):
+        self.backend = backend or create_backend()
+        self.enabled = enabled
+        self.clock = clock
+        self._buckets = TTLCache(maxsize=50000, ttl=3600)
+        self._blocked = TTLCache(maxsize=50000, ttl=60)
+
+    async def hit(self, key: str, rate: RateLimit) -> Optional[int]:
+        """Record a hit; returns None if allowed, else seconds until retry."""
+        if not self.enabled:
+            return None
+
+        blocked_for = self._blocked.get(key)
+        if blocked_for is not None:
+            return blocked_for
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate.limit, rate.limit / rate.window)
+            self._buckets.set(key, bucket, ttl=rate.window * 2)
+        if not bucket.take():
+            return max(1, math.ceil((1 - bucket.tokens) / bucket.rate))
+
+        now = self.clock()
+        window_start = int(now // rate.window * rate.window)
+        try:
+            current, previous = await self.backend.hit(key, window_start, rate.window)
+        except Exception as e:
+            # Fail open: a storage outage must not take login down with it
+            logger.error(f"❌ Rate limit backend error for {key}: {e}")
+            return None
+
+        if sliding_window_count(current, previous, now - window_start, rate.window) <= rate.limit:
+            return None
+
+        retry_after = max(1, math.ceil(window_start + rate.window - now))
+        self._blocked.set(key, retry_after, ttl=retry_after)
+        return retry_after
+
+
+def client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "127.0.0.1"
+
+
+limiter = RateLimiter(enabled=settings.RATE_LIMIT_ENABLED)
+
+
+def rate_limit(limit: str, scope: str, key_func: Callable[[Request], str] = client_ip):
+    """
+    Route dependency enforcing `limit` (e.g. "5/minute") per client within
+    `scope`; routes sharing a scope share a budget.
+
+        @router.post("/token", dependencies=[Depends(rate_limit("5/minute", "login"))])
+    """
+    rate = RateLimit.parse(limit)
+
+    async def dependency(request: Request):
+        retry_after = await limiter.hit(f"{scope}:{key_func(request)}", rate)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests! Please try again later.",
+                headers={"Retry-After": str(retry_after)}
+            )
+
+    return dependency
@@ -1,4 +1,3 @@
-from passlib.context import CryptContext
 from pathlib import Path
 import re
 import ffmpeg
@@ -6,8 +5,7 @@ import os
 import tempfile
 import subprocess
 import cv2
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.services.passwords import bcrypt_hash, bcrypt_verify
 
 
 class WeakPasswordError(Exception):
@@ -28,16 +26,17 @@ def hash_password(password: str) -> str:
     # Hash a password after checking strength.
     if not is_password_strong(password):
         raise WeakPasswordError("Password is too weak. It must be at least 8 characters long and include digits, uppercase, lowercase, and special characters.")
-    return pwd_context.hash(password)
+    return bcrypt_hash(password)
 
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt_verify(plain_password, hashed_password)
 
 
+# Blocking; async handlers should await app.services.passwords.hash_password_async
 def get_password_hash(password: str):
-    return pwd_context.hash(password)
+    return bcrypt_hash(password)
 
 def extract_audio_from_video(video_path: str) -> str:
     try:
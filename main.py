@@ -2,16 +2,22 @@ from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 from bson import ObjectId, errors
-from app.database import MongoDBManager, get_database, mongodb_manager
+from app.database import get_database, mongodb_manager
 from app.routers import (
     auth, user, interview, facial_analysis, feedback, websocket, health,
-    speech_analysis, interview_question, ai_analysis, candidate_answers
+    speech_analysis, interview_question, ai_analysis, candidate_answers, stream
 )
 from app.routers.websocket import router as websocket_router
 from app.schemas.user import User
 from app.services.interview_question import QuestionService
+from app.services.question_bank import question_bank
+from app.services.admin_summaries import ensure_admin_summaries
+from app.services.email_outbox import outbox_worker
+from app.services.executors import executors
+from app.services.ai.facial_analysis import frame_batcher
+from app.services.email_templates import email_templates
+from app.indexes import start_index_sync, start_index_audit, stop_index_tasks
 from app.config import settings, logger
-from slowapi.errors import RateLimitExceeded
 from starlette.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 import os
@@ -27,6 +33,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include Routers
@@ -39,55 +46,41 @@ app.include_router(facial_analysis.router)
 app.include_router(speech_analysis.router)
 app.include_router(interview_question.router)
 app.include_router(ai_analysis.router)
+app.include_router(stream.router)
 app.include_router(candidate_answers.router)
 app.include_router(feedback.router)
 app.include_router(health.router)
 app.include_router(websocket.router, prefix="/api")
 app.mount("/media", StaticFiles(directory="media"), name="media")
 
-# Initialize MongoDB
-mongo_manager = MongoDBManager(
-    uri=settings.MONGO_URI,
-    db_name=settings.MONGO_DB_NAME,
-    settings=settings
-)
-
-
-async def ensure_indexes():
-    db = await get_database()
-    users_collection = db["users"]
-    await users_collection.create_index([("email", 1)], unique=True)
-
-    interviews_collection = db["interviews"]
-    await interviews_collection.create_index([("user_id", 1)])
-
-
 # FastAPI Lifecycle Events
 @app.on_event("startup")
 async def startup_event():
-    await mongo_manager.connect()
-    await ensure_indexes()
+    await mongodb_manager.connect()
     db = mongodb_manager.db
+    # Keep references so the tasks aren't garbage collected mid-run and can be cancelled on shutdown
+    app.state.index_tasks = [start_index_sync(db), start_index_audit(db)]
     await QuestionService.seed_questions(db)
+    await question_bank.get(db)
+    question_bank.start_watch(db)
+    await ensure_admin_summaries(db)
+    email_templates.preload()
+    outbox_worker.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    await mongo_manager.close()
-    await ensure_indexes()
+    await outbox_worker.stop()
+    await question_bank.stop_watch()
+    await frame_batcher.close()
+    executors.shutdown()
+    await stop_index_tasks(getattr(app.state, "index_tasks", []))
+    await mongodb_manager.close()
 
 # Global Exception Handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     return JSONResponse(status_code=500, content={"message": "An internal server error occurred"})
 
-# Rate Limit Exception Handler
-@app.exception_handler(RateLimitExceeded)
-async def rate_limit_handler(request, exc):
-    return JSONResponse(
-        status_code=429,
-        content={"message": "Too many requests! Please try again later."}
-    )
-
 # Serialize MongoDB User Document
 def serialize_user(user):
     return {